@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AdditionalServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'additional_services'
+
+    def ready(self):
+        import additional_services.signals  # pylint: disable=unused-import
@@ -6,6 +6,9 @@ from additional_services.filepath_generators import generate_additional_service_
 
 logger = logging.getLogger(__name__)
 
+# поколение каталога услуг: увеличивается при любом изменении услуг и их изображений (см. additional_services.signals)
+ADDITIONAL_SERVICES_GENERATION_NAME = "additional_services"
+
 
 class AdditionalService(models.Model):
     name = models.CharField("Название услуги", max_length=255, unique=True)
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from additional_services.models import AdditionalService, AdditionalServicePicture, \
+    ADDITIONAL_SERVICES_GENERATION_NAME
+from core.cache import bump_generation
+
+
+def _bump_additional_services_generation():
+    bump_generation(ADDITIONAL_SERVICES_GENERATION_NAME)
+
+
+@receiver([post_save, post_delete], sender=AdditionalService)
+@receiver([post_save, post_delete], sender=AdditionalServicePicture)
+def invalidate_additional_services_catalogue(sender, **kwargs):
+    transaction.on_commit(_bump_additional_services_generation)
@@ -1,9 +1,10 @@
 from rest_framework import mixins
 from rest_framework.viewsets import GenericViewSet
 
-from additional_services.models import AdditionalService
+from additional_services.models import AdditionalService, ADDITIONAL_SERVICES_GENERATION_NAME
 from additional_services.serializers import AdditionalServiceDetailSerializer
 from core.mixins import ByActionMixin
+from core.response_cache import cached_response
 
 
 class AdditionalServiceViewSet(
@@ -15,4 +16,8 @@ class AdditionalServiceViewSet(
         "default": None,
         "list": AdditionalServiceDetailSerializer,
     }
-    queryset = AdditionalService.objects.filter(active=True)
+    queryset = AdditionalService.objects.filter(active=True).prefetch_related("pictures")
+
+    @cached_response(ADDITIONAL_SERVICES_GENERATION_NAME)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
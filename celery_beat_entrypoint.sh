@@ -0,0 +1,11 @@
+#!/bin/bash
+
+echo "Wait for database"
+python manage.py wait_for_db
+
+# миграции (в том числе таблицы django_celery_beat) применяет контейнер backend
+
+echo "Run Celery Beat"
+# beat должен быть запущен ровно в одном экземпляре, иначе периодические задачи будут ставиться несколько раз
+exec celery --app project beat -l info
+
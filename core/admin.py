@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from core.models import Holiday
+
+
+class HolidayAdmin(admin.ModelAdmin):
+    model = Holiday
+    list_display = ('day', 'month', 'name')
+    list_filter = ('month',)
+
+
+admin.site.register(Holiday, HolidayAdmin)
@@ -0,0 +1,87 @@
+import time
+
+from django.core.cache import cache
+
+GENERATION_KEY_TEMPLATE = "generation:{name}"
+
+
+def get_generation(name: str) -> int:
+    """
+    Текущее поколение именованного набора данных.
+    Поколение хранится в redis, поэтому его изменение сразу видят все воркеры.
+    """
+    return cache.get_or_set(GENERATION_KEY_TEMPLATE.format(name=name), 1, timeout=None)
+
+
+def bump_generation(name: str) -> int:
+    """
+    Увеличивает поколение набора данных - все кэши, построенные на предыдущем поколении, становятся неактуальными
+    """
+    key = GENERATION_KEY_TEMPLATE.format(name=name)
+    cache.add(key, 1, timeout=None)
+    return cache.incr(key)
+
+
+def get_generations(names: list[str]) -> list[int]:
+    """
+    Текущие поколения нескольких наборов данных за один запрос в redis
+    """
+    keys = [GENERATION_KEY_TEMPLATE.format(name=name) for name in names]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, 1, timeout=None)
+            generations[key] = cache.get(key, 1)
+
+    return [generations[key] for key in keys]
+
+
+class GenerationRefreshedData:
+    """
+    Данные из бд, загруженные в память процесса (например, индекс событий или календарь праздников).
+
+    Наследники задают GENERATION_NAME и _load(). Данные перезагружаются, если изменилось поколение
+    GENERATION_NAME в redis (его увеличивают сигналы моделей), но поколение проверяется не чаще,
+    чем раз в GENERATION_CHECK_INTERVAL секунд. invalidate() - проверить поколение при следующем обращении.
+    """
+    GENERATION_NAME: str
+    GENERATION_CHECK_INTERVAL = 5
+
+    def __init__(self):
+        self._generation = None
+        self._checked_at = 0.
+
+    def invalidate(self):
+        self._generation = None
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _refresh_if_stale(self):
+        checked_at = time.monotonic()
+        if self._generation is not None and checked_at - self._checked_at < self.GENERATION_CHECK_INTERVAL:
+            return
+
+        generation = get_generation(self.GENERATION_NAME)
+        if generation != self._generation:
+            self._load()
+            self._generation = generation
+        self._checked_at = checked_at
+
+
+COUNTER_KEY_TEMPLATE = "counter:{name}"
+
+
+def increment_counter(name: str) -> int:
+    """
+    Счетчик в redis, общий для всех воркеров (например, попадания и промахи кэша).
+    Ключ counter:<name> можно забирать мониторингом напрямую из redis.
+    """
+    key = COUNTER_KEY_TEMPLATE.format(name=name)
+    cache.add(key, 0, timeout=None)
+    return cache.incr(key)
+
+
+def get_counters(names: list[str]) -> dict[str, int]:
+    counters = cache.get_many([COUNTER_KEY_TEMPLATE.format(name=name) for name in names])
+    return {name: counters.get(COUNTER_KEY_TEMPLATE.format(name=name), 0) for name in names}
@@ -1,18 +1,70 @@
 import calendar
 from datetime import date as Date
 
+from core.cache import GenerationRefreshedData
+
+
+class HolidayCalendar(GenerationRefreshedData):
+    """
+    Календарь выходных и праздничных дней.
+
+    Для каждого года один раз строится bytearray, в котором i-й байт равен 1, если i-й день года
+    (начиная с 0) выходной или праздничный. Праздники берутся из модели core.models.Holiday.
+    Календарь перестраивается при изменении поколения праздников (его увеличивают сигналы модели Holiday).
+    """
+    GENERATION_NAME = "holidays"
+    WEEKEND = (calendar.SATURDAY, calendar.SUNDAY)
+
+    def __init__(self):
+        super().__init__()
+        self._holidays = set()
+        self._years = {}
+
+    def _load(self):
+        from core.models import Holiday
+
+        self._holidays = set(Holiday.objects.values_list("day", "month"))
+        self._years = {}
+
+    def _year_mask(self, year: int) -> bytearray:
+        mask = self._years.get(year)
+        if mask is None:
+            days = map(Date.fromordinal, range(Date(year, 1, 1).toordinal(), Date(year + 1, 1, 1).toordinal()))
+            mask = bytearray(
+                day.weekday() in self.WEEKEND or (day.day, day.month) in self._holidays
+                for day in days
+            )
+            self._years[year] = mask
+
+        return mask
+
+    def is_holiday(self, day: Date) -> bool:
+        self._refresh_if_stale()
+        return bool(self._year_mask(day.year)[day.timetuple().tm_yday - 1])
+
+    def mask(self, start: Date, end: Date) -> bytes:
+        """
+        Маска дней с start по end (не включительно): i-й байт равен 1, если день start + i выходной или праздничный
+        """
+        self._refresh_if_stale()
+
+        chunks = []
+        day = start
+        while day < end:
+            year_end = min(end, Date(day.year + 1, 1, 1))
+            first_index = day.timetuple().tm_yday - 1
+            chunks.append(self._year_mask(day.year)[first_index:first_index + (year_end - day).days])
+            day = year_end
+
+        return b"".join(chunks)
+
+
+holiday_calendar = HolidayCalendar()
+
 
 def is_holiday(day: Date) -> bool:
-    KNOWN_HOLIDAYS = [  # HARDCODE
-        *[(i, 1) for i in range(1, 9)],
-        (23, 2),
-        (8, 3),
-        (29, 4),
-        (30, 4),
-        (1, 5),
-        (9, 5), (10, 5),
-        (12, 6),
-        (4, 11), (30, 12), (31, 12),
-    ]
-
-    return day.weekday() in [calendar.SATURDAY, calendar.SUNDAY] or ((day.day, day.month) in KNOWN_HOLIDAYS)
+    return holiday_calendar.is_holiday(day)
+
+
+def holiday_mask(start: Date, end: Date) -> bytes:
+    return holiday_calendar.mask(start, end)
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:20
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(31)], verbose_name='День')),
+                ('month', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)], verbose_name='Месяц')),
+                ('name', models.CharField(blank=True, default='', max_length=127, verbose_name='Название праздника')),
+            ],
+            options={
+                'verbose_name': 'Праздник',
+                'verbose_name_plural': 'Праздники',
+                'ordering': ('month', 'day'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='holiday',
+            constraint=models.UniqueConstraint(fields=('day', 'month'), name='unique_holiday_day_month'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+KNOWN_HOLIDAYS = [
+    *[(i, 1, "Новогодние каникулы") for i in range(1, 9)],
+    (23, 2, "День защитника Отечества"),
+    (8, 3, "Международный женский день"),
+    (29, 4, "Перенос выходного"),
+    (30, 4, "Перенос выходного"),
+    (1, 5, "Праздник Весны и Труда"),
+    (9, 5, "День Победы"),
+    (10, 5, "Перенос выходного"),
+    (12, 6, "День России"),
+    (4, 11, "День народного единства"),
+    (30, 12, "Новогодние каникулы"),
+    (31, 12, "Новогодние каникулы"),
+]
+
+
+def create_known_holidays(apps, schema_editor):
+    # праздники, которые раньше были захардкожены в core.functions.is_holiday
+    Holiday = apps.get_model("core", "Holiday")
+    Holiday.objects.bulk_create([Holiday(day=day, month=month, name=name) for day, month, name in KNOWN_HOLIDAYS])
+
+
+def delete_known_holidays(apps, schema_editor):
+    Holiday = apps.get_model("core", "Holiday")
+    for day, month, _ in KNOWN_HOLIDAYS:
+        Holiday.objects.filter(day=day, month=month).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_known_holidays, delete_known_holidays),
+    ]
@@ -1,7 +1,10 @@
-from datetime import time as Time
+from datetime import time as Time, date as Date
 
 import pytz
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import models
 
 timezone = pytz.timezone(settings.TIME_ZONE)
 
@@ -46,3 +49,35 @@ class Pricing:
 
     def __str__(self):
         return "Configuration"
+
+
+class Holiday(models.Model):
+    """
+    Ежегодный праздник. Субботы и воскресенья считаются выходными всегда, их заводить не нужно.
+    """
+    day = models.PositiveSmallIntegerField("День", validators=[MinValueValidator(1), MaxValueValidator(31)])
+    month = models.PositiveSmallIntegerField("Месяц", validators=[MinValueValidator(1), MaxValueValidator(12)])
+    name = models.CharField("Название праздника", max_length=127, default="", blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "month"], name="unique_holiday_day_month"),
+        ]
+        ordering = ("month", "day")
+
+        verbose_name = "Праздник"
+        verbose_name_plural = "Праздники"
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+    def clean(self):
+        try:
+            # високосный год, чтобы 29 февраля было допустимой датой
+            Date(year=2000, month=self.month, day=self.day)
+        except (TypeError, ValueError):
+            raise ValidationError(f"Некорректная дата праздника: {self.day}.{self.month}")
+
+    def __str__(self):
+        return f"{self.day:02d}.{self.month:02d} {self.name}"
@@ -0,0 +1,67 @@
+import logging
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson. Ответ - тот же json, что и у JSONRenderer:
+    порядок ключей сохраняется, а datetime/date/time, Decimal, ленивые строки и все, что orjson не умеет
+    сериализовать сам, передается в тот же encoder_class, что использует JSONRenderer.
+
+    Побайтово ответы могут отличаться только записью float в экспоненциальной форме: orjson пишет 1e16 и 1e-7,
+    а json - 1e+16 и 1e-07 (после разбора это те же числа). NaN и бесконечность orjson пишет как null,
+    а JSONRenderer со STRICT_JSON их не принимает.
+
+    Форматированный вывод (indent, например в browsable api) и нестандартные настройки UNICODE_JSON/COMPACT_JSON
+    отдаются стандартному JSONRenderer.
+    """
+    # datetime без OPT_PASSTHROUGH_DATETIME orjson пишет с микросекундами и +00:00, а DRF - с миллисекундами и Z
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def __init__(self):
+        self._encoder = self.encoder_class()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (self.get_indent(accepted_media_type, renderer_context) is not None
+                or self.ensure_ascii or not self.compact):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._encoder.default, option=self.options)
+        except orjson.JSONEncodeError:
+            # например, целые числа больше 64 бит - пусть разбирается стандартный json
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # как и JSONRenderer, экранируем \u2028 и \u2029, чтобы ответ оставался корректным литералом javascript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser на orjson. orjson принимает только utf-8 и, как и JSONParser в строгом режиме, не принимает NaN.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
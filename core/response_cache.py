@@ -0,0 +1,79 @@
+import hashlib
+import logging
+from functools import wraps
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.cache import get_generations
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+RESPONSE_KEY_TEMPLATE = "response:{digest}"
+
+
+def _response_digest(view, request: Request, generations: list[int], kwargs: dict) -> str:
+    # ключ не зависит от порядка query параметров и порядка их значений
+    query_params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    raw_key = repr((
+        type(view).__name__,
+        view.action,
+        sorted(kwargs.items()),
+        query_params,
+        request.accepted_renderer.format,
+        generations,
+    ))
+    return hashlib.sha1(raw_key.encode()).hexdigest()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    client_etags = [client_etag.strip() for client_etag in if_none_match.split(",")]
+    return "*" in client_etags or etag in client_etags or f"W/{etag}" in client_etags
+
+
+def cached_response(*generation_names: str, only_without_query_params: bool = False):
+    """
+    Кэширует данные ответа метода viewset'а в redis.
+
+    Ключ кэша строится по viewset'у, action, аргументам из url, нормализованным query параметрам и текущим
+    поколениям generation_names - после изменения данных (и увеличения поколения) старые ключи просто перестают
+    использоваться и истекают по таймауту.
+    Тот же ключ отдается клиенту как ETag: при совпадении If-None-Match ответ 304 отдается без обращения к кэшу ответов.
+    Кэшируются только ответы 200. При only_without_query_params запросы с query параметрами не кэшируются.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request: Request, *args, **kwargs):
+            if only_without_query_params and request.query_params:
+                return method(self, request, *args, **kwargs)
+
+            generations = get_generations(list(generation_names))
+            digest = _response_digest(self, request, generations, kwargs)
+            etag = f'"{digest}"'
+
+            if _etag_matches(request, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+            key = RESPONSE_KEY_TEMPLATE.format(digest=digest)
+            data = cache.get(key)
+            if data is None:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+
+                cache.set(key, response.data, timeout=RESPONSE_CACHE_TIMEOUT)
+                response["ETag"] = etag
+                return response
+
+            return Response(data, headers={"ETag": etag})
+
+        return wrapper
+
+    return decorator
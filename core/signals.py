@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from core.functions import holiday_calendar, HolidayCalendar
+from core.models import Holiday
+
+
+def _bump_holidays_generation():
+    holiday_calendar.invalidate()
+    bump_generation(HolidayCalendar.GENERATION_NAME)
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def invalidate_holiday_calendar(sender, **kwargs):
+    holiday_calendar.invalidate()
+    transaction.on_commit(_bump_holidays_generation)
@@ -1,8 +1,21 @@
+import json
+from datetime import date as Date, datetime as Datetime, time as Time, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO
 from unittest.mock import patch
+from uuid import UUID
 
 from django.core.management import call_command
 from django.db.utils import OperationalError
 from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from core.functions import is_holiday, holiday_mask
+from core.models import Holiday
+from core.renderers import ORJSONRenderer, ORJSONParser
 
 
 class CommandTests(TestCase):
@@ -27,3 +40,98 @@ class CommandTests(TestCase):
             get_item.side_effect = [OperationalError]*5 + [True]
             call_command('wait_for_db')
             self.assertEqual(get_item.call_count, 6)
+
+
+class HolidayCalendarTests(TestCase):
+    def test_weekends_and_holidays(self):
+        Holiday.objects.create(day=14, month=2, name="Тестовый праздник")
+
+        self.assertTrue(is_holiday(Date(2024, 2, 14)))  # среда, праздник
+        self.assertTrue(is_holiday(Date(2024, 2, 17)))  # суббота
+        self.assertFalse(is_holiday(Date(2024, 2, 15)))  # четверг
+        self.assertEqual(
+            holiday_mask(Date(2024, 2, 13), Date(2024, 2, 19)),
+            bytes([0, 1, 0, 0, 1, 1]),
+        )
+
+    def test_mask_crosses_year(self):
+        start = Date(2024, 12, 20)
+        self.assertEqual(
+            list(holiday_mask(start, start + timedelta(days=30))),
+            [is_holiday(start + timedelta(days=i)) for i in range(30)],
+        )
+
+
+class ORJSONRendererTests(TestCase):
+    def test_same_output_as_json_renderer(self):
+        data = ReturnDict({
+            "house": {"name": "Домик у озера", "price": 10500, "multiplier": 1.5, "active": True, "comment": None},
+            "positions": [
+                {"date": Date(2024, 2, 14), "time": Time(14, 0), "price": Decimal("100.50")},
+                {"date": Date(2024, 2, 15), "time": Time(12, 30, 15, 123456), "price": 0},
+            ],
+            "created_at": Datetime(2024, 2, 14, 13, 5, 7, 654321, tzinfo=timezone.utc),
+            "updated_at": Datetime(2024, 2, 14, 16, 5, 7, tzinfo=timezone(timedelta(hours=3))),
+            "slug": UUID("12345678-1234-5678-1234-567812345678"),
+            "description": gettext_lazy("Описание"),
+            "separators": "строка\u2028с\u2029разделителями",
+            1: (1, 2, 3),
+        }, serializer=None)
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(data, "application/json; indent=4"),
+                         JSONRenderer().render(data, "application/json; indent=4"))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def _assert_same_as_json(self, data):
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        self.assertEqual(ORJSONParser().parse(BytesIO(rendered)), json.loads(rendered))
+
+    def test_calendar(self):
+        # такой же вид, как у календаря выезда на месяц
+        start = Date(2024, 3, 1)
+        self._assert_same_as_json({"calendar": {
+            (start + timedelta(days=i)).strftime("%d-%m-%Y"): {
+                "check_out_is_available": i % 3 != 0,
+                "price": 8000 + 100 * i if i % 3 else None,
+                "reason (debug)": None if i % 3 else "Домик занят",
+            }
+            for i in range(31)
+        }})
+
+    def test_houses_listing(self):
+        # такой же вид, как у списка домиков с ценами
+        self._assert_same_as_json(ReturnList([
+            ReturnDict({
+                "id": i,
+                "name": f"Домик {i}",
+                "description": "Описание домика " * 20,
+                "base_price": 5000 + 350 * i,
+                "holidays_multiplier": 1 + 0.07 * i,
+                "max_persons_amount": 4,
+                "pictures": [{"picture": f"/backend/media/houses/{i}_{j}.jpg", "width": 800, "height": 600}
+                             for j in range(5)],
+                "features": [{"name": f"Особенность {j}", "picture": f"/backend/media/features/{j}.png"}
+                             for j in range(5)],
+                "total_price": 24000 + 1000 * i if i % 2 else None,
+                "price_per_day": 8000,
+            }, serializer=None)
+            for i in range(50)
+        ], serializer=None))
+
+    def test_exponent_floats(self):
+        data = {"big": 1e16, "small": 1e-7, "prices": [1.5e300, 0.1]}
+
+        rendered = ORJSONRenderer().render(data)
+
+        # запись отличается от json (1e+16, 1e-07), значения - те же
+        self.assertEqual(rendered, b'{"big":1e16,"small":1e-7,"prices":[1.5e300,0.1]}')
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+
+    def test_parser(self):
+        self.assertEqual(ORJSONParser().parse(BytesIO('{"name": "Домик", "persons": [1, 2]}'.encode())),
+                         {"name": "Домик", "persons": [1, 2]})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"price": NaN}'))
@@ -0,0 +1,67 @@
+import logging
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date as Date, timedelta
+
+from core.cache import GenerationRefreshedData
+from events.models import Event
+
+logger = logging.getLogger(__name__)
+
+
+class EventMultiplierIndex(GenerationRefreshedData):
+    """
+    Множители событий, загруженные в память процесса.
+
+    При загрузке события один раз раскладываются проходом по датам начала и окончания (sweep line) в таблицу отрезков:
+    на каждом отрезке между соседними границами (датой начала события или днем после его окончания) действует
+    один и тот же набор событий. Множители дня day находятся бинпоиском по границам, независимо от того,
+    сколько событий закончилось раньше. Размер таблицы ограничен количеством событий, а не количеством запрошенных дней.
+    Индекс перезагружается при изменении поколения событий (его увеличивают сигналы модели Event).
+    """
+    GENERATION_NAME = "events"
+
+    def __init__(self):
+        super().__init__()
+        # i-й отрезок начинается в _boundaries[i], на нем действуют события с множителями _segments[i]
+        self._boundaries = []
+        self._segments = []
+
+    def _load(self):
+        starting = defaultdict(list)
+        ending = defaultdict(list)
+        for start_date, end_date, event_id, multiplier in Event.objects.values_list(
+                "start_date", "end_date", "id", "multiplier"):
+            if start_date > end_date:
+                continue
+            starting[start_date].append((event_id, multiplier))
+            ending[end_date + timedelta(days=1)].append(event_id)
+
+        boundaries = []
+        segments = []
+        active = {}
+        for boundary in sorted(starting.keys() | ending.keys()):
+            for event_id in ending.get(boundary, ()):
+                del active[event_id]
+            active.update(starting.get(boundary, ()))
+
+            boundaries.append(boundary)
+            # множители в порядке создания событий
+            segments.append(tuple(multiplier for _, multiplier in sorted(active.items())))
+
+        self._boundaries = boundaries
+        self._segments = segments
+
+    def multipliers(self, day: Date) -> tuple[float, ...]:
+        """
+        Множители всех событий, действующих в день day, в порядке их создания
+        """
+        self._refresh_if_stale()
+
+        index = bisect_right(self._boundaries, day) - 1
+        if index < 0:
+            return ()
+        return self._segments[index]
+
+
+event_multipliers = EventMultiplierIndex()
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from events.models import Event
+from events.services import event_multipliers, EventMultiplierIndex
+
+
+def _bump_events_generation():
+    event_multipliers.invalidate()
+    bump_generation(EventMultiplierIndex.GENERATION_NAME)
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event_multipliers(sender, **kwargs):
+    # текущий процесс перечитывает события сразу (в том числе внутри еще не закоммиченной транзакции),
+    # остальные воркеры - только после коммита, чтобы не закэшировать старые данные под новым поколением
+    event_multipliers.invalidate()
+    transaction.on_commit(_bump_events_generation)
@@ -0,0 +1,32 @@
+from datetime import date as Date, timedelta
+
+from django.test import TestCase
+
+from events.models import Event
+from events.services import EventMultiplierIndex
+
+
+class EventMultiplierIndexTests(TestCase):
+    def test_same_multipliers_as_linear_scan(self):
+        start = Date(2024, 1, 1)
+        events = [
+            (0, 10, 1.5),
+            (5, 5, 2),
+            (5, 20, 1.2),
+            (11, 11, 3),
+            (30, 40, 1.1),
+            (35, 36, 1.7),
+        ]
+        for first_day, last_day, multiplier in events:
+            Event.objects.create(name="Событие", start_date=start + timedelta(days=first_day),
+                                 end_date=start + timedelta(days=last_day), multiplier=multiplier)
+
+        index = EventMultiplierIndex()
+        all_events = list(Event.objects.order_by("id"))
+        for i in range(-3, 45):
+            day = start + timedelta(days=i)
+            expected = tuple(event.multiplier for event in all_events if event.start_date <= day <= event.end_date)
+            self.assertEqual(index.multipliers(day), expected, day)
+
+    def test_no_events(self):
+        self.assertEqual(EventMultiplierIndex().multipliers(Date(2024, 1, 1)), ())
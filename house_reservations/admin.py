@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django_admin_listfilter_dropdown.filters import DropdownFilter, RelatedDropdownFilter
 
-from house_reservations.models import HouseReservation
+from house_reservations.models import HouseReservation, ArchivedHouseReservation
 
 
 class HouseReservationAdmin(admin.ModelAdmin):
@@ -26,4 +26,19 @@ class HouseReservationAdmin(admin.ModelAdmin):
     )
 
 
+class ArchivedHouseReservationAdmin(admin.ModelAdmin):
+    model = ArchivedHouseReservation
+    list_display = (
+        'slug',
+        'house',
+        'client',
+        'check_in_datetime',
+        'check_out_datetime',
+        'cancelled',
+        'archived_at',
+    )
+    search_fields = ('slug',)
+
+
 admin.site.register(HouseReservation, HouseReservationAdmin)
+admin.site.register(ArchivedHouseReservation, ArchivedHouseReservationAdmin)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import localtime
+
+from house_reservations.partitions import create_archive_partitions
+
+
+class Command(BaseCommand):
+    """ Заранее создает годовые секции архива бронирований"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--years-ahead", type=int, default=1,
+                            help="Сколько следующих лет, кроме текущего, подготовить")
+        parser.add_argument("--from-year", type=int, default=None,
+                            help="С какого года создавать секции (по умолчанию - с текущего)")
+
+    def handle(self, *args, **options):
+        current_year = localtime().year
+        first_year = options["from_year"] or current_year
+
+        partitions = create_archive_partitions(first_year, current_year + options["years_ahead"])
+        self.stdout.write(f'Archive partitions are ready: {", ".join(partitions)}')
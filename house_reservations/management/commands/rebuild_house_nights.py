@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from house_reservations.models import HouseReservation, HouseNight
+
+
+class Command(BaseCommand):
+    """ Пересоздает занятые ночи домиков (HouseNight) по актуальным бронированиям"""
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write('Rebuilding house nights ...')
+        created = HouseNight.rebuild(HouseReservation.objects.all())
+        self.stdout.write(f'Successfully created {created} house nights')
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:27
+
+import core.generators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_alter_client_first_name_alter_client_last_name'),
+        ('house_reservations', '0005_alter_housereservation_comment'),
+        ('houses', '0004_picture_dimensions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='housereservation',
+            name='slug',
+            field=models.CharField(default=core.generators.slug_generator, max_length=64, unique=True, verbose_name='Строковый идентификатор'),
+        ),
+        migrations.AddIndex(
+            model_name='housereservation',
+            index=models.Index(condition=models.Q(('cancelled', False)), fields=['house', 'check_in_datetime', 'check_out_datetime'], name='reservation_active_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='housereservation',
+            index=models.Index(fields=['house', 'check_in_datetime'], name='reservation_house_checkin_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_alter_client_first_name_alter_client_last_name'),
+        ('house_reservations', '0006_reservation_indexes'),
+        ('houses', '0004_picture_dimensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedHouseReservation',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('slug', models.CharField(max_length=64, unique=True, verbose_name='Строковый идентификатор')),
+                ('check_in_datetime', models.DateTimeField(verbose_name='Дата и время заезда')),
+                ('check_out_datetime', models.DateTimeField(verbose_name='Дата и время выезда')),
+                ('total_persons_amount', models.IntegerField(verbose_name='Количество человек для проживания в домике')),
+                ('preferred_contact', models.CharField(max_length=255, verbose_name='Предпочтительный способ связи')),
+                ('comment', models.CharField(blank=True, default='', max_length=511, verbose_name='Комментарий')),
+                ('cancelled', models.BooleanField(default=False, verbose_name='Отменено?')),
+                ('approved', models.BooleanField(default=False, verbose_name='Подтверждено менеджером?')),
+                ('created_at', models.DateTimeField(verbose_name='Время создания бронирования')),
+                ('updated_at', models.DateTimeField(verbose_name='Время последнего изменения бронирования')),
+                ('archived_at', models.DateTimeField(verbose_name='Время переноса в архив')),
+                ('client', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reservations', to='clients.client', verbose_name='Клиент')),
+                ('house', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reservations', to='houses.house', verbose_name='Домик')),
+            ],
+            options={
+                'verbose_name': 'Архивная бронь домика',
+                'verbose_name_plural': 'Архивные брони домиков',
+            },
+        ),
+    ]
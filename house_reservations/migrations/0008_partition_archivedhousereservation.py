@@ -0,0 +1,148 @@
+from django.db import migrations, models
+
+# Архив бронирований пересоздается как секционированная по check_in_datetime таблица (секция на календарный год).
+# Ограничения секционированных таблиц PostgreSQL:
+# * первичный и уникальные ключи должны включать ключ секционирования - первичный ключ (id, check_in_datetime),
+#   а slug больше не уникален на уровне бд (уникальность обеспечивается тем, что строки переносятся из
+#   HouseReservation, где slug уникален);
+# * на секционированную таблицу нельзя сослаться внешним ключом по одному id - внешний ключ из
+#   ArchivedHouseReservationBill удаляется вместе со старой таблицей (DROP ... CASCADE),
+#   в состоянии моделей он убирается миграцией house_reservations_billing 0003.
+FORWARD_SQL = """
+ALTER TABLE house_reservations_archivedhousereservation RENAME TO house_reservations_archivedhousereservation_old;
+
+CREATE TABLE house_reservations_archivedhousereservation (
+    LIKE house_reservations_archivedhousereservation_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE (check_in_datetime);
+
+ALTER TABLE house_reservations_archivedhousereservation
+    ADD CONSTRAINT archived_reservation_pkey PRIMARY KEY (id, check_in_datetime);
+ALTER TABLE house_reservations_archivedhousereservation
+    ADD CONSTRAINT archived_reservation_house_fk FOREIGN KEY (house_id) REFERENCES houses_house (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE house_reservations_archivedhousereservation
+    ADD CONSTRAINT archived_reservation_client_fk FOREIGN KEY (client_id) REFERENCES clients_client (id)
+    DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX archived_reservation_slug_idx ON house_reservations_archivedhousereservation (slug);
+CREATE INDEX archived_reservation_house_idx ON house_reservations_archivedhousereservation (house_id, check_in_datetime);
+CREATE INDEX archived_reservation_clnt_idx ON house_reservations_archivedhousereservation (client_id);
+
+-- секции для уже заархивированных бронирований, следующие создаются задачей архивации
+-- и командой create_reservations_archive_partitions
+DO $$
+DECLARE
+    partition_year integer;
+BEGIN
+    FOR partition_year IN
+        SELECT DISTINCT EXTRACT(YEAR FROM check_in_datetime AT TIME ZONE '%(time_zone)s')::integer
+        FROM house_reservations_archivedhousereservation_old
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %%I PARTITION OF house_reservations_archivedhousereservation '
+            'FOR VALUES FROM (%%L) TO (%%L)',
+            'house_reservations_archivedhousereservation_y' || partition_year,
+            partition_year || '-01-01 00:00:00 %(time_zone)s',
+            (partition_year + 1) || '-01-01 00:00:00 %(time_zone)s'
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO house_reservations_archivedhousereservation
+SELECT * FROM house_reservations_archivedhousereservation_old;
+
+DROP TABLE house_reservations_archivedhousereservation_old CASCADE;
+"""
+
+# Откат: архив снова становится обычной таблицей в том виде, в котором его создала миграция 0007
+# (первичный ключ id, уникальный slug, индексы внешних ключей), и восстанавливается внешний ключ
+# из ArchivedHouseReservationBill, удаленный при секционировании.
+REVERSE_SQL = """
+ALTER TABLE house_reservations_archivedhousereservation RENAME TO house_reservations_archivedhousereservation_old;
+
+CREATE TABLE house_reservations_archivedhousereservation (
+    LIKE house_reservations_archivedhousereservation_old INCLUDING DEFAULTS
+);
+
+INSERT INTO house_reservations_archivedhousereservation
+SELECT * FROM house_reservations_archivedhousereservation_old;
+
+DROP TABLE house_reservations_archivedhousereservation_old CASCADE;
+
+ALTER TABLE house_reservations_archivedhousereservation
+    ADD CONSTRAINT house_reservations_archivedhousereservation_pkey PRIMARY KEY (id);
+ALTER TABLE house_reservations_archivedhousereservation
+    ADD CONSTRAINT house_reservations_archivedhousereservation_slug_key UNIQUE (slug);
+ALTER TABLE house_reservations_archivedhousereservation
+    ADD CONSTRAINT archived_reservation_house_fk FOREIGN KEY (house_id) REFERENCES houses_house (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE house_reservations_archivedhousereservation
+    ADD CONSTRAINT archived_reservation_client_fk FOREIGN KEY (client_id) REFERENCES clients_client (id)
+    DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX house_reservations_archivedhousereservation_house_id ON house_reservations_archivedhousereservation (house_id);
+CREATE INDEX house_reservations_archivedhousereservation_client_id ON house_reservations_archivedhousereservation (client_id);
+
+ALTER TABLE house_reservations_billing_archivedhousereservationbill
+    ADD CONSTRAINT archived_bill_reservation_fk FOREIGN KEY (reservation_id)
+    REFERENCES house_reservations_archivedhousereservation (id) DEFERRABLE INITIALLY DEFERRED;
+"""
+
+
+def partition_archive(apps, schema_editor):
+    from django.conf import settings
+
+    schema_editor.execute(FORWARD_SQL % {"time_zone": settings.TIME_ZONE}, params=None)
+
+
+def unpartition_archive(apps, schema_editor):
+    schema_editor.execute(REVERSE_SQL, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house_reservations', '0007_archivedhousereservation'),
+        ('house_reservations_billing', '0002_archivedhousereservationbill'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(partition_archive, reverse_code=unpartition_archive),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='archivedhousereservation',
+                    name='slug',
+                    field=models.CharField(max_length=64, verbose_name='Строковый идентификатор'),
+                ),
+                migrations.AlterField(
+                    model_name='archivedhousereservation',
+                    name='house',
+                    field=models.ForeignKey(db_index=False, null=True,
+                                            on_delete=models.deletion.SET_NULL,
+                                            related_name='archived_reservations', to='houses.house',
+                                            verbose_name='Домик'),
+                ),
+                migrations.AlterField(
+                    model_name='archivedhousereservation',
+                    name='client',
+                    field=models.ForeignKey(db_index=False, null=True,
+                                            on_delete=models.deletion.SET_NULL,
+                                            related_name='archived_reservations', to='clients.client',
+                                            verbose_name='Клиент'),
+                ),
+                migrations.AddIndex(
+                    model_name='archivedhousereservation',
+                    index=models.Index(fields=['slug'], name='archived_reservation_slug_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='archivedhousereservation',
+                    index=models.Index(fields=['house', 'check_in_datetime'], name='archived_reservation_house_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='archivedhousereservation',
+                    index=models.Index(fields=['client'], name='archived_reservation_clnt_idx'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:31
+
+from datetime import datetime as Datetime, time as Time, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# копия house_reservations.models.reservation_nights и границ из core.models.Pricing на момент миграции:
+# миграция не должна меняться вместе с кодом приложения
+LATEST_CHECK_IN_TIME = Time(hour=16)
+EARLIEST_CHECK_OUT_TIME = Time(hour=12)
+
+
+def reservation_nights(check_in_datetime, check_out_datetime):
+    tz = timezone.get_default_timezone()
+
+    first_night = timezone.localtime(check_in_datetime).date()
+    if check_in_datetime > Datetime.combine(first_night, LATEST_CHECK_IN_TIME, tzinfo=tz):
+        first_night += timedelta(days=1)
+
+    last_night = timezone.localtime(check_out_datetime).date() - timedelta(days=1)
+    if check_out_datetime < Datetime.combine(last_night + timedelta(days=1), EARLIEST_CHECK_OUT_TIME, tzinfo=tz):
+        last_night -= timedelta(days=1)
+
+    return [first_night + timedelta(days=i) for i in range((last_night - first_night).days + 1)]
+
+
+def create_house_nights(apps, schema_editor):
+    HouseReservation = apps.get_model("house_reservations", "HouseReservation")
+    HouseNight = apps.get_model("house_reservations", "HouseNight")
+
+    nights = []
+    reservations = HouseReservation.objects.filter(cancelled=False, house__isnull=False).values_list(
+        "id", "house_id", "check_in_datetime", "check_out_datetime",
+    )
+    for reservation_id, house_id, check_in_datetime, check_out_datetime in reservations.iterator():
+        nights.extend(
+            HouseNight(house_id=house_id, night_date=night_date, reservation_id=reservation_id)
+            for night_date in reservation_nights(check_in_datetime, check_out_datetime)
+        )
+    HouseNight.objects.bulk_create(nights, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house_reservations', '0008_partition_archivedhousereservation'),
+        ('houses', '0004_picture_dimensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HouseNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night_date', models.DateField(verbose_name='Ночь (с этого дня на следующий)')),
+                ('house', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='houses.house', verbose_name='Домик')),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='house_reservations.housereservation', verbose_name='Бронирование')),
+            ],
+            options={
+                'verbose_name': 'Занятая ночь домика',
+                'verbose_name_plural': 'Занятые ночи домиков',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='housenight',
+            constraint=models.UniqueConstraint(fields=('house', 'night_date'), name='unique_house_night'),
+        ),
+        migrations.RunPython(create_house_nights, migrations.RunPython.noop),
+    ]
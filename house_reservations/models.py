@@ -1,11 +1,15 @@
+from datetime import datetime as Datetime, date as Date, timedelta
+
 from django.contrib.postgres.constraints import ExclusionConstraint
 from django.contrib.postgres.fields import RangeOperators, RangeBoundary
-from django.db import models
-from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.db import models, transaction, IntegrityError
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 
 from clients.models import Client
 from core.generators import slug_generator
+from core.models import Pricing
 from house_reservations.sql_functions import TsTzRange
 from house_reservations.validators import (
     check_datetime_fields,
@@ -15,8 +19,82 @@ from house_reservations.validators import (
 )
 
 
+# поля бронирования, от которых зависят его занятые ночи (HouseNight)
+NIGHTS_FIELDS = frozenset(("house", "house_id", "check_in_datetime", "check_out_datetime", "cancelled"))
+
+HOUSE_NIGHTS_BUSY_MESSAGE = "Домик уже забронирован на одну из выбранных ночей"
+
+
+class HouseNightsBusyError(ValidationError):
+    """
+    Бронирование пересекается с другим бронированием того же домика
+    """
+
+    def __init__(self):
+        super().__init__(HOUSE_NIGHTS_BUSY_MESSAGE)
+
+
+def is_reservation_overlapping_error(error: IntegrityError) -> bool:
+    """
+    Нарушено ли ограничение бд, которое не дает одному домику быть занятым двумя бронированиями
+    (exclude_reservations_overlapping или unique_house_night)
+    """
+    # psycopg2 сообщает имя нарушенного ограничения в diag
+    constraint_name = getattr(getattr(error.__cause__, "diag", None), "constraint_name", None)
+    return constraint_name in {
+        constraint.name
+        for model in (HouseReservation, HouseNight)
+        for constraint in model._meta.constraints
+    }
+
+
+class HouseReservationQuerySet(QuerySet):
+    """
+    Массовые операции ORM, которые не вызывают HouseReservation.save, тоже обновляют занятые ночи (HouseNight)
+    в той же транзакции. Сырой SQL их не обновляет - после него нужно вызвать HouseNight.rebuild
+    (или команду rebuild_house_nights).
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            reservations = super().bulk_create(objs, *args, **kwargs)
+            if all(reservation.pk is not None for reservation in reservations):
+                HouseNight.objects.bulk_create(
+                    [night for reservation in reservations for night in HouseNight.nights_for(reservation)],
+                    batch_size=kwargs.get("batch_size"),
+                )
+            else:
+                # с ignore_conflicts бд не возвращает id - ночи пересоздаются по slug
+                HouseNight.rebuild(
+                    self.model.objects.filter(slug__in=[reservation.slug for reservation in reservations])
+                )
+
+        return reservations
+
+    def update(self, **kwargs):
+        if not NIGHTS_FIELDS & kwargs.keys():
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            reservations_ids = list(self.values_list("id", flat=True))
+            updated = super().update(**kwargs)
+            HouseNight.rebuild(self.model.objects.filter(id__in=reservations_ids))
+
+        return updated
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if not NIGHTS_FIELDS & set(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+        with transaction.atomic(using=self.db):
+            updated = super().bulk_update(objs, fields, *args, **kwargs)
+            HouseNight.rebuild(self.model.objects.filter(id__in=[reservation.pk for reservation in objs]))
+
+        return updated
+
+
 class HouseReservation(models.Model):
-    slug = models.CharField(verbose_name="Строковый идентификатор", max_length=64, default=slug_generator)
+    slug = models.CharField(verbose_name="Строковый идентификатор", max_length=64, default=slug_generator, unique=True)
     house = models.ForeignKey("houses.House", verbose_name="Домик", on_delete=models.SET_NULL,
                               null=True, related_name='reservations')
     client = models.ForeignKey(Client, verbose_name="Клиент", on_delete=models.SET_NULL,
@@ -51,29 +129,96 @@ class HouseReservation(models.Model):
                 condition=Q(cancelled=False) | Q(house=None),
             ),
         ]
+        indexes = [
+            # проверки доступности работают только с неотмененными бронированиями
+            models.Index(
+                fields=["house", "check_in_datetime", "check_out_datetime"],
+                condition=Q(cancelled=False),
+                name="reservation_active_period_idx",
+            ),
+            # сортировка в админке
+            models.Index(fields=["house", "check_in_datetime"], name="reservation_house_checkin_idx"),
+        ]
 
         verbose_name = "Бронь домика"
         verbose_name_plural = 'Брони домиков'
 
-    def save(self, *args, **kwargs):
+    objects = HouseReservationQuerySet.as_manager()
+
+    # значения NIGHTS_FIELDS на момент загрузки из бд или последнего сохранения
+    _saved_nights_key = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_nights_key = instance._nights_key()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        # неизвестно, какие значения сейчас в бд у ночей - при следующем сохранении они пересоздаются
+        self._saved_nights_key = None
+
+    def _nights_key(self) -> tuple | None:
+        if self.get_deferred_fields() & NIGHTS_FIELDS:
+            return None
+        return self.house_id, self.check_in_datetime, self.check_out_datetime, self.cancelled
+
+    def _nights_changed(self, update_fields=None) -> bool:
+        if update_fields is not None and not NIGHTS_FIELDS & set(update_fields):
+            return False
+        return self._state.adding or self._saved_nights_key is None or self._saved_nights_key != self._nights_key()
+
+    def save(self, *args, validate: bool = True, **kwargs):
         # Note: При обновлении бронирования через админку чек не обновится автоматически
         # Нужно будет зайти в админку чека и нажать в ней сохранить - тогда пересчитается
 
-        # TODO из-за того, что оно (check_datetime_fields) находится здесь (до full_clean) - в админке
-        #  при создании неправильного бронирования вместо
-        #  небольшой красной плашки вылетает желтая страница с ошибкой
-        check_datetime_fields(self.local_check_in_datetime, self.local_check_out_datetime)
-        # вызывать эту функцию выше следует именно до full_clean
-        # Чтобы если она не проходит, возникала именно ValidationError, а не какая-то другая
-        self.full_clean()
+        # validate=False - параметры уже проверены (например, HouseReservationParametersSerializer),
+        # а пересечения с другими бронированиями не допустят ограничения в бд
+        # (см. house_reservations_management.services.house_reservation.create_reservation)
+        if validate:
+            # TODO из-за того, что оно (check_datetime_fields) находится здесь (до full_clean) - в админке
+            #  при создании неправильного бронирования вместо
+            #  небольшой красной плашки вылетает желтая страница с ошибкой
+            check_datetime_fields(self.local_check_in_datetime, self.local_check_out_datetime)
+            # вызывать эту функцию выше следует именно до full_clean
+            # Чтобы если она не проходит, возникала именно ValidationError, а не какая-то другая
+            self.full_clean()
+
+        adding = self._state.adding
+        nights_changed = self._nights_changed(kwargs.get("update_fields"))
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                # занятые ночи обновляются в той же транзакции, что и само бронирование,
+                # и только если изменилось то, от чего они зависят
+                if nights_changed:
+                    HouseNight.sync_reservation_nights(self, adding=adding)
+        except IntegrityError as e:
+            if adding:
+                # вставка откатилась вместе с транзакцией - бронирование снова несохраненное
+                self.pk = None
+                self._state.adding = True
+            if not is_reservation_overlapping_error(e):
+                raise
+            raise HouseNightsBusyError() from e
 
-        super().save(*args, **kwargs)
+        self._saved_nights_key = self._nights_key()
 
     def clean(self, *args, **kwargs):
         clean_check_in_datetime(self.local_check_in_datetime)
         clean_check_out_datetime(self.local_check_out_datetime)
         clean_total_persons_amount(self.total_persons_amount, self.house)
 
+        # ночи проверяются здесь, чтобы в админке конфликт был ошибкой формы, а не ошибкой сохранения
+        if self._nights_changed():
+            busy_nights = HouseNight.objects.filter(
+                night_date__in=[night.night_date for night in HouseNight.nights_for(self)],
+                house_id=self.house_id,
+            ).exclude(reservation_id=self.id)
+            if busy_nights.exists():
+                raise HouseNightsBusyError()
+
     @property
     def local_check_in_datetime(self):
         return timezone.localtime(self.check_in_datetime)
@@ -84,3 +229,139 @@ class HouseReservation(models.Model):
 
     def __str__(self):
         return f"Бронирование {self.slug}"
+
+
+def reservation_nights(check_in_datetime: Datetime, check_out_datetime: Datetime) -> list[Date]:
+    """
+    Ночи, которые занимает бронирование. Ночь day - это ночь с day на day + 1.
+    Она занята, если въезд не позже latest check_in в день day и выезд не раньше earliest check_out в день day + 1.
+    """
+    tz = timezone.get_default_timezone()
+
+    first_night = timezone.localtime(check_in_datetime).date()
+    if check_in_datetime > Datetime.combine(first_night, Pricing.ALLOWED_CHECK_IN_TIMES['latest'], tzinfo=tz):
+        first_night += timedelta(days=1)
+
+    last_night = timezone.localtime(check_out_datetime).date() - timedelta(days=1)
+    if check_out_datetime < Datetime.combine(last_night + timedelta(days=1),
+                                             Pricing.ALLOWED_CHECK_OUT_TIMES['earliest'], tzinfo=tz):
+        last_night -= timedelta(days=1)
+
+    return [first_night + timedelta(days=i) for i in range((last_night - first_night).days + 1)]
+
+
+class HouseNight(models.Model):
+    """
+    Ночь, занятая неотмененным бронированием домика.
+
+    Денормализация HouseReservation: поддерживается в HouseReservation.save (отмена бронирования удаляет его ночи)
+    и в массовых операциях HouseReservationQuerySet (bulk_create, update, bulk_update). Сырой SQL по таблице
+    бронирований ночи не обновляет - после него их нужно восстановить командой rebuild_house_nights.
+    Уникальный ключ (house, night_date) позволяет проверять доступность домиков простым поиском по индексу
+    и не дает занять одну ночь дважды.
+    """
+    house = models.ForeignKey("houses.House", verbose_name="Домик", on_delete=models.CASCADE,
+                              related_name='nights')
+    night_date = models.DateField("Ночь (с этого дня на следующий)")
+    reservation = models.ForeignKey(HouseReservation, verbose_name="Бронирование", on_delete=models.CASCADE,
+                                    related_name='nights')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["house", "night_date"], name="unique_house_night"),
+        ]
+
+        verbose_name = "Занятая ночь домика"
+        verbose_name_plural = 'Занятые ночи домиков'
+
+    @classmethod
+    def nights_for(cls, reservation: HouseReservation) -> list["HouseNight"]:
+        if reservation.cancelled or reservation.house_id is None:
+            return []
+
+        return [
+            cls(house_id=reservation.house_id, night_date=night_date, reservation_id=reservation.id)
+            for night_date in reservation_nights(reservation.check_in_datetime, reservation.check_out_datetime)
+        ]
+
+    @classmethod
+    def sync_reservation_nights(cls, reservation: HouseReservation, adding: bool = False):
+        if not adding:
+            cls.objects.filter(reservation_id=reservation.id).delete()
+        cls.objects.bulk_create(cls.nights_for(reservation))
+
+    @classmethod
+    def rebuild(cls, reservations: QuerySet[HouseReservation], batch_size: int = 1000) -> int:
+        """
+        Пересоздает ночи бронирований reservations. Возвращает количество созданных ночей.
+        """
+        created = 0
+        with transaction.atomic():
+            cls.objects.filter(reservation__in=reservations).delete()
+
+            nights = []
+            active_reservations = reservations.filter(cancelled=False, house__isnull=False)
+            for reservation in active_reservations.iterator(chunk_size=batch_size):
+                nights.extend(cls.nights_for(reservation))
+                if len(nights) >= batch_size:
+                    created += len(cls.objects.bulk_create(nights))
+                    nights = []
+            created += len(cls.objects.bulk_create(nights))
+
+        return created
+
+    def __str__(self):
+        return f"Ночь {self.night_date} домика {self.house_id}"
+
+
+class ArchivedHouseReservation(models.Model):
+    """
+    Бронирование, выезд по которому был давно - перенесено из HouseReservation задачей архивации,
+    чтобы таблица актуальных бронирований оставалась маленькой.
+    Поля повторяют HouseReservation (id сохраняется), чтобы переносить строки одним INSERT ... SELECT.
+
+    Таблица секционирована по check_in_datetime (секция на год, см. house_reservations.partitions), поэтому
+    первичный ключ в бд - (id, check_in_datetime), slug уникален только по построению,
+    а индексы заданы явно в Meta.indexes.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    slug = models.CharField(verbose_name="Строковый идентификатор", max_length=64)
+    house = models.ForeignKey("houses.House", verbose_name="Домик", on_delete=models.SET_NULL,
+                              null=True, related_name='archived_reservations', db_index=False)
+    client = models.ForeignKey(Client, verbose_name="Клиент", on_delete=models.SET_NULL,
+                               null=True, related_name='archived_reservations', db_index=False)
+
+    check_in_datetime = models.DateTimeField("Дата и время заезда")
+    check_out_datetime = models.DateTimeField("Дата и время выезда")
+    total_persons_amount = models.IntegerField("Количество человек для проживания в домике")
+
+    preferred_contact = models.CharField("Предпочтительный способ связи", max_length=255)
+    comment = models.CharField("Комментарий", max_length=511, default="", blank=True)
+
+    cancelled = models.BooleanField("Отменено?", default=False)
+    approved = models.BooleanField("Подтверждено менеджером?", default=False)
+
+    created_at = models.DateTimeField("Время создания бронирования")
+    updated_at = models.DateTimeField("Время последнего изменения бронирования")
+    archived_at = models.DateTimeField("Время переноса в архив")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["slug"], name="archived_reservation_slug_idx"),
+            models.Index(fields=["house", "check_in_datetime"], name="archived_reservation_house_idx"),
+            models.Index(fields=["client"], name="archived_reservation_clnt_idx"),
+        ]
+
+        verbose_name = "Архивная бронь домика"
+        verbose_name_plural = 'Архивные брони домиков'
+
+    @property
+    def local_check_in_datetime(self):
+        return timezone.localtime(self.check_in_datetime)
+
+    @property
+    def local_check_out_datetime(self):
+        return timezone.localtime(self.check_out_datetime)
+
+    def __str__(self):
+        return f"Архивное бронирование {self.slug}"
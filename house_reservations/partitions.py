@@ -0,0 +1,37 @@
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# таблица архивных бронирований секционирована по check_in_datetime - одна секция на календарный год
+ARCHIVE_TABLE = "house_reservations_archivedhousereservation"
+
+
+def archive_partition_name(year: int) -> str:
+    return f"{ARCHIVE_TABLE}_y{year}"
+
+
+def create_archive_partition_sql(year: int) -> str:
+    # границы секции - начало года в часовом поясе проекта
+    return (
+        f"CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(archive_partition_name(year))} "
+        f"PARTITION OF {connection.ops.quote_name(ARCHIVE_TABLE)} "
+        f"FOR VALUES FROM ('{year}-01-01 00:00:00 {settings.TIME_ZONE}') "
+        f"TO ('{year + 1}-01-01 00:00:00 {settings.TIME_ZONE}')"
+    )
+
+
+def create_archive_partitions(first_year: int, last_year: int) -> list[str]:
+    """
+    Создает секции архива бронирований с first_year по last_year включительно, если их еще нет.
+    Возвращает имена секций.
+    """
+    partitions = []
+    with connection.cursor() as cursor:
+        for year in range(first_year, last_year + 1):
+            cursor.execute(create_archive_partition_sql(year))
+            partitions.append(archive_partition_name(year))
+
+    return partitions
@@ -0,0 +1,113 @@
+from datetime import datetime as Datetime, date as Date, time as Time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation, HouseNight, HouseNightsBusyError, reservation_nights
+from houses.models import House
+
+
+class HouseNightsTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание")
+        self.client_instance = Client.objects.create(email="client@mail.ru")
+        self.check_in_date = now().date() + timedelta(days=10)
+
+    def _datetime(self, day: Date, time: Time) -> Datetime:
+        return Datetime.combine(day, time, tzinfo=get_default_timezone())
+
+    def _reserve(self, nights: int) -> HouseReservation:
+        return HouseReservation.objects.create(
+            house=self.house,
+            client=self.client_instance,
+            check_in_datetime=self._datetime(self.check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES["default"]),
+            check_out_datetime=self._datetime(self.check_in_date + timedelta(days=nights),
+                                              Pricing.ALLOWED_CHECK_OUT_TIMES["default"]),
+            total_persons_amount=1,
+        )
+
+    def _nights(self) -> list[Date]:
+        return list(HouseNight.objects.filter(house=self.house).order_by("night_date")
+                    .values_list("night_date", flat=True))
+
+    def test_reservation_nights(self):
+        day = Date(2030, 6, 10)
+        for check_in_time in (Time(13), Time(16)):
+            for check_out_time in (Time(12), Time(15)):
+                with self.subTest(check_in_time=check_in_time, check_out_time=check_out_time):
+                    self.assertEqual(
+                        reservation_nights(self._datetime(day, check_in_time),
+                                           self._datetime(day + timedelta(days=3), check_out_time)),
+                        [day, day + timedelta(days=1), day + timedelta(days=2)],
+                    )
+
+    def test_nights_follow_reservation(self):
+        reservation = self._reserve(nights=3)
+        self.assertEqual(self._nights(), [self.check_in_date + timedelta(days=i) for i in range(3)])
+
+        reservation.check_out_datetime -= timedelta(days=2)
+        reservation.save()
+        self.assertEqual(self._nights(), [self.check_in_date])
+
+        reservation.cancelled = True
+        reservation.save()
+        self.assertEqual(self._nights(), [])
+
+    def test_rebuild(self):
+        self._reserve(nights=2)
+        HouseNight.objects.all().delete()
+
+        self.assertEqual(HouseNight.rebuild(HouseReservation.objects.all()), 2)
+        self.assertEqual(self._nights(), [self.check_in_date, self.check_in_date + timedelta(days=1)])
+
+    def test_save_without_nights_changes_keeps_nights(self):
+        reservation = self._reserve(nights=2)
+        nights_ids = set(HouseNight.objects.values_list("id", flat=True))
+
+        reservation = HouseReservation.objects.get(id=reservation.id)
+        reservation.comment = "Новый комментарий"
+        reservation.approved = True
+        reservation.save()
+
+        self.assertEqual(set(HouseNight.objects.values_list("id", flat=True)), nights_ids)
+
+    def test_bulk_operations_keep_nights(self):
+        reservation, = HouseReservation.objects.bulk_create([
+            HouseReservation(
+                house=self.house,
+                check_in_datetime=self._datetime(self.check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES["default"]),
+                check_out_datetime=self._datetime(self.check_in_date + timedelta(days=2),
+                                                  Pricing.ALLOWED_CHECK_OUT_TIMES["default"]),
+                total_persons_amount=1,
+            ),
+        ])
+        self.assertEqual(self._nights(), [self.check_in_date, self.check_in_date + timedelta(days=1)])
+
+        reservation.check_out_datetime += timedelta(days=1)
+        HouseReservation.objects.bulk_update([reservation], ["check_out_datetime"])
+        self.assertEqual(len(self._nights()), 3)
+
+        HouseReservation.objects.filter(id=reservation.id).update(cancelled=True)
+        self.assertEqual(self._nights(), [])
+
+    def test_busy_nights_raise_validation_error(self):
+        first = self._reserve(nights=3)
+        overlapping = HouseReservation(
+            house=self.house,
+            check_in_datetime=first.check_in_datetime + timedelta(days=1),
+            check_out_datetime=first.check_out_datetime + timedelta(days=1),
+            total_persons_amount=1,
+        )
+
+        # с проверками - ошибка формы в админке, без проверок - нарушение ограничения бд
+        for validate in (True, False):
+            with self.subTest(validate=validate):
+                with self.assertRaises(ValidationError):
+                    overlapping.save(validate=validate)
+
+        with self.assertRaises(HouseNightsBusyError):
+            overlapping.save(validate=False)
+        self.assertEqual(HouseReservation.objects.count(), 1)
@@ -25,7 +25,7 @@ class HouseReservationBillAdmin(admin.ModelAdmin):
     )
 
     def chronological_positions_prettified(self, instance):
-        response = ChronologicalPositionsEncoder().encode(instance.chronological_positions)
+        response = ChronologicalPositionsEncoder(indent=2, sort_keys=True).encode(instance.chronological_positions)
         formatter = HtmlFormatter(style="emacs")
         response = highlight(response, JsonLexer(), formatter)
         style = "<style>" + formatter.get_style_defs() + "</style><br>"
@@ -34,7 +34,8 @@ class HouseReservationBillAdmin(admin.ModelAdmin):
     chronological_positions_prettified.short_description = 'Читаемый список хронологически упорядоченных позиций'
 
     def non_chronological_positions_prettified(self, instance):
-        response = NonChronologicalPositionsEncoder().encode(instance.non_chronological_positions)
+        response = NonChronologicalPositionsEncoder(indent=2, sort_keys=True).encode(
+            instance.non_chronological_positions)
         formatter = HtmlFormatter(style="emacs")
         response = highlight(response, JsonLexer(), formatter)
         style = "<style>" + formatter.get_style_defs() + "</style><br>"
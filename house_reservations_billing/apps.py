@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HouseReservationsBillingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'house_reservations_billing'
+
+    def ready(self):
+        import house_reservations_billing.signals  # pylint: disable=unused-import
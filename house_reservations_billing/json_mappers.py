@@ -1,74 +1,111 @@
-import json
-import re
-from datetime import datetime as Datetime, date as Date, time as Time
+from datetime import date as Date, time as Time
 from json import JSONEncoder, JSONDecoder
 
-# DATETIME_FORMAT = "%d-%m-%Y %H:%M"
+from house_reservations_billing.models.constants import (
+    NIGHT_POSITION,
+    EARLY_CHECK_IN_POSITION,
+    LATE_CHECK_OUT_POSITION,
+)
+
+DATETIME_FORMAT = "%d-%m-%Y %H:%M"
 DATE_FORMAT = "%d-%m-%Y"
 TIME_FORMAT = "%H:%M"
+COMPACT_SEPARATORS = (",", ":")
+
+# схема хронологических позиций: тип позиции -> (поля с датами, поля со временем)
+CHRONOLOGICAL_POSITIONS_SCHEMA = {
+    NIGHT_POSITION: (frozenset({"start_date", "end_date"}), frozenset()),
+    EARLY_CHECK_IN_POSITION: (frozenset({"date"}), frozenset({"time"})),
+    LATE_CHECK_OUT_POSITION: (frozenset({"date"}), frozenset({"time"})),
+}
+# позиции неизвестного типа (например, из старых счетов) разбираются по всем известным полям
+ANY_POSITION_FIELDS = (
+    frozenset().union(*(date_fields for date_fields, _ in CHRONOLOGICAL_POSITIONS_SCHEMA.values())),
+    frozenset().union(*(time_fields for _, time_fields in CHRONOLOGICAL_POSITIONS_SCHEMA.values())),
+)
+
+
+def encode_date(date: Date) -> str:
+    # то же, что date.strftime(DATE_FORMAT), но без разбора формата
+    return f"{date.day:02d}-{date.month:02d}-{date.year:04d}"
+
+
+def encode_time(time: Time) -> str:
+    return f"{time.hour:02d}:{time.minute:02d}"
+
+
+def decode_date(value: str) -> Date:
+    # строка DATE_FORMAT: dd-mm-yyyy
+    if len(value) != 10 or value[2] != "-" or value[5] != "-":
+        raise ValueError(f"Date {value!r} does not match format {DATE_FORMAT}")
+    return Date(int(value[6:]), int(value[3:5]), int(value[:2]))
+
+
+def decode_time(value: str) -> Time:
+    # строка TIME_FORMAT: HH:MM
+    if len(value) != 5 or value[2] != ":":
+        raise ValueError(f"Time {value!r} does not match format {TIME_FORMAT}")
+    return Time(int(value[:2]), int(value[3:]))
+
+
+def _decode_fields(position: dict, fields: frozenset, decode) -> None:
+    for field in fields:
+        value = position.get(field)
+        if value.__class__ is str:
+            try:
+                position[field] = decode(value)
+            except ValueError:
+                # значение не в нашем формате - оставляем как есть
+                pass
+
+
+def decode_chronological_position(position: dict) -> dict:
+    date_fields, time_fields = CHRONOLOGICAL_POSITIONS_SCHEMA.get(position.get("type"), ANY_POSITION_FIELDS)
+    _decode_fields(position, date_fields, decode_date)
+    _decode_fields(position, time_fields, decode_time)
+    return position
 
 
 class ChronologicalPositionsEncoder(JSONEncoder):
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__()
-        self.ensure_ascii = False
-        self.sort_keys = True
-        self.indent = 2
+    """
+    Компактная запись позиций: без отступов и сортировки ключей (jsonb в бд все равно хранит json по-своему),
+    что позволяет json использовать C-реализацию кодировщика.
+    Для читаемого вывода (например, в админке) отступы и сортировку можно передать явно.
+    """
+
+    def __init__(self, *args, ensure_ascii=False, sort_keys=False, indent=None, separators=None, **kwargs):
+        if separators is None and indent is None:
+            separators = COMPACT_SEPARATORS
+        super().__init__(*args, ensure_ascii=ensure_ascii, sort_keys=sort_keys, indent=indent,
+                         separators=separators, **kwargs)
 
     def default(self, o):
         if isinstance(o, Date):
-            return o.strftime(DATE_FORMAT)
+            return encode_date(o)
         elif isinstance(o, Time):
-            return o.strftime(TIME_FORMAT)
+            return encode_time(o)
         else:
             return super().default(o)
 
 
 class ChronologicalPositionsDecoder(JSONDecoder):
+    """
+    Даты и время позиций разбираются прямо во время разбора json (object_hook вызывается для каждого объекта),
+    без повторных обходов результата. Какие поля разбирать, определяется схемой по типу позиции.
+    """
 
-    def decode(self, s, _w=json.decoder.WHITESPACE.match):
-        result = super().decode(s, _w)  # вызовем оригинальный decode
-        # Если есть поле "date", пытаемся его преобразовать
-
-        result = self._recursive_transform(result, ".*date", lambda x: Datetime.strptime(x, DATE_FORMAT).date())
-        result = self._recursive_transform(result, ".*time", lambda x: Datetime.strptime(x, TIME_FORMAT).time())
-
-        return result
-
-    def _recursive_transform(self, obj, transformed_key_pattern, transformation_rule):
-        if isinstance(obj, dict):  # Если текущий объект - словарь
-            for key, value in obj.items():
-                if re.match(transformed_key_pattern, key):  # Если мы нашли ключ transformed_key
-                    try:
-                        # Пытаемся преобразовать значение согласно transformation_rule
-                        obj[key] = transformation_rule(value)
-                    except Exception as e:  # Если не получилось - продолжаем
-                        pass
-                else:
-                    # Если текущее значение - вложенный словарь или список,
-                    # обрабатываем его рекурсивно
-                    obj[key] = self._recursive_transform(value, transformed_key_pattern, transformation_rule)
-        elif isinstance(obj, list):  # Если текущий объект - список
-            for i in range(len(obj)):
-                # Обрабатываем каждый элемент рекурсивно
-                obj[i] = self._recursive_transform(obj[i], transformed_key_pattern, transformation_rule)
-        # Если объект не словарь и не список, оставляем его без изменений
-        return obj
+    def __init__(self, *args, **kwargs):
+        kwargs["object_hook"] = decode_chronological_position
+        super().__init__(*args, **kwargs)
 
 
 class NonChronologicalPositionsEncoder(JSONEncoder):
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__()
-        self.ensure_ascii = False
-        self.sort_keys = True
-        self.indent = 2
-
-    def default(self, o):
-        return super().default(o)
+    def __init__(self, *args, ensure_ascii=False, sort_keys=False, indent=None, separators=None, **kwargs):
+        if separators is None and indent is None:
+            separators = COMPACT_SEPARATORS
+        super().__init__(*args, ensure_ascii=ensure_ascii, sort_keys=sort_keys, indent=indent,
+                         separators=separators, **kwargs)
 
 
 class NonChronologicalPositionsDecoder(JSONDecoder):
-
-    def decode(self, s, _w=json.decoder.WHITESPACE.match):
-        result = super().decode(s, _w)
-        return result
+    pass
@@ -0,0 +1,66 @@
+import time
+from datetime import datetime as Datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation
+from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_billing.services.bill import initialize_bill
+from houses.models import House
+
+
+class Command(BaseCommand):
+    """
+    Время расчета счета (initialize_bill) с ранним въездом, поздним выездом и дополнительными гостями.
+    Домик, клиент, бронирования и счета создаются только в памяти, события и праздники берутся из бд.
+    Ничего не записывает в бд.
+    """
+    help = "Microbenchmark of bill calculation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bills", type=int, default=1000, help="Количество счетов")
+        parser.add_argument("--nights", type=int, default=30, help="Количество ночей в каждом счете")
+
+    def handle(self, *args, **options):
+        if options["bills"] < 1 or options["nights"] < 1:
+            raise CommandError("--bills and --nights must be positive")
+
+        house = House(
+            id=1,
+            name="Домик",
+            description="Описание",
+            base_price=7000,
+            holidays_multiplier=1.2,
+            base_persons_amount=2,
+            max_persons_amount=5,
+            price_per_extra_person=1000,
+        )
+        client = Client(email="client@mail.ru")
+        tz = get_default_timezone()
+        check_in_date = now().date() + timedelta(days=10)
+
+        bills = [
+            HouseReservationBill(reservation=HouseReservation(
+                house=house,
+                client=client,
+                check_in_datetime=Datetime.combine(check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES["earliest"],
+                                                   tzinfo=tz),
+                check_out_datetime=Datetime.combine(check_in_date + timedelta(days=options["nights"]),
+                                                    Pricing.ALLOWED_CHECK_OUT_TIMES["latest"], tzinfo=tz),
+                total_persons_amount=4,
+            ))
+            for _ in range(options["bills"])
+        ]
+        # первый расчет загружает индекс событий и календарь праздников
+        initialize_bill(bills[0])
+
+        started_at = time.perf_counter()
+        for bill in bills:
+            initialize_bill(bill)
+        duration = time.perf_counter() - started_at
+
+        self.stdout.write(f"{options['nights']}-night bill: {duration / options['bills'] * 1000:.3f} ms "
+                          f"({options['bills']} bills in {duration:.2f} s)")
@@ -0,0 +1,150 @@
+import json
+import re
+import time
+from datetime import datetime as Datetime, date as Date, time as Time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from house_reservations_billing.json_mappers import (
+    DATE_FORMAT,
+    TIME_FORMAT,
+    ChronologicalPositionsEncoder,
+    ChronologicalPositionsDecoder,
+)
+from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_billing.models.constants import (
+    NIGHT_POSITION,
+    EARLY_CHECK_IN_POSITION,
+    LATE_CHECK_OUT_POSITION,
+)
+
+
+class LegacyChronologicalPositionsEncoder(json.JSONEncoder):
+    """
+    Прежний кодировщик позиций (отступы, сортировка ключей и strftime) - для сравнения
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(ensure_ascii=False, sort_keys=True, indent=2)
+
+    def default(self, o):
+        if isinstance(o, Date):
+            return o.strftime(DATE_FORMAT)
+        elif isinstance(o, Time):
+            return o.strftime(TIME_FORMAT)
+        else:
+            return super().default(o)
+
+
+class LegacyChronologicalPositionsDecoder(json.JSONDecoder):
+    """
+    Прежний декодер позиций (два рекурсивных обхода с re.match и strptime) - для сравнения
+    """
+
+    def decode(self, s, _w=json.decoder.WHITESPACE.match):
+        result = super().decode(s, _w)
+        result = self._recursive_transform(result, ".*date", lambda x: Datetime.strptime(x, DATE_FORMAT).date())
+        result = self._recursive_transform(result, ".*time", lambda x: Datetime.strptime(x, TIME_FORMAT).time())
+        return result
+
+    def _recursive_transform(self, obj, transformed_key_pattern, transformation_rule):
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                if re.match(transformed_key_pattern, key):
+                    try:
+                        obj[key] = transformation_rule(value)
+                    except Exception:
+                        pass
+                else:
+                    obj[key] = self._recursive_transform(value, transformed_key_pattern, transformation_rule)
+        elif isinstance(obj, list):
+            for i in range(len(obj)):
+                obj[i] = self._recursive_transform(obj[i], transformed_key_pattern, transformation_rule)
+        return obj
+
+
+def make_positions(check_in_date: Date, nights_amount: int) -> list[dict]:
+    positions = [{
+        "type": EARLY_CHECK_IN_POSITION,
+        "time": Time(12, 0),
+        "date": check_in_date,
+        "price": 2500,
+        "description": "Ранний въезд",
+    }]
+    for i in range(nights_amount):
+        positions.append({
+            "type": NIGHT_POSITION,
+            "start_date": check_in_date + timedelta(days=i),
+            "end_date": check_in_date + timedelta(days=i + 1),
+            "price": 10000 + 100 * i,
+            "description": "Ночь",
+        })
+    positions.append({
+        "type": LATE_CHECK_OUT_POSITION,
+        "time": Time(14, 30),
+        "date": check_in_date + timedelta(days=nights_amount),
+        "price": 2500,
+        "description": "Поздний выезд",
+    })
+    return positions
+
+
+class Command(BaseCommand):
+    """
+    Сравнение прежних кодировщика и декодера хронологических позиций счета с текущими.
+    По умолчанию позиции счетов создаются в памяти и записываются так же, как их возвращает jsonb,
+    с --from-db разбираются позиции сохраненных счетов. Ничего не записывает в бд.
+    """
+    help = "Benchmark of the bill positions codec against the previous one"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bills", type=int, default=10000, help="Количество счетов")
+        parser.add_argument("--from-db", action="store_true", help="Разбирать позиции сохраненных счетов")
+
+    def handle(self, *args, **options):
+        if options["bills"] < 1:
+            raise CommandError("--bills must be positive")
+
+        if options["from_db"]:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT chronological_positions::text FROM {HouseReservationBill._meta.db_table} "
+                               f"LIMIT %s", [options["bills"]])
+                stored_positions = [row[0] for row in cursor.fetchall()]
+            if not stored_positions:
+                raise CommandError("There are no stored bills")
+        else:
+            check_in_date = Date(2024, 6, 1)
+            stored_positions = [
+                # jsonb возвращает json с пробелами после запятых и двоеточий
+                json.dumps(json.loads(json.dumps(make_positions(check_in_date + timedelta(days=i % 300), 1 + i % 14),
+                                                 cls=ChronologicalPositionsEncoder)), ensure_ascii=False)
+                for i in range(options["bills"])
+            ]
+
+        started_at = time.perf_counter()
+        legacy_positions = [json.loads(value, cls=LegacyChronologicalPositionsDecoder) for value in stored_positions]
+        legacy_decoding = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        positions = [json.loads(value, cls=ChronologicalPositionsDecoder) for value in stored_positions]
+        decoding = time.perf_counter() - started_at
+
+        if positions != legacy_positions:
+            raise CommandError("ChronologicalPositionsDecoder output differs from the previous decoder")
+
+        started_at = time.perf_counter()
+        for value in positions:
+            json.dumps(value, cls=LegacyChronologicalPositionsEncoder)
+        legacy_encoding = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        for value in positions:
+            json.dumps(value, cls=ChronologicalPositionsEncoder)
+        encoding = time.perf_counter() - started_at
+
+        self.stdout.write(f"{len(stored_positions)} bills")
+        self.stdout.write(f"decoding: previous {legacy_decoding:.3f} s, current {decoding:.3f} s "
+                          f"(x{legacy_decoding / decoding:.1f})")
+        self.stdout.write(f"encoding: previous {legacy_encoding:.3f} s, current {encoding:.3f} s "
+                          f"(x{legacy_encoding / encoding:.1f})")
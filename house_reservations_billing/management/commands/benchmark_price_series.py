@@ -0,0 +1,83 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+
+from house_reservations_billing.services.price_calculators import (
+    calculate_house_price_by_day,
+    calculate_extra_persons_price,
+    houses_price_series,
+)
+from houses.models import House
+
+
+class Command(BaseCommand):
+    """
+    Сравнение расчета цен ночей по дням (calculate_house_price_by_day) с houses_price_series.
+    Домики создаются только в памяти, события и праздники берутся из бд. Ничего не записывает в бд.
+    """
+    help = "Benchmark of houses_price_series against day-by-day prices"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--houses", type=int, default=50, help="Количество домиков")
+        parser.add_argument("--days", type=int, default=365, help="Длина промежутка в днях")
+        parser.add_argument("--persons", type=int, default=3, help="Количество гостей")
+        parser.add_argument("--repeats", type=int, default=5, help="Сколько раз повторить замер (берется лучший)")
+
+    def handle(self, *args, **options):
+        if options["houses"] < 1 or options["days"] < 1 or options["repeats"] < 1:
+            raise CommandError("--houses, --days and --repeats must be positive")
+
+        houses = [
+            House(
+                id=i,
+                name=f"Домик{i}",
+                base_price=5000 + 350 * i,
+                holidays_multiplier=1 + 0.07 * i,
+                base_persons_amount=2,
+                max_persons_amount=5,
+                price_per_extra_person=1000 + 100 * i,
+            )
+            for i in range(1, options["houses"] + 1)
+        ]
+        start = now().date()
+        end = start + timedelta(days=options["days"])
+        persons = options["persons"]
+
+        def day_by_day() -> dict[int, list[int]]:
+            return {
+                house.id: [
+                    calculate_house_price_by_day(house, start + timedelta(days=i))
+                    + calculate_extra_persons_price(house, persons)
+                    for i in range(1, options["days"] + 1)
+                ]
+                for house in houses
+            }
+
+        def series() -> dict[int, list[int]]:
+            return {
+                house_id: list(prices)
+                for house_id, prices in houses_price_series(houses, start, end, persons).items()
+            }
+
+        # первый вызов загружает индекс событий и календарь праздников
+        if day_by_day() != series():
+            raise CommandError("houses_price_series differs from day-by-day prices")
+
+        day_by_day_duration = self._best_duration(day_by_day, options["repeats"])
+        series_duration = self._best_duration(series, options["repeats"])
+
+        self.stdout.write(f"{options['days']} days for {options['houses']} houses: "
+                          f"day by day {day_by_day_duration * 1000:.1f} ms, "
+                          f"houses_price_series {series_duration * 1000:.1f} ms "
+                          f"(x{day_by_day_duration / series_duration:.1f})")
+
+    @staticmethod
+    def _best_duration(function, repeats: int) -> float:
+        durations = []
+        for _ in range(repeats):
+            started_at = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - started_at)
+        return min(durations)
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:28
+
+import django.db.models.deletion
+import house_reservations_billing.json_mappers
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house_reservations', '0007_archivedhousereservation'),
+        ('house_reservations_billing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedHouseReservationBill',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('total', models.IntegerField(verbose_name='Итоговая стоимость')),
+                ('chronological_positions', models.JSONField(blank=True, decoder=house_reservations_billing.json_mappers.ChronologicalPositionsDecoder, default=dict, encoder=house_reservations_billing.json_mappers.ChronologicalPositionsEncoder, verbose_name='Хронологически упорядоченные позиции')),
+                ('non_chronological_positions', models.JSONField(blank=True, decoder=house_reservations_billing.json_mappers.NonChronologicalPositionsDecoder, default=dict, encoder=house_reservations_billing.json_mappers.NonChronologicalPositionsEncoder, verbose_name='Хронологически неупорядоченные позиции')),
+                ('paid', models.BooleanField(default=False)),
+                ('promo_code', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_bills', to='house_reservations_billing.housereservationpromocode', verbose_name='Промокод')),
+                ('reservation', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bill', to='house_reservations.archivedhousereservation', verbose_name='Архивное бронирование')),
+            ],
+            options={
+                'verbose_name': 'Счет архивного бронирования домика',
+                'verbose_name_plural': 'Счета архивных бронирований домиков',
+            },
+        ),
+    ]
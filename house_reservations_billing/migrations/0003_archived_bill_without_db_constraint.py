@@ -0,0 +1,25 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house_reservations', '0008_partition_archivedhousereservation'),
+        ('house_reservations_billing', '0002_archivedhousereservationbill'),
+    ]
+
+    operations = [
+        # сам внешний ключ уже удален миграцией house_reservations 0008 вместе с несекционированной таблицей архива
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='archivedhousereservationbill',
+                    name='reservation',
+                    field=models.OneToOneField(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bill', to='house_reservations.archivedhousereservation', verbose_name='Архивное бронирование'),
+                ),
+            ],
+        ),
+    ]
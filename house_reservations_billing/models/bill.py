@@ -59,10 +59,66 @@ class HouseReservationBill(models.Model):
     def recalculate(self):
         initialize_bill(self)
 
-    def save(self, *args, **kwargs):
-        self.recalculate()
-        self.full_clean()
+    def save(self, *args, recalculate: bool = True, **kwargs):
+        # recalculate=False - счет уже посчитан (recalculate) и проверен вызывающим кодом
+        if recalculate:
+            self.recalculate()
+            self.full_clean()
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Счет на оплату бронирования ({self.reservation.slug})"
+
+
+class ArchivedHouseReservationBill(models.Model):
+    """
+    Счет архивного бронирования. Переносится в архив вместе с бронированием и больше не пересчитывается.
+    Поля повторяют HouseReservationBill (id сохраняется), чтобы переносить строки одним INSERT ... SELECT.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    reservation = models.OneToOneField(
+        "house_reservations.ArchivedHouseReservation",
+        verbose_name="Архивное бронирование",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='bill',
+        # архив бронирований секционирован, сослаться на него внешним ключом по одному id нельзя
+        db_constraint=False,
+    )
+
+    total = models.IntegerField("Итоговая стоимость")
+
+    chronological_positions = models.JSONField(
+        verbose_name="Хронологически упорядоченные позиции",
+        default=dict,
+        blank=True,
+        encoder=ChronologicalPositionsEncoder,
+        decoder=ChronologicalPositionsDecoder,
+    )
+    non_chronological_positions = models.JSONField(
+        verbose_name="Хронологически неупорядоченные позиции",
+        default=dict,
+        blank=True,
+        encoder=NonChronologicalPositionsEncoder,
+        decoder=NonChronologicalPositionsDecoder,
+    )
+
+    promo_code = models.ForeignKey(
+        verbose_name="Промокод",
+        to="HouseReservationPromoCode",
+        on_delete=models.SET_NULL,
+        related_name='archived_bills',
+        default=None,
+        null=True,
+        blank=True,
+    )
+
+    paid = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = "Счет архивного бронирования домика"
+        verbose_name_plural = 'Счета архивных бронирований домиков'
+
+    def __str__(self):
+        return f"Счет на оплату архивного бронирования ({self.reservation.slug})"
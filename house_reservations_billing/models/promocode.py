@@ -3,6 +3,9 @@ from django.db import models
 
 from house_reservations_billing.models.constants import FIXED_VALUE_DISCOUNT, PERCENTAGE_DISCOUNT
 
+# поколение промокодов в redis - увеличивается при изменении промокодов и их использований (счетов с промокодом)
+PROMO_CODES_GENERATION_NAME = "promo_codes"
+
 
 class HouseReservationPromoCode(models.Model):
     DISCOUNT_TYPE_CHOICES = {
@@ -2,9 +2,9 @@ import logging
 
 from rest_framework import serializers
 
-from house_reservations.models import HouseReservation
+from house_reservations.models import HouseReservation, ArchivedHouseReservation
 from house_reservations.serializers import HouseReservationSerializer
-from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_billing.models.bill import HouseReservationBill, ArchivedHouseReservationBill
 
 logger = logging.getLogger(__name__)
 
@@ -32,3 +32,15 @@ class HouseReservationWithBillSerializer(HouseReservationSerializer):
     class Meta:
         model = HouseReservation
         fields = HouseReservationSerializer.Meta.fields + ["bill", ]
+
+
+class ArchivedHouseReservationBillSerializer(HouseReservationBillSerializer):
+    class Meta(HouseReservationBillSerializer.Meta):
+        model = ArchivedHouseReservationBill
+
+
+class ArchivedHouseReservationWithBillSerializer(HouseReservationWithBillSerializer):
+    bill = ArchivedHouseReservationBillSerializer()
+
+    class Meta(HouseReservationWithBillSerializer.Meta):
+        model = ArchivedHouseReservation
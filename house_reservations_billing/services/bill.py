@@ -1,9 +1,10 @@
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import datetime as Datetime
 
+from clients.models import Client
 from core.models import Pricing
-from house_reservations_billing.services.price_calculators import calculate_house_price_by_day, \
-    calculate_extra_persons_price
 from house_reservations_billing.services.promocode import apply, check_availability
+from house_reservations_billing.services.stay_pricing import StayPricingContext
 from house_reservations_billing.services.text_helpers import (
     early_check_in_description,
     night_description,
@@ -16,94 +17,130 @@ from house_reservations_billing.models.constants import (
     EXTRA_PERSONS_POSITION,
     PROMO_CODE_POSITION,
 )
-
-
-def initialize_bill(bill):
-    house = bill.reservation.house
-
-    check_in_date = bill.reservation.local_check_in_datetime.date()
-    check_in_time = bill.reservation.local_check_in_datetime.time()
-
-    check_out_date = bill.reservation.local_check_out_datetime.date()
-    check_out_time = bill.reservation.local_check_out_datetime.time()
+from houses.models import House
+
+
+@dataclass
+class BillCalculation:
+    chronological_positions: list[dict]
+    non_chronological_positions: list[dict]
+    total: int
+
+
+def calculate_bill(
+        house: House,
+        local_check_in_datetime: Datetime,
+        local_check_out_datetime: Datetime,
+        total_persons_amount: int,
+        promo_code=None,
+        client: Client | None = None,
+        bill=None,
+) -> BillCalculation:
+    """
+    Позиции и итоговая стоимость счета за проживание. Модели бронирования и счета для расчета не нужны -
+    bill передается только для проверки промокода (уже сохраненный с этим промокодом счет не считается его
+    повторным использованием).
+    """
+    check_in_date = local_check_in_datetime.date()
+    check_in_time = local_check_in_datetime.time()
+
+    check_out_date = local_check_out_datetime.date()
+    check_out_time = local_check_out_datetime.time()
 
     non_chronological_positions = []
     chronological_positions = []
+    total = 0
+
+    # цены всех нужных дней считаются один раз, дальше позиции собираются из контекста без обращений к бд
+    pricing = StayPricingContext(house, check_in_date, check_out_date)
+
+    # увеличение стоимости за ранний въезд
+    early_check_in_price = Pricing.ALLOWED_CHECK_IN_TIMES.get(check_in_time, 0) * pricing.day_price(check_in_date)
+    if early_check_in_price != 0:
+        chronological_positions.append({
+            "type": EARLY_CHECK_IN_POSITION,
+            "time": check_in_time,
+            "date": check_in_date,
+            "price": early_check_in_price,
+            "description": early_check_in_description(check_in_date, check_in_time)
+        })
+        total += early_check_in_price
 
     # NOTE: ночь идет перед днем
     # иными словами множитель выходного дня применяется к ночам пт-сб и сб-вс, но не к вс-пн
-    date = check_in_date + timedelta(days=1)
-    while date <= check_out_date:
+    for start_date, end_date, price in pricing.nights():
         chronological_positions.append({
             "type": NIGHT_POSITION,
-            "start_date": date - timedelta(days=1),
-            "end_date": date,
-            "price": calculate_house_price_by_day(house, date),
-            "description": night_description(date - timedelta(days=1), date)
+            "start_date": start_date,
+            "end_date": end_date,
+            "price": price,
+            "description": night_description(start_date, end_date)
+        })
+        total += price
+
+    # увеличение стоимости за поздний выезд
+    late_check_out_price = Pricing.ALLOWED_CHECK_OUT_TIMES.get(check_out_time, 0) * pricing.day_price(check_out_date)
+    if late_check_out_price != 0:
+        chronological_positions.append({
+            'type': LATE_CHECK_OUT_POSITION,
+            "time": check_out_time,
+            "date": check_out_date,
+            "price": late_check_out_price,
+            "description": late_check_out_description(check_out_date, check_out_time)
         })
-        date = date + timedelta(days=1)
-
-    # увеличение стоимости за ранний въезд и поздний выезд
-    early_check_in = {
-        "type": EARLY_CHECK_IN_POSITION,
-        "time": check_in_time,
-        "date": check_in_date,
-        "price": Pricing.ALLOWED_CHECK_IN_TIMES.get(check_in_time, 0) *
-                 calculate_house_price_by_day(house, check_in_date),
-        "description": early_check_in_description(check_in_date, check_in_time)
-    }
-    if early_check_in["price"] != 0:
-        chronological_positions.insert(0, early_check_in)
-
-    late_check_out = {
-        'type': LATE_CHECK_OUT_POSITION,
-        "time": check_out_time,
-        "date": check_out_date,
-        "price": Pricing.ALLOWED_CHECK_OUT_TIMES.get(check_out_time, 0) *
-                 calculate_house_price_by_day(house, check_out_date),
-        "description": late_check_out_description(check_out_date, check_out_time)
-    }
-    if late_check_out["price"] != 0:
-        chronological_positions.append(late_check_out)
+        total += late_check_out_price
 
     # увеличение стоимости за дополнительных людей
-    extra_persons_amount = max(0, bill.reservation.total_persons_amount - house.base_persons_amount)
-    price_per_extra_person = house.price_per_extra_person
-    nights_amount = (check_out_date - check_in_date).days
+    extra_persons_amount = max(0, total_persons_amount - house.base_persons_amount)
+    nights_amount = pricing.nights_amount
 
     if extra_persons_amount > 0:
+        extra_persons_price = pricing.extra_persons_price(total_persons_amount)
         non_chronological_positions.append(
             {
                 "type": EXTRA_PERSONS_POSITION,
                 "extra_persons_amount": extra_persons_amount,
-                "price_per_extra_person": price_per_extra_person,
+                "price_per_extra_person": house.price_per_extra_person,
                 "nights_amount": nights_amount,
-                "price": calculate_extra_persons_price(house, bill.reservation.total_persons_amount) * nights_amount,
+                "price": extra_persons_price,
                 "description": f"{extra_persons_amount} доп. гостей х {nights_amount} ночей",
             }
         )
+        total += extra_persons_price
 
-    if bill.promo_code:
-        price_without_discount = sum(
-            [ch_p["price"] for ch_p in chronological_positions] +
-            [g_p["price"] for g_p in non_chronological_positions]
-        )
-
-        check_availability(bill.promo_code, bill, bill.reservation.client, price_without_discount)
-        price_with_discount = apply(bill.promo_code, price_without_discount)
-        discount = price_with_discount - price_without_discount
+    if promo_code:
+        check_availability(promo_code, bill, client, total)
+        price_with_discount = apply(promo_code, total)
 
         non_chronological_positions.append(
             {
                 "type": PROMO_CODE_POSITION,
-                "promo_code": bill.promo_code.code,
-                "price": discount,
-                "description": str(bill.promo_code),
+                "promo_code": promo_code.code,
+                "price": price_with_discount - total,
+                "description": str(promo_code),
             }
         )
+        total = price_with_discount
 
-    bill.chronological_positions = chronological_positions
-    bill.non_chronological_positions = non_chronological_positions
+    return BillCalculation(
+        chronological_positions=chronological_positions,
+        non_chronological_positions=non_chronological_positions,
+        total=total,
+    )
 
-    bill.total = sum(
-        [ch_p["price"] for ch_p in chronological_positions] + [g_p["price"] for g_p in non_chronological_positions])
+
+def initialize_bill(bill):
+    calculation = calculate_bill(
+        house=bill.reservation.house,
+        local_check_in_datetime=bill.reservation.local_check_in_datetime,
+        local_check_out_datetime=bill.reservation.local_check_out_datetime,
+        total_persons_amount=bill.reservation.total_persons_amount,
+        promo_code=bill.promo_code,
+        client=bill.reservation.client,
+        bill=bill,
+    )
+
+    bill.chronological_positions = calculation.chronological_positions
+    bill.non_chronological_positions = calculation.non_chronological_positions
+
+    bill.total = calculation.total
@@ -1,8 +1,9 @@
 import logging
+from array import array
 from datetime import time as Time, date as Date, datetime as Datetime, timedelta
 
-from core.functions import is_holiday
-from events.models import Event
+from core.functions import is_holiday, holiday_mask
+from events.services import event_multipliers
 from house_reservations.validators import clean_total_persons_amount, check_datetime_fields
 from houses.models import House
 
@@ -22,38 +23,102 @@ def light_calculate_reservation_price(
         Datetime.combine(check_out_date, Time()),
     )
 
-    total_price = 0
+    return sum(price_series(house, check_in_date, check_out_date, total_persons_amount))
 
-    # NOTE: ночь идет перед днем
-    # иными словами множитель выходного дня применяется к ночам пт-сб и сб-вс, но не к вс-пн
-    date = check_in_date + timedelta(days=1)
-    while date <= check_out_date:
-        total_price += calculate_house_price_by_day(house, date) \
-                       + calculate_extra_persons_price(house, total_persons_amount)
-        date = date + timedelta(days=1)
 
-    return total_price
+def light_calculate_houses_reservation_prices(
+        houses: list[House],
+        check_in_date: Date,
+        check_out_date: Date,
+        total_persons_amount: int,
+) -> dict[int, int]:
+    """
+    light_calculate_reservation_price сразу для всех домиков houses: house.id -> суммарная цена проживания.
 
+    Даты проверяются один раз, праздники и множители событий считаются один раз на весь промежуток.
+    Если total_persons_amount меньше базового количества человек в домике - считается по базовому.
+    """
+    check_datetime_fields(
+        Datetime.combine(check_in_date, Time()),
+        Datetime.combine(check_out_date, Time()),
+    )
+    for house in houses:
+        clean_total_persons_amount(max(total_persons_amount, house.base_persons_amount), house)
 
-def calculate_house_price_by_day(
+    series = houses_price_series(houses, check_in_date, check_out_date, total_persons_amount)
+
+    return {house_id: sum(house_series) for house_id, house_series in series.items()}
+
+
+def _calculate_price(
         house: House,
-        day: Date,
+        is_holiday_day: bool,
+        multipliers: tuple[float, ...],
 ) -> int:
     price = house.base_price
-    # TODO events нужно доставать из кэша, потому что их мало
-    events = Event.objects.filter(start_date__lte=day, end_date__gte=day)
 
-    if is_holiday(day):
+    if is_holiday_day:
         price *= house.holidays_multiplier
 
-    for event in events:
-        price *= event.multiplier
+    for multiplier in multipliers:
+        price *= multiplier
 
     price = int(round(price, -2))
 
     return price
 
 
+def calculate_house_price_by_day(
+        house: House,
+        day: Date,
+) -> int:
+    # события берутся из индекса в памяти процесса, а не запросом к бд на каждый день
+    return _calculate_price(house, is_holiday(day), event_multipliers.multipliers(day))
+
+
+def houses_price_series(
+        houses: list[House],
+        check_in_date: Date,
+        check_out_date: Date,
+        total_persons_amount: int = 0,
+) -> dict[int, array]:
+    """
+    Цены ночей с check_in_date по check_out_date для каждого из домиков houses.
+
+    Возвращает словарь house.id -> array, в котором i-й элемент - цена ночи с check_in_date + i на
+    check_in_date + i + 1 (вместе с доплатой за дополнительных гостей).
+    Как и в calculate_house_price_by_day цена ночи определяется по дню, которым она заканчивается.
+    Праздники и множители событий считаются один раз на весь промежуток, а для каждого домика цена
+    пересчитывается только для различающихся сочетаний (праздник, множители событий).
+    """
+    # NOTE: ночь идет перед днем
+    # иными словами множитель выходного дня применяется к ночам пт-сб и сб-вс, но не к вс-пн
+    days = [check_in_date + timedelta(days=i) for i in range(1, (check_out_date - check_in_date).days + 1)]
+    holidays = holiday_mask(check_in_date + timedelta(days=1), check_out_date + timedelta(days=1))
+    day_keys = list(zip(holidays, (event_multipliers.multipliers(day) for day in days)))
+    distinct_day_keys = set(day_keys)
+
+    series = {}
+    for house in houses:
+        extra_persons_price = calculate_extra_persons_price(house, total_persons_amount)
+        prices = {
+            day_key: _calculate_price(house, *day_key) + extra_persons_price
+            for day_key in distinct_day_keys
+        }
+        series[house.id] = array("q", [prices[day_key] for day_key in day_keys])
+
+    return series
+
+
+def price_series(
+        house: House,
+        check_in_date: Date,
+        check_out_date: Date,
+        total_persons_amount: int = 0,
+) -> array:
+    return houses_price_series([house], check_in_date, check_out_date, total_persons_amount)[house.id]
+
+
 def calculate_extra_persons_price(
         house: House,
         total_persons_amount: int,
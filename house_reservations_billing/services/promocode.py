@@ -43,9 +43,10 @@ def check_availability(
             raise PromoCodeValidationError(f"Промокод принадлежит другому пользователю (идентификация по email)")
 
     # Check usages count
-    if bill.id and promo_code.bills.filter(id=bill.id):  # если чек уже сохранен в бд с этим промокодом
+    # если чек уже сохранен в бд с этим промокодом
+    if bill is not None and bill.id and promo_code.bills.filter(id=bill.id):
         pass
-    elif promo_code.bills.count() >= promo_code.max_use_times:
+    elif promo_code.bills.count() + promo_code.archived_bills.count() >= promo_code.max_use_times:
         raise PromoCodeValidationError('Промокод уже был использован максимальное количество раз')
 
     # Check bill value
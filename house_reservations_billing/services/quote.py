@@ -0,0 +1,69 @@
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime as Datetime
+
+from django.utils import timezone
+
+from house_reservations_billing.json_mappers import DATETIME_FORMAT
+from house_reservations_billing.models.promocode import HouseReservationPromoCode
+from house_reservations_billing.services.bill import calculate_bill
+from houses.models import House
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Quote:
+    """
+    Предварительный расчет стоимости бронирования: позиции счета и итог без создания моделей бронирования и счета
+    """
+    house: int
+    check_in_datetime: Datetime
+    check_out_datetime: Datetime
+    total_persons_amount: int
+    promo_code: str | None
+    total: int
+    chronological_positions: list[dict]
+    non_chronological_positions: list[dict]
+
+    def as_dict(self) -> dict:
+        quote = asdict(self)
+        # в том же формате, что и check_in_datetime/check_out_datetime в параметрах бронирования
+        quote["check_in_datetime"] = self.check_in_datetime.strftime(DATETIME_FORMAT)
+        quote["check_out_datetime"] = self.check_out_datetime.strftime(DATETIME_FORMAT)
+        return quote
+
+
+def calculate_quote(
+        house: House,
+        check_in_datetime: Datetime,
+        check_out_datetime: Datetime,
+        total_persons_amount: int,
+        promo_code: HouseReservationPromoCode | None = None,
+) -> Quote:
+    """
+    Параметры должны быть уже проверены (HouseReservationParametersSerializer) - здесь только расчет.
+    """
+    # в локальном времени, как и в ответах DateTimeField
+    local_check_in_datetime = timezone.localtime(check_in_datetime)
+    local_check_out_datetime = timezone.localtime(check_out_datetime)
+
+    calculation = calculate_bill(
+        house=house,
+        local_check_in_datetime=local_check_in_datetime,
+        local_check_out_datetime=local_check_out_datetime,
+        total_persons_amount=total_persons_amount,
+        promo_code=promo_code,
+    )
+
+    return Quote(
+        house=house.id,
+        check_in_datetime=local_check_in_datetime,
+        check_out_datetime=local_check_out_datetime,
+        total_persons_amount=total_persons_amount,
+        promo_code=promo_code.code if promo_code else None,
+        total=calculation.total,
+        chronological_positions=calculation.chronological_positions,
+        non_chronological_positions=calculation.non_chronological_positions,
+    )
+
@@ -0,0 +1,52 @@
+import logging
+from datetime import date as Date, timedelta
+from typing import Iterator
+
+from house_reservations_billing.services.price_calculators import price_series, calculate_extra_persons_price
+from houses.models import House
+
+logger = logging.getLogger(__name__)
+
+
+class StayPricingContext:
+    """
+    Цены всех дней проживания в домике house с check_in_date по check_out_date.
+
+    Цена дня - цена ночи, которая в этот день заканчивается (как в calculate_house_price_by_day).
+    При создании один раз считается ряд цен дней с check_in_date по check_out_date включительно: этого достаточно
+    и для ночей проживания, и для доплат за ранний въезд и поздний выезд. Дальше все цены берутся из памяти.
+    """
+
+    def __init__(self, house: House, check_in_date: Date, check_out_date: Date):
+        self.house = house
+        self.check_in_date = check_in_date
+        self.check_out_date = check_out_date
+        # i-й элемент - цена дня check_in_date + i
+        self.day_prices = price_series(house, check_in_date - timedelta(days=1), check_out_date)
+
+    @property
+    def nights_amount(self) -> int:
+        return (self.check_out_date - self.check_in_date).days
+
+    def day_price(self, day: Date) -> int:
+        index = (day - self.check_in_date).days
+        if not 0 <= index < len(self.day_prices):
+            raise ValueError(f"Day {day} is out of stay {self.check_in_date} - {self.check_out_date}")
+
+        return self.day_prices[index]
+
+    def nights(self) -> Iterator[tuple[Date, Date, int]]:
+        """
+        Ночи проживания: (день начала, день окончания, цена)
+        """
+        night_start = self.check_in_date
+        for price in self.day_prices[1:]:
+            night_end = night_start + timedelta(days=1)
+            yield night_start, night_end, price
+            night_start = night_end
+
+    def extra_persons_price(self, total_persons_amount: int) -> int:
+        """
+        Доплата за дополнительных гостей за все ночи проживания
+        """
+        return calculate_extra_persons_price(self.house, total_persons_amount) * self.nights_amount
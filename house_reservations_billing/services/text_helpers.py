@@ -5,15 +5,24 @@ EARLY_CHECK_IN_POSITION_DESCRIPTION_TEMPLATE = "Ранний въезд {date} 
 LATE_CHECK_OUT_POSITION_DESCRIPTION_TEMPLATE = "Поздний выезд {date} в {time}"
 
 
+# то же, что strftime("%d-%m") и strftime("%H:%M"), но без разбора формата - описание строится для каждой ночи
+def _day_and_month(date: Date) -> str:
+    return f"{date.day:02d}-{date.month:02d}"
+
+
+def _hours_and_minutes(time: Time) -> str:
+    return f"{time.hour:02d}:{time.minute:02d}"
+
+
 def night_description(start: Date, end: Date):
-    return NIGHT_POSITION_DESCRIPTION_TEMPLATE.format(start=start.strftime("%d-%m"), end=end.strftime("%d-%m"))
+    return NIGHT_POSITION_DESCRIPTION_TEMPLATE.format(start=_day_and_month(start), end=_day_and_month(end))
 
 
 def early_check_in_description(date: Date, time: Time):
-    return EARLY_CHECK_IN_POSITION_DESCRIPTION_TEMPLATE.format(date=date.strftime("%d-%m"),
-                                                               time=time.strftime("%H:%M"))
+    return EARLY_CHECK_IN_POSITION_DESCRIPTION_TEMPLATE.format(date=_day_and_month(date),
+                                                               time=_hours_and_minutes(time))
 
 
 def late_check_out_description(date: Date, time: Time):
-    return LATE_CHECK_OUT_POSITION_DESCRIPTION_TEMPLATE.format(date=date.strftime("%d-%m"),
-                                                               time=time.strftime("%H:%M"))
+    return LATE_CHECK_OUT_POSITION_DESCRIPTION_TEMPLATE.format(date=_day_and_month(date),
+                                                               time=_hours_and_minutes(time))
@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_billing.models.promocode import HouseReservationPromoCode, PROMO_CODES_GENERATION_NAME
+
+
+def _bump_promo_codes_generation():
+    bump_generation(PROMO_CODES_GENERATION_NAME)
+
+
+@receiver([post_save, post_delete], sender=HouseReservationPromoCode)
+def invalidate_promo_codes(sender, **kwargs):
+    transaction.on_commit(_bump_promo_codes_generation)
+
+
+@receiver(post_init, sender=HouseReservationBill)
+def remember_initial_promo_code(sender, instance: HouseReservationBill, **kwargs):
+    # через __dict__, чтобы не обращаться к полю, отложенному через .only()/.defer()
+    instance._initial_promo_code_id = instance.__dict__.get("promo_code_id")
+
+
+@receiver([post_save, post_delete], sender=HouseReservationBill)
+def invalidate_promo_code_usages(sender, instance: HouseReservationBill, **kwargs):
+    # количество использований промокода - это количество счетов с ним
+    if instance.promo_code_id is not None or instance._initial_promo_code_id is not None:
+        transaction.on_commit(_bump_promo_codes_generation)
+    instance._initial_promo_code_id = instance.promo_code_id
@@ -0,0 +1,131 @@
+from datetime import datetime as Datetime, timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from events.models import Event
+from house_reservations.models import HouseReservation
+from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_billing.models.constants import (
+    NIGHT_POSITION,
+    EARLY_CHECK_IN_POSITION,
+    LATE_CHECK_OUT_POSITION,
+    EXTRA_PERSONS_POSITION,
+)
+from house_reservations_billing.services.bill import initialize_bill
+from house_reservations_billing.services.price_calculators import (
+    calculate_house_price_by_day,
+    calculate_extra_persons_price,
+)
+from house_reservations_billing.services.stay_pricing import StayPricingContext
+from houses.models import House
+
+
+class InitializeBillTest(TestCase):
+    NIGHTS_AMOUNT = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.house = House.objects.create(
+            name="Домик",
+            description="Описание",
+            base_price=7000,
+            holidays_multiplier=1.2,
+            base_persons_amount=2,
+            max_persons_amount=5,
+            price_per_extra_person=1000,
+        )
+        cls.client_instance = Client.objects.create(email="client@mail.ru")
+        cls.check_in_date = now().date() + timedelta(days=10)
+        Event.objects.create(
+            name="Событие",
+            multiplier=1.5,
+            start_date=cls.check_in_date + timedelta(days=5),
+            end_date=cls.check_in_date + timedelta(days=8),
+        )
+
+    def make_bill(self, check_in_date=None, nights_amount=NIGHTS_AMOUNT, check_in_time="earliest",
+                  check_out_time="latest", total_persons_amount=4) -> HouseReservationBill:
+        tz = get_default_timezone()
+        check_in_date = check_in_date or self.check_in_date
+        reservation = HouseReservation(
+            house=self.house,
+            client=self.client_instance,
+            check_in_datetime=Datetime.combine(check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES[check_in_time],
+                                               tzinfo=tz),
+            check_out_datetime=Datetime.combine(check_in_date + timedelta(days=nights_amount),
+                                                Pricing.ALLOWED_CHECK_OUT_TIMES[check_out_time], tzinfo=tz),
+            total_persons_amount=total_persons_amount,
+        )
+        return HouseReservationBill(reservation=reservation)
+
+    def test_positions(self):
+        bill = self.make_bill()
+        initialize_bill(bill)
+
+        check_out_date = self.check_in_date + timedelta(days=self.NIGHTS_AMOUNT)
+        positions_types = [position["type"] for position in bill.chronological_positions]
+        self.assertEqual(positions_types,
+                         [EARLY_CHECK_IN_POSITION, *[NIGHT_POSITION] * self.NIGHTS_AMOUNT, LATE_CHECK_OUT_POSITION])
+        self.assertEqual(bill.chronological_positions[0]["price"],
+                         0.3 * calculate_house_price_by_day(self.house, self.check_in_date))
+        self.assertEqual(bill.chronological_positions[-1]["price"],
+                         0.3 * calculate_house_price_by_day(self.house, check_out_date))
+        for i, position in enumerate(bill.chronological_positions[1:-1]):
+            self.assertEqual(position["start_date"], self.check_in_date + timedelta(days=i))
+            self.assertEqual(position["price"],
+                             calculate_house_price_by_day(self.house, self.check_in_date + timedelta(days=i + 1)))
+
+        extra_persons_position, = bill.non_chronological_positions
+        self.assertEqual(extra_persons_position["type"], EXTRA_PERSONS_POSITION)
+        self.assertEqual(extra_persons_position["price"], 2 * 1000 * self.NIGHTS_AMOUNT)
+
+        self.assertEqual(bill.total, sum(position["price"] for position in
+                                         bill.chronological_positions + bill.non_chronological_positions))
+
+    def test_no_queries_after_context_loads(self):
+        # индекс событий и календарь праздников загружаются при первом расчете
+        StayPricingContext(self.house, self.check_in_date, self.check_in_date + timedelta(days=1))
+
+        bill = self.make_bill()
+        with self.assertNumQueries(0):
+            initialize_bill(bill)
+
+    def test_same_prices_as_day_by_day_calculation(self):
+        # цены из StayPricingContext совпадают с расчетом каждого дня по отдельности, как считались счета раньше
+        for first_day, nights_amount, check_in_time, check_out_time, total_persons_amount in [
+            (0, 1, "default", "default", 2),
+            (3, 4, "earliest", "default", 5),
+            (4, 2, "default", "latest", 3),
+            (7, 1, "earliest", "latest", 1),
+            (0, self.NIGHTS_AMOUNT, "earliest", "latest", 4),
+        ]:
+            check_in_date = self.check_in_date + timedelta(days=first_day)
+            check_out_date = check_in_date + timedelta(days=nights_amount)
+            bill = self.make_bill(check_in_date, nights_amount, check_in_time, check_out_time, total_persons_amount)
+            initialize_bill(bill)
+
+            expected_prices = [
+                calculate_house_price_by_day(self.house, check_in_date + timedelta(days=i + 1))
+                for i in range(nights_amount)
+            ]
+            early_check_in_coefficient = Pricing.ALLOWED_CHECK_IN_TIMES[Pricing.ALLOWED_CHECK_IN_TIMES[check_in_time]]
+            if early_check_in_coefficient:
+                expected_prices.insert(
+                    0, early_check_in_coefficient * calculate_house_price_by_day(self.house, check_in_date))
+            late_check_out_coefficient = Pricing.ALLOWED_CHECK_OUT_TIMES[
+                Pricing.ALLOWED_CHECK_OUT_TIMES[check_out_time]]
+            if late_check_out_coefficient:
+                expected_prices.append(
+                    late_check_out_coefficient * calculate_house_price_by_day(self.house, check_out_date))
+            if total_persons_amount > self.house.base_persons_amount:
+                expected_prices.append(
+                    calculate_extra_persons_price(self.house, total_persons_amount) * nights_amount)
+
+            with self.subTest(first_day=first_day, nights_amount=nights_amount):
+                self.assertEqual([position["price"] for position in
+                                  bill.chronological_positions + bill.non_chronological_positions],
+                                 expected_prices)
+                self.assertEqual(bill.total, sum(expected_prices))
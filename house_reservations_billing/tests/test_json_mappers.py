@@ -0,0 +1,87 @@
+import json
+from datetime import date as Date, time as Time, timedelta
+
+from django.db import connection
+from django.test import TestCase
+
+from house_reservations_billing.json_mappers import (
+    ChronologicalPositionsEncoder,
+    ChronologicalPositionsDecoder,
+)
+from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_billing.models.constants import (
+    NIGHT_POSITION,
+    EARLY_CHECK_IN_POSITION,
+    LATE_CHECK_OUT_POSITION,
+)
+
+
+def make_positions(check_in_date: Date, nights_amount: int) -> list[dict]:
+    positions = [{
+        "type": EARLY_CHECK_IN_POSITION,
+        "time": Time(12, 0),
+        "date": check_in_date,
+        "price": 2500,
+        "description": "Ранний въезд",
+    }]
+    for i in range(nights_amount):
+        positions.append({
+            "type": NIGHT_POSITION,
+            "start_date": check_in_date + timedelta(days=i),
+            "end_date": check_in_date + timedelta(days=i + 1),
+            "price": 10000 + 100 * i,
+            "description": "Ночь",
+        })
+    positions.append({
+        "type": LATE_CHECK_OUT_POSITION,
+        "time": Time(14, 30),
+        "date": check_in_date + timedelta(days=nights_amount),
+        "price": 2500,
+        "description": "Поздний выезд",
+    })
+    return positions
+
+
+class ChronologicalPositionsCodecTest(TestCase):
+    def test_round_trip(self):
+        positions = make_positions(Date(2024, 12, 30), 5)
+
+        encoded = json.dumps(positions, cls=ChronologicalPositionsEncoder)
+
+        self.assertEqual(json.loads(encoded, cls=ChronologicalPositionsDecoder), positions)
+        self.assertNotIn("\n", encoded)
+
+    def test_values_not_in_format_and_unknown_positions(self):
+        stored = json.dumps([
+            {"type": NIGHT_POSITION, "start_date": "2024-02-28", "end_date": None, "price": 1},
+            {"type": "unknown", "date": "01-03-2024", "time": "12:00", "price": 1},
+            {"nested": {"date": "29-02-2024"}},
+        ], cls=ChronologicalPositionsEncoder)
+
+        self.assertEqual(json.loads(stored, cls=ChronologicalPositionsDecoder), [
+            {"type": NIGHT_POSITION, "start_date": "2024-02-28", "end_date": None, "price": 1},
+            {"type": "unknown", "date": Date(2024, 3, 1), "time": Time(12, 0), "price": 1},
+            {"nested": {"date": Date(2024, 2, 29)}},
+        ])
+
+    def test_pretty_encoding(self):
+        encoded = ChronologicalPositionsEncoder(indent=2, sort_keys=True).encode(make_positions(Date(2024, 1, 1), 1))
+
+        self.assertIn('\n  {\n    "date": "01-01-2024"', encoded)
+
+    def test_loading_stored_bills(self):
+        check_in_date = Date(2024, 2, 27)
+        positions = [make_positions(check_in_date + timedelta(days=i), 1 + i) for i in range(3)]
+        bills = HouseReservationBill.objects.bulk_create([
+            HouseReservationBill(total=10000, chronological_positions=bill_positions)
+            for bill_positions in positions
+        ])
+
+        # jsonb хранит json по-своему (порядок ключей, пробелы) - разбираем то, что вернула бд
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT chronological_positions::text FROM {HouseReservationBill._meta.db_table} "
+                           f"WHERE id = ANY(%s) ORDER BY id", [[bill.id for bill in bills]])
+            stored_positions = [row[0] for row in cursor.fetchall()]
+
+        self.assertEqual([json.loads(value, cls=ChronologicalPositionsDecoder) for value in stored_positions],
+                         positions)
@@ -0,0 +1,78 @@
+from datetime import date as Date, timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from events.models import Event
+from house_reservations_billing.services.price_calculators import (
+    calculate_house_price_by_day,
+    calculate_extra_persons_price,
+    houses_price_series,
+    price_series,
+)
+from houses.models import House
+
+
+class PriceSeriesTest(TestCase):
+    houses: list[House]
+    start: Date
+    end: Date
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # для расчета цен домики не нужно сохранять в бд
+        cls.houses = [
+            House(
+                id=i,
+                name=f"Домик{i}",
+                base_price=5000 + 350 * i,
+                holidays_multiplier=1 + 0.07 * i,
+                base_persons_amount=2,
+                max_persons_amount=5,
+                price_per_extra_person=1000 + 100 * i,
+            )
+            for i in range(1, 51)
+        ]
+        cls.start = now().date()
+        cls.end = cls.start + timedelta(days=365)
+
+    def setUp(self):
+        Event.objects.create(
+            name="Событие",
+            multiplier=1.35,
+            start_date=self.start + timedelta(days=20),
+            end_date=self.start + timedelta(days=40),
+        )
+        Event.objects.create(
+            name="Пересекающееся событие",
+            multiplier=1.15,
+            start_date=self.start + timedelta(days=35),
+            end_date=self.start + timedelta(days=50),
+        )
+
+    def _day_by_day_series(self, house: House, total_persons_amount: int) -> list[int]:
+        return [
+            calculate_house_price_by_day(house, self.start + timedelta(days=i))
+            + calculate_extra_persons_price(house, total_persons_amount)
+            for i in range(1, (self.end - self.start).days + 1)
+        ]
+
+    def test_series_match_day_by_day_prices(self):
+        for house in self.houses[:10]:
+            for total_persons_amount in [0, 2, 4]:
+                with self.subTest(house=house.id, total_persons_amount=total_persons_amount):
+                    self.assertEqual(
+                        list(price_series(house, self.start, self.end, total_persons_amount)),
+                        self._day_by_day_series(house, total_persons_amount),
+                    )
+
+    def test_empty_period(self):
+        self.assertEqual(list(price_series(self.houses[0], self.start, self.start)), [])
+
+    def test_houses_series_match_day_by_day_prices(self):
+        series = houses_price_series(self.houses, self.start, self.end, 3)
+
+        for house in self.houses:
+            with self.subTest(house=house.id):
+                self.assertEqual(list(series[house.id]), self._day_by_day_series(house, 3))
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HouseReservationManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'house_reservations_management'
+
+    def ready(self):
+        import house_reservations_management.signals  # pylint: disable=unused-import
@@ -0,0 +1,86 @@
+import json
+import timeit
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+from house_reservations_management.serializers.houses import HouseListWithTotalPriceSerializer
+from house_reservations_management.services.calendars import calculate_check_out_calendar
+from houses.models import House, HouseFeature, HousePicture
+
+
+class Command(BaseCommand):
+    """
+    Сравнение времени рендеринга самых тяжелых ответов (календарь на 31 день и список домиков)
+    стандартным JSONRenderer и ORJSONRenderer.
+    Домики для замера создаются в транзакции, которая откатывается после замера.
+    """
+    help = "Benchmark of ORJSONRenderer against JSONRenderer on the calendar and houses listing responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--houses", type=int, default=50, help="Количество домиков в списке и календаре")
+        parser.add_argument("--repeats", type=int, default=50, help="Количество рендерингов каждого ответа")
+
+    def handle(self, *args, **options):
+        if options["houses"] < 1 or options["repeats"] < 1:
+            raise CommandError("--houses and --repeats must be positive")
+
+        with transaction.atomic():
+            houses = self._create_houses(options["houses"])
+            responses = self._responses(houses)
+            transaction.set_rollback(True)
+
+        for name, data in responses:
+            orjson_rendered = ORJSONRenderer().render(data)
+            if json.loads(orjson_rendered) != json.loads(JSONRenderer().render(data)):
+                raise CommandError(f"{name}: ORJSONRenderer output differs from JSONRenderer")
+
+            json_time = timeit.timeit(lambda: JSONRenderer().render(data), number=options["repeats"])
+            orjson_time = timeit.timeit(lambda: ORJSONRenderer().render(data), number=options["repeats"])
+            self.stdout.write(f"{name}: JSONRenderer {json_time / options['repeats'] * 1000:.3f} ms, "
+                              f"ORJSONRenderer {orjson_time / options['repeats'] * 1000:.3f} ms "
+                              f"(x{json_time / orjson_time:.1f})")
+
+    @staticmethod
+    def _create_houses(houses_amount: int) -> list[House]:
+        houses = House.objects.bulk_create([
+            House(name=f"Домик {i}", description="Описание домика " * 20, max_persons_amount=4)
+            for i in range(houses_amount)
+        ])
+        features = HouseFeature.objects.bulk_create([
+            HouseFeature(name=f"Особенность {i}", picture=f"features/{i}.png") for i in range(5)
+        ])
+        HousePicture.objects.bulk_create([
+            HousePicture(house=house, picture=f"houses/{house.id}_{i}.jpg")
+            for house in houses
+            for i in range(5)
+        ])
+        for house in houses:
+            house.features.set(features)
+        return houses
+
+    @staticmethod
+    def _responses(houses: list[House]) -> list[tuple[str, object]]:
+        houses_ids = [house.id for house in houses]
+
+        check_in_date = (now().date().replace(day=1) + timedelta(days=62)).replace(day=1)
+        calendar = calculate_check_out_calendar(House.objects.filter(id__in=houses_ids), 2, check_in_date,
+                                                check_in_date.year, check_in_date.month)
+
+        listed_houses = list(House.objects.filter(id__in=houses_ids).prefetch_related("pictures", "features"))
+        listing_check_in_date = now().date() + timedelta(days=10)
+        context = HouseListWithTotalPriceSerializer.get_listing_context(listed_houses, {
+            "check_in_date": listing_check_in_date.strftime("%d-%m-%Y"),
+            "check_out_date": (listing_check_in_date + timedelta(days=3)).strftime("%d-%m-%Y"),
+            "total_persons_amount": "2",
+        })
+        listing = HouseListWithTotalPriceSerializer(listed_houses, many=True, context=context).data
+
+        return [
+            ("31-day calendar", {"calendar": calendar}),
+            (f"{len(houses)}-house listing", listing),
+        ]
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import get_counters
+from house_reservations_management.services.calendars_cache import (
+    CALENDAR_CACHE_HITS_COUNTER,
+    CALENDAR_CACHE_MISSES_COUNTER,
+)
+
+
+class Command(BaseCommand):
+    """ Выводит счетчики попаданий и промахов кэша календарей"""
+
+    def handle(self, *args, **kwargs):
+        counters = get_counters([CALENDAR_CACHE_HITS_COUNTER, CALENDAR_CACHE_MISSES_COUNTER])
+        hits, misses = counters[CALENDAR_CACHE_HITS_COUNTER], counters[CALENDAR_CACHE_MISSES_COUNTER]
+        hit_rate = hits / (hits + misses) if hits + misses else 0
+
+        self.stdout.write(f'hits: {hits}, misses: {misses}, hit rate: {hit_rate:.1%}')
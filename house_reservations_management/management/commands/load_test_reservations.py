@@ -0,0 +1,240 @@
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import time as Time, timedelta
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DatabaseError
+from django.test import Client as TestClient, override_settings
+from django.utils.timezone import now
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation
+from house_reservations_management.services.reservations_overlapping import (
+    count_double_bookings,
+    HOUSE_IS_BUSY_MESSAGE,
+)
+from houses.models import House
+
+NEW_RESERVATION = "new_reservation"
+RESERVATION_PRICE = "reservation_price"
+
+OK = "ok"
+BUSY = "busy"
+INVALID = "invalid"
+DEADLOCK = "deadlock"
+SERIALIZATION_FAILURE = "serialization_failure"
+ERROR = "error"
+OUTCOMES = (OK, BUSY, INVALID, DEADLOCK, SERIALIZATION_FAILURE, ERROR)
+
+# коды ошибок PostgreSQL (SQLSTATE)
+DB_ERROR_OUTCOMES = {
+    "40P01": DEADLOCK,
+    "40001": SERIALIZATION_FAILURE,
+}
+
+LOAD_TEST_EMAIL_TEMPLATE = "load-test-{index}@example.com"
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    # nearest-rank
+    index = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _db_error_outcome(error: Exception) -> str:
+    cause = error
+    while cause is not None:
+        pgcode = getattr(cause, "pgcode", None)
+        if pgcode in DB_ERROR_OUTCOMES:
+            return DB_ERROR_OUTCOMES[pgcode]
+        cause = cause.__cause__
+    return ERROR
+
+
+def _response_outcome(status_code: int, body: str) -> str:
+    if status_code == 200:
+        return OK
+    if status_code == 400 and HOUSE_IS_BUSY_MESSAGE in body:
+        return BUSY
+    if 400 <= status_code < 500:
+        return INVALID
+    return ERROR
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест записи бронирований: несколько потоков одновременно бронируют один домик
+    и запрашивают цену на пересекающиеся промежутки. Выводит пропускную способность, задержки (p50/p95/p99),
+    исходы запросов (в том числе deadlock и serialization failure) и количество двойных бронирований -
+    оно должно быть 0.
+
+    По умолчанию запросы идут через django.test.Client в этом процессе, уведомления о бронированиях отключаются
+    настройкой RESERVATION_NOTIFICATIONS_ENABLED. С --base-url - по http к запущенному серверу. Сервер должен работать
+    с той же бд, что и команда: домик для теста и проверка двойных бронирований - через бд команды.
+    Уведомления на таком сервере отключает переменная окружения DISABLE_RESERVATION_NOTIFICATIONS=true.
+    """
+    help = "Load test of concurrent house reservations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="Количество одновременных потоков")
+        parser.add_argument("--requests", type=int, default=50, help="Количество запросов от каждого потока")
+        parser.add_argument("--price-share", type=float, default=0.5,
+                            help="Доля запросов цены среди всех запросов (остальные - бронирования)")
+        parser.add_argument("--house-id", type=int, default=None,
+                            help="Домик для теста. По умолчанию создается временный домик, который удаляется "
+                                 "после теста вместе с бронированиями")
+        parser.add_argument("--days-ahead", type=int, default=30, help="Через сколько дней начинается окно заездов")
+        parser.add_argument("--window-days", type=int, default=7,
+                            help="Ширина окна заездов в днях - чем меньше, тем больше пересечений")
+        parser.add_argument("--max-nights", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0, help="Зерно случайных параметров запросов")
+        parser.add_argument("--base-url", default=None,
+                            help="Адрес запущенного сервера, например http://localhost:8000. "
+                                 "По http deadlock и serialization failure не отличить от других ошибок 5xx")
+        parser.add_argument("--keep", action="store_true", help="Не удалять временный домик и бронирования")
+
+    def handle(self, *args, **options):
+        if options["threads"] < 1 or options["requests"] < 1:
+            raise CommandError("--threads and --requests must be positive")
+
+        temporary_house = options["house_id"] is None
+        if temporary_house:
+            house = House.objects.create(
+                name=f"Нагрузочный тест {now().strftime('%d-%m-%Y %H:%M:%S.%f')}",
+                description="Домик для нагрузочного теста бронирований",
+                base_price=5000,
+                base_persons_amount=2,
+                max_persons_amount=4,
+                price_per_extra_person=1000,
+            )
+        else:
+            house = House.objects.get(id=options["house_id"])
+
+        plans = [
+            self._plan(house, thread_index, options)
+            for thread_index in range(options["threads"])
+        ]
+
+        self.stdout.write(f"Running {options['threads']} threads x {options['requests']} requests "
+                          f"against house {house.id} ...")
+        try:
+            results, wall_time = self._run(plans, options["base_url"])
+            self._report(results, wall_time)
+
+            double_bookings = count_double_bookings([house.id])
+        finally:
+            if temporary_house and not options["keep"]:
+                HouseReservation.objects.filter(house=house).delete()
+                house.delete()
+                Client.objects.filter(
+                    email__in=[LOAD_TEST_EMAIL_TEMPLATE.format(index=i) for i in range(options["threads"])],
+                    reservations__isnull=True,
+                ).delete()
+
+        if double_bookings:
+            raise CommandError(f"double bookings: {double_bookings}")
+        self.stdout.write(self.style.SUCCESS("double bookings: 0"))
+
+    def _plan(self, house: House, thread_index: int, options: dict) -> list[tuple[str, str, dict]]:
+        """
+        Запросы потока thread_index - (вид запроса, путь, данные).
+        Зависят только от --seed, так что прогоны воспроизводимы.
+        """
+        reservations_url = f"/{settings.URL_PREFIX}/api/v1/houses/{house.id}/reservations/"
+        rng = random.Random(f"{options['seed']}:{thread_index}")
+        check_in_times = [t for t in Pricing.ALLOWED_CHECK_IN_TIMES if isinstance(t, Time)]
+        check_out_times = [t for t in Pricing.ALLOWED_CHECK_OUT_TIMES if isinstance(t, Time)]
+        window_start = now().date() + timedelta(days=options["days_ahead"])
+
+        plan = []
+        for _ in range(options["requests"]):
+            check_in_date = window_start + timedelta(days=rng.randrange(options["window_days"]))
+            check_out_date = check_in_date + timedelta(days=rng.randint(1, options["max_nights"]))
+            data = {
+                "check_in_datetime": f"{check_in_date:%d-%m-%Y} {rng.choice(check_in_times):%H:%M}",
+                "check_out_datetime": f"{check_out_date:%d-%m-%Y} {rng.choice(check_out_times):%H:%M}",
+                "total_persons_amount": rng.randint(1, house.max_persons_amount),
+            }
+
+            if rng.random() < options["price_share"]:
+                plan.append((RESERVATION_PRICE, reservations_url + "price/", data))
+            else:
+                plan.append((NEW_RESERVATION, reservations_url, {
+                    **data,
+                    "email": LOAD_TEST_EMAIL_TEMPLATE.format(index=thread_index),
+                    "first_name": "Нагрузочный",
+                    "last_name": "Тест",
+                    "preferred_contact": "load test",
+                }))
+
+        return plan
+
+    def _run(self, plans: list[list[tuple[str, str, dict]]], base_url: str | None) -> tuple[list[tuple], float]:
+        results = []
+        results_lock = threading.Lock()
+        # все потоки начинают одновременно
+        barrier = threading.Barrier(len(plans) + 1)
+
+        def worker(plan):
+            thread_results = []
+            session = requests.Session() if base_url else TestClient(SERVER_NAME="localhost")
+            try:
+                barrier.wait()
+                for kind, url, data in plan:
+                    method = "put" if kind == RESERVATION_PRICE else "post"
+                    started = time.perf_counter()
+                    try:
+                        if base_url:
+                            response = getattr(session, method)(base_url + url, json=data)
+                            outcome = _response_outcome(response.status_code, response.text)
+                        else:
+                            response = getattr(session, method)(url, data, content_type="application/json")
+                            outcome = _response_outcome(response.status_code, response.content.decode())
+                    except DatabaseError as e:
+                        outcome = _db_error_outcome(e)
+                    except Exception:
+                        outcome = ERROR
+                    thread_results.append((kind, outcome, time.perf_counter() - started))
+            finally:
+                # соединения с бд django открываются на каждый поток
+                connections.close_all()
+                with results_lock:
+                    results.extend(thread_results)
+
+        threads = [threading.Thread(target=worker, args=(plan,)) for plan in plans]
+        with override_settings(RESERVATION_NOTIFICATIONS_ENABLED=False):
+            for thread in threads:
+                thread.start()
+            barrier.wait()
+            started = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            wall_time = time.perf_counter() - started
+
+        return results, wall_time
+
+    def _report(self, results: list[tuple], wall_time: float):
+        durations = defaultdict(list)
+        outcomes = defaultdict(Counter)
+        for kind, outcome, duration in results:
+            durations[kind].append(duration)
+            outcomes[kind][outcome] += 1
+
+        self.stdout.write(f"total: {len(results)} requests in {wall_time:.2f} s, "
+                          f"{len(results) / wall_time:.1f} rps")
+        for kind in (NEW_RESERVATION, RESERVATION_PRICE):
+            if not durations[kind]:
+                continue
+            kind_durations = sorted(durations[kind])
+            latencies = ", ".join(
+                f"p{percent} {_percentile(kind_durations, percent) * 1000:.1f} ms" for percent in (50, 95, 99)
+            )
+            self.stdout.write(f"{kind}: {len(kind_durations)} requests, "
+                              f"{len(kind_durations) / wall_time:.1f} rps, {latencies}")
+            self.stdout.write("    " + ", ".join(f"{outcome}: {outcomes[kind][outcome]}" for outcome in OUTCOMES))
@@ -0,0 +1,34 @@
+from django.utils.timezone import now
+from rest_framework import serializers
+
+# сколько промежутков можно проверить за один запрос
+MAX_AVAILABILITY_WINDOWS = 31
+
+
+class AvailabilityWindowSerializer(serializers.Serializer):
+    check_in_date = serializers.DateField(input_formats=['%d-%m-%Y'], format='%d-%m-%Y')
+    check_out_date = serializers.DateField(input_formats=['%d-%m-%Y'], format='%d-%m-%Y')
+    total_persons_amount = serializers.IntegerField(min_value=1, default=1, required=False)
+
+    class Meta:
+        fields = (
+            'check_in_date',
+            'check_out_date',
+            'total_persons_amount',
+        )
+
+    def validate(self, attrs):
+        if not now().date() < attrs["check_in_date"] < attrs["check_out_date"]:
+            raise serializers.ValidationError("Некорректные даты бронирования. "
+                                              "Не выполнено неравенство now < check_in_date < check_out_date")
+
+        return attrs
+
+
+class BulkAvailabilityParametersSerializer(serializers.Serializer):
+    windows = AvailabilityWindowSerializer(many=True, allow_empty=False, max_length=MAX_AVAILABILITY_WINDOWS)
+
+    class Meta:
+        fields = (
+            'windows',
+        )
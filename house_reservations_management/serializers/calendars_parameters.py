@@ -1,12 +1,16 @@
 from django.utils.timezone import now
 from rest_framework import serializers
 
+from house_reservations_management.services.calendars import CALENDAR_FORMATS, CALENDAR_FORMAT_DAYS
+
 
 class CalendarsParametersSerializer(serializers.Serializer):
     month = serializers.IntegerField()
     year = serializers.IntegerField()
     chosen_check_in_date = serializers.DateField(required=False, input_formats=['%d-%m-%Y'])
     total_persons_amount = serializers.IntegerField(min_value=1, default=1, required=False)
+    # format зарезервирован DRF под выбор рендерера
+    calendar_format = serializers.ChoiceField(choices=CALENDAR_FORMATS, default=CALENDAR_FORMAT_DAYS, required=False)
 
     class Meta:
         fields = (
@@ -14,6 +18,7 @@ class CalendarsParametersSerializer(serializers.Serializer):
             'year',
             'chosen_check_in_date',
             'total_persons_amount',
+            'calendar_format',
         )
 
     def validate_chosen_check_in_date(self, date):
@@ -33,3 +38,51 @@ class CalendarsParametersSerializer(serializers.Serializer):
             raise serializers.ValidationError("month должен быть в диапазоне от 1 до 12.")
 
         return month
+
+
+# сколько месяцев можно получить одним запросом календаря на промежуток
+MAX_CALENDAR_MONTHS = 12
+
+
+class CalendarsRangeParametersSerializer(serializers.Serializer):
+    from_month = serializers.DateField(input_formats=['%m-%Y'])
+    to_month = serializers.DateField(input_formats=['%m-%Y'])
+    chosen_check_in_date = serializers.DateField(required=False, input_formats=['%d-%m-%Y'])
+    total_persons_amount = serializers.IntegerField(min_value=1, default=1, required=False)
+    # format зарезервирован DRF под выбор рендерера
+    calendar_format = serializers.ChoiceField(choices=CALENDAR_FORMATS, default=CALENDAR_FORMAT_DAYS, required=False)
+
+    class Meta:
+        fields = (
+            'from_month',
+            'to_month',
+            'chosen_check_in_date',
+            'total_persons_amount',
+            'calendar_format',
+        )
+
+    def validate_chosen_check_in_date(self, date):
+        if date <= now().date():
+            raise serializers.ValidationError("chosen_check_in_date должна быть позже сегодняшнего дня.")
+
+        return date
+
+    def validate_from_month(self, from_month):
+        if from_month.year < now().year:
+            raise serializers.ValidationError("from_month не может быть раньше текущего года.")
+
+        return from_month
+
+    def validate(self, attrs):
+        from_month, to_month = attrs.pop("from_month"), attrs.pop("to_month")
+        months_amount = (to_month.year - from_month.year) * 12 + to_month.month - from_month.month + 1
+        if not 1 <= months_amount <= MAX_CALENDAR_MONTHS:
+            raise serializers.ValidationError(f"to_month должен быть не раньше from_month и не дальше "
+                                              f"{MAX_CALENDAR_MONTHS} месяцев от него.")
+
+        attrs.update({
+            "year": from_month.year,
+            "month": from_month.month,
+            "months_amount": months_amount,
+        })
+        return attrs
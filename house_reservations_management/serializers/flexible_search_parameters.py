@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.utils.timezone import now
+from rest_framework import serializers
+
+# ограничения, чтобы один запрос не превращался в перебор всего года
+MAX_FLEXIBLE_SEARCH_DAYS = 186
+MAX_FLEXIBLE_SEARCH_NIGHTS = 30
+MAX_FLEXIBLE_SEARCH_NIGHTS_OPTIONS = 7
+MAX_FLEXIBLE_SEARCH_LIMIT = 50
+
+
+class FlexibleSearchParametersSerializer(serializers.Serializer):
+    range_start = serializers.DateField(input_formats=['%d-%m-%Y'])
+    range_end = serializers.DateField(input_formats=['%d-%m-%Y'])
+    # nights=3&nights=4 - подходящие длины проживания
+    nights = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=MAX_FLEXIBLE_SEARCH_NIGHTS),
+        allow_empty=False,
+        max_length=MAX_FLEXIBLE_SEARCH_NIGHTS_OPTIONS,
+    )
+    total_persons_amount = serializers.IntegerField(min_value=1, default=1, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_FLEXIBLE_SEARCH_LIMIT, default=10, required=False)
+
+    class Meta:
+        fields = (
+            'range_start',
+            'range_end',
+            'nights',
+            'total_persons_amount',
+            'limit',
+        )
+
+    def validate_range_start(self, date):
+        if date <= now().date():
+            raise serializers.ValidationError("range_start должна быть позже сегодняшнего дня.")
+
+        return date
+
+    def validate_nights(self, nights):
+        return sorted(set(nights))
+
+    def validate(self, attrs):
+        if attrs["range_start"] >= attrs["range_end"]:
+            raise serializers.ValidationError("range_start должна быть раньше range_end.")
+
+        if attrs["range_end"] - attrs["range_start"] > timedelta(days=MAX_FLEXIBLE_SEARCH_DAYS):
+            raise serializers.ValidationError(f"Промежуток поиска не может быть длиннее "
+                                              f"{MAX_FLEXIBLE_SEARCH_DAYS} дней.")
+
+        return attrs
@@ -8,7 +8,10 @@ from rest_framework.exceptions import ValidationError
 
 from core.models import Pricing
 from house_reservations_billing.models.promocode import HouseReservationPromoCode
-from house_reservations_management.services.reservations_overlapping import check_if_house_free_by_period
+from house_reservations_management.services.reservations_overlapping import (
+    check_if_house_free_by_period,
+    HOUSE_IS_BUSY_MESSAGE,
+)
 from houses.models import House
 
 logger = logging.getLogger(__name__)
@@ -25,6 +28,9 @@ class HouseReservationParametersSerializer(serializers.Serializer):
     ], required=True)
     promo_code = serializers.SerializerMethodField()
 
+    # проверять ли, что домик свободен в выбранное время
+    check_house_free = True
+
     class Meta:
         fields = (
             'house',
@@ -60,10 +66,8 @@ class HouseReservationParametersSerializer(serializers.Serializer):
         if check_out_datetime.time() not in Pricing.ALLOWED_CHECK_OUT_TIMES:
             raise ValidationError("Некорректное время выезда")
 
-        if check_if_house_free_by_period(house, check_in_datetime, check_out_datetime):
-            raise ValidationError("Выбранное время бронирования недоступно. "
-                                  "Попробуйте поставить другое время заезда/выезда, "
-                                  "если дни заезда и выезда в календаре отмечены, как свободные.", )
+        if self.check_house_free and not check_if_house_free_by_period(house, check_in_datetime, check_out_datetime):
+            raise ValidationError(HOUSE_IS_BUSY_MESSAGE)
 
         total_persons_amount = attrs["total_persons_amount"]
         if not (1 <= total_persons_amount <= house.max_persons_amount):
@@ -77,6 +81,16 @@ class HouseReservationParametersSerializer(serializers.Serializer):
         return attrs
 
 
+class NewHouseReservationParametersSerializer(HouseReservationParametersSerializer):
+    """
+    Параметры создания бронирования. Занятость домика не проверяется заранее: бронирование сразу вставляется в бд,
+    а пересечение с другими бронированиями отклоняет ограничение exclude_reservations_overlapping
+    (см. create_reservation)
+    """
+    check_house_free = False
+
+
 class AdditionalReservationParametersSerializer(serializers.Serializer):
-    preferred_contact = serializers.CharField(required=True)
-    comment = serializers.CharField(required=False, allow_blank=True)
+    # длины - как у полей HouseReservation: модель при создании бронирования full_clean не проходит
+    preferred_contact = serializers.CharField(max_length=255, required=True)
+    comment = serializers.CharField(max_length=511, required=False, allow_blank=True)
@@ -1,9 +1,9 @@
 import logging
-from datetime import datetime as Datetime
+from datetime import datetime as Datetime, date as Date
 
 from rest_framework import serializers
 
-from house_reservations_billing.services.price_calculators import light_calculate_reservation_price, \
+from house_reservations_billing.services.price_calculators import light_calculate_houses_reservation_prices, \
     calculate_extra_persons_price
 from houses.models import House
 from houses.serializers import HouseDetailSerializer
@@ -16,6 +16,9 @@ class HouseListWithTotalPriceSerializer(HouseDetailSerializer):
     # если в эти даты домик занят хотя бы в один из дней - total_price == None
     # в остальных случаях высчитывается суммарная цена проживания в домике в указанные даты
 
+    # цены считаются сразу для всех домиков в get_listing_context и передаются через контекст сериализатора.
+    # без них (например, при сериализации одного домика) цена считается для каждого домика отдельно
+
     total_price = serializers.SerializerMethodField(read_only=True)
     price_per_day = serializers.SerializerMethodField(read_only=True)
 
@@ -23,40 +26,61 @@ class HouseListWithTotalPriceSerializer(HouseDetailSerializer):
         model = House
         fields = HouseDetailSerializer.Meta.fields + ["total_price", "price_per_day"]
 
-    def get_total_price(self, house: House) -> int | None:
-        query_params = self.context["request"].query_params
+    @staticmethod
+    def parse_query_params(query_params) -> tuple[Date | None, Date | None, int | None]:
         try:
             check_in_date = Datetime.strptime(query_params.get("check_in_date"), "%d-%m-%Y").date()
             check_out_date = Datetime.strptime(query_params.get("check_out_date"), "%d-%m-%Y").date()
         except (ValueError, TypeError):
             # если нет какой-то из дат - мы не можем высчитать суммарную цену бронирования
-            return None
+            check_in_date, check_out_date = None, None
 
         try:
-            total_persons_amount = query_params.get("total_persons_amount", house.base_persons_amount)
-            total_persons_amount = int(total_persons_amount)
-            total_persons_amount = max(total_persons_amount, house.base_persons_amount)
+            total_persons_amount = int(query_params.get("total_persons_amount"))
         except (ValueError, TypeError):
-            # если total_persons_amount не конвертируется в int -> не можем посчитать суммарную стоимость
-            return None
+            # если total_persons_amount нет или он не конвертируется в int -> считаем по базовому количеству человек
+            total_persons_amount = None
 
-        total_price = light_calculate_reservation_price(
-            house=house,
-            check_in_date=check_in_date,
-            check_out_date=check_out_date,
-            total_persons_amount=total_persons_amount,
-        )
+        return check_in_date, check_out_date, total_persons_amount
 
-        return total_price
+    @classmethod
+    def get_listing_context(cls, houses: list[House], query_params) -> dict:
+        check_in_date, check_out_date, total_persons_amount = cls.parse_query_params(query_params)
 
-    def get_price_per_day(self, house: House) -> int | None:
-        query_params = self.context["request"].query_params
+        total_prices = {}
+        # если total_persons_amount передан, но не конвертируется в int -> не можем посчитать суммарную стоимость
+        persons_amount_is_valid = total_persons_amount is not None or query_params.get("total_persons_amount") is None
+        if check_in_date is not None and persons_amount_is_valid:
+            total_prices = light_calculate_houses_reservation_prices(
+                houses=houses,
+                check_in_date=check_in_date,
+                check_out_date=check_out_date,
+                total_persons_amount=total_persons_amount or 0,
+            )
 
-        try:
-            total_persons_amount = query_params.get("total_persons_amount", house.base_persons_amount)
-            total_persons_amount = int(total_persons_amount)
-            total_persons_amount = max(total_persons_amount, house.base_persons_amount)
-        except (ValueError, TypeError):
+        return {
+            "total_prices": total_prices,
+            "total_persons_amount": total_persons_amount,
+        }
+
+    def _query_params(self):
+        request = self.context.get("request")
+        return request.query_params if request is not None else {}
+
+    def get_total_price(self, house: House) -> int | None:
+        total_prices = self.context.get("total_prices")
+        if total_prices is None:
+            # сериализатор используется без get_listing_context - цена считается для каждого домика отдельно
+            total_prices = self.get_listing_context([house], self._query_params())["total_prices"]
+
+        return total_prices.get(house.id)
+
+    def get_price_per_day(self, house: House) -> int | None:
+        if "total_persons_amount" in self.context:
+            total_persons_amount = self.context["total_persons_amount"]
+        else:
+            _, _, total_persons_amount = self.parse_query_params(self._query_params())
+        if total_persons_amount is None:
             return house.base_price
 
         return house.base_price + calculate_extra_persons_price(house, total_persons_amount)
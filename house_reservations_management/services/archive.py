@@ -0,0 +1,97 @@
+import logging
+from datetime import timedelta
+
+from django.db import connection, models, transaction
+from django.utils.timezone import now, localtime
+
+from house_reservations.models import HouseReservation, ArchivedHouseReservation, HouseNight
+from house_reservations.partitions import create_archive_partitions
+from house_reservations_billing.models.bill import HouseReservationBill, ArchivedHouseReservationBill
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(model: type[models.Model]) -> list[str]:
+    return [field.column for field in model._meta.concrete_fields]
+
+
+def _move_rows_sql(
+        source: type[models.Model],
+        target: type[models.Model],
+        key_column: str,
+) -> str:
+    # колонки архивной таблицы повторяют колонки исходной, плюс, возможно, время архивации
+    columns = ", ".join(connection.ops.quote_name(column) for column in _columns(source))
+    extra_columns = [column for column in _columns(target) if column not in _columns(source)]
+    target_columns = ", ".join([columns, *(connection.ops.quote_name(column) for column in extra_columns)])
+    select_values = ", ".join(["moved.*", *("%(archived_at)s" for _ in extra_columns)])
+
+    return (
+        f"WITH moved AS ("
+        f"DELETE FROM {connection.ops.quote_name(source._meta.db_table)} "
+        f"WHERE {connection.ops.quote_name(key_column)} = ANY(%(ids)s) "
+        f"RETURNING {columns}"
+        f") "
+        f"INSERT INTO {connection.ops.quote_name(target._meta.db_table)} ({target_columns}) "
+        f"SELECT {select_values} FROM moved"
+    )
+
+
+def archive_reservations_batch(check_out_before, batch_size: int) -> int:
+    """
+    Переносит в архив не больше batch_size бронирований с выездом раньше check_out_before вместе с их счетами.
+    Все происходит в одной короткой транзакции: строки удаляются из актуальных таблиц через DELETE ... RETURNING
+    и тут же вставляются в архивные. Возвращает количество перенесенных бронирований.
+    """
+    with transaction.atomic():
+        # SKIP LOCKED - бронирования, которые прямо сейчас кто-то меняет, перенесутся в следующий раз
+        reservations = list(
+            HouseReservation.objects
+            .filter(check_out_datetime__lt=check_out_before)
+            .order_by("check_out_datetime")
+            .select_for_update(skip_locked=True)
+            .values_list("id", "check_in_datetime")[:batch_size]
+        )
+        if not reservations:
+            return 0
+
+        # архив секционирован по годам заезда - секции для переносимых бронирований должны существовать
+        check_in_years = [localtime(check_in_datetime).year for _, check_in_datetime in reservations]
+        create_archive_partitions(min(check_in_years), max(check_in_years))
+
+        reservations_ids = [reservation_id for reservation_id, _ in reservations]
+        # занятые ночи давно прошедших бронирований больше не нужны, в архив они не переносятся
+        HouseNight.objects.filter(reservation_id__in=reservations_ids).delete()
+
+        parameters = {"ids": reservations_ids, "archived_at": now()}
+        with connection.cursor() as cursor:
+            # сначала счета, которые ссылаются на бронирования
+            cursor.execute(
+                _move_rows_sql(HouseReservationBill, ArchivedHouseReservationBill, "reservation_id"),
+                parameters,
+            )
+            cursor.execute(_move_rows_sql(HouseReservation, ArchivedHouseReservation, "id"), parameters)
+
+    return len(reservations)
+
+
+def archive_outdated_reservations(
+        archive_after_days: int,
+        batch_size: int = 1000,
+        max_batches: int = 100,
+) -> int:
+    """
+    Переносит в архив бронирования, выезд по которым был больше archive_after_days дней назад.
+    Работает пачками по batch_size бронирований, каждая пачка в отдельной транзакции.
+    """
+    check_out_before = now() - timedelta(days=archive_after_days)
+
+    archived_total = 0
+    for _ in range(max_batches):
+        archived = archive_reservations_batch(check_out_before, batch_size)
+        archived_total += archived
+        if archived < batch_size:
+            break
+
+    logger.info(f"Archived {archived_total} reservations with check out before {check_out_before}")
+    return archived_total
@@ -0,0 +1,59 @@
+import logging
+from datetime import date as Date
+
+from house_reservations_billing.services.price_calculators import houses_price_series, calculate_extra_persons_price
+from house_reservations_management.services.occupancy import HousesOccupancy
+from houses.models import House
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_bulk_availability(houses: list[House], windows: list[dict]) -> list[dict]:
+    """
+    Доступные домики и суммарные цены проживания для каждого из промежутков windows
+    (словари с check_in_date, check_out_date и total_persons_amount).
+
+    Занятость и цены ночей загружаются один раз на объединение всех промежутков,
+    дальше каждый промежуток проверяется в памяти.
+    """
+    if not windows:
+        return []
+
+    span_start = min(window["check_in_date"] for window in windows)
+    span_end = max(window["check_out_date"] for window in windows)
+
+    occupancy = HousesOccupancy.load(houses, span_start, span_end)
+    # i-й элемент - цена ночи с span_start + i на span_start + i + 1 без доплаты за дополнительных гостей
+    prices = houses_price_series(houses, span_start, span_end)
+    houses_by_id = {house.id: house for house in houses}
+
+    result = []
+    for window in windows:
+        check_in_date: Date = window["check_in_date"]
+        check_out_date: Date = window["check_out_date"]
+        total_persons_amount: int = window["total_persons_amount"]
+
+        first_night_index = (check_in_date - span_start).days
+        last_night_index = (check_out_date - span_start).days
+        nights_amount = last_night_index - first_night_index
+
+        available_houses = []
+        for house_id in occupancy.available_houses_ids(check_in_date, check_out_date):
+            house = houses_by_id[house_id]
+            if house.max_persons_amount < total_persons_amount:
+                continue
+
+            available_houses.append({
+                "id": house_id,
+                "total_price": (sum(prices[house_id][first_night_index:last_night_index])
+                                + nights_amount * calculate_extra_persons_price(house, total_persons_amount)),
+            })
+
+        result.append({
+            "check_in_date": check_in_date.strftime("%d-%m-%Y"),
+            "check_out_date": check_out_date.strftime("%d-%m-%Y"),
+            "total_persons_amount": total_persons_amount,
+            "houses": available_houses,
+        })
+
+    return result
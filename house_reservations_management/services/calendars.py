@@ -1,117 +1,220 @@
 import logging
 from datetime import date as Date, timedelta
+from typing import Iterator
 
+from django.conf import settings
 from django.db.models import QuerySet
 from django.utils.timezone import now
 
-from house_reservations_billing.services.price_calculators import (
-    calculate_house_price_by_day,
-    is_holiday,
-    calculate_extra_persons_price,
-)
-from house_reservations_management.services.reservations_overlapping import (
-    filter_for_available_houses_by_day,
-    filter_for_available_houses_by_period,
-)
+from core.functions import holiday_mask
+from house_reservations_billing.services.price_calculators import houses_price_series
+from house_reservations_management.services.occupancy import HousesOccupancy
 from houses.models import House
 
 logger = logging.getLogger(__name__)
 
+# days - словарь по дням "%d-%m-%Y", columnar - начало месяца и параллельные массивы по дням месяца
+CALENDAR_FORMAT_DAYS = "days"
+CALENDAR_FORMAT_COLUMNAR = "columnar"
+CALENDAR_FORMATS = (CALENDAR_FORMAT_DAYS, CALENDAR_FORMAT_COLUMNAR)
+# причины недоступности дней - в обоих форматах под одним ключом и только при DEBUG
+REASON_DEBUG_KEY = "reason (debug)"
+
+PASSED_DAY_REASON = "Passed day"
+CHECK_OUT_BEFORE_CHECK_IN_REASON = "Check-out should be after check-in"
+NO_HOUSES_REASON = "No houses available for this check in and out"
+
+# байты 0/1 -> символы "0"/"1"
+_BITS_TABLE = bytes.maketrans(b"\x00\x01", b"01")
+
 
 def _get_calendar_end_day(year: int, month: int) -> Date:
     return Date(year=year + month // 12, month=month % 12 + 1, day=1)
 
 
-def _create_day_entry(day: Date) -> dict:
-    return {
-        "weekday": day.weekday(),
-        "is_holiday": is_holiday(day),
-    }
+def _get_months_starts(year: int, month: int, months_amount: int) -> list[Date]:
+    months_starts = [Date(year=year, month=month, day=1)]
+    for _ in range(months_amount - 1):
+        months_starts.append(_get_calendar_end_day(months_starts[-1].year, months_starts[-1].month))
 
+    return months_starts
 
-def calculate_check_in_calendar(
-        houses: QuerySet[House],
-        year: int,
-        month: int,
+
+def _bits(mask: bytes | bytearray) -> str:
+    return mask.translate(_BITS_TABLE).decode("ascii")
+
+
+def _format_calendar(
+        month_start: Date,
+        availability_key: str,
+        available: bytearray,
+        reasons: list[str | None],
+        prices: list[int | None] | None,
+        calendar_format: str,
 ) -> dict:
-    day = Date(year=year, month=month, day=1)
-    end_day = _get_calendar_end_day(year, month)
+    """
+    Календарь месяца из посчитанных по дням столбцов: available[i], reasons[i] и prices[i] относятся к дню
+    month_start + i. Причины недоступности (REASON_DEBUG_KEY) попадают в ответ только при DEBUG:
+    в формате days - у недоступных дней, в формате columnar - столбцом на все дни.
+    """
+    month_end = _get_calendar_end_day(month_start.year, month_start.month)
+    holidays = holiday_mask(month_start, month_end)
+
+    if calendar_format == CALENDAR_FORMAT_COLUMNAR:
+        calendar = {
+            "start_date": month_start.strftime("%d-%m-%Y"),
+            "days_amount": len(available),
+            "is_holiday": _bits(holidays),
+            availability_key: _bits(available),
+        }
+        if prices is not None:
+            calendar["price"] = prices
+        if settings.DEBUG:
+            calendar[REASON_DEBUG_KEY] = reasons
+        return calendar
+
     calendar = {}
+    first_weekday = month_start.weekday()
+    for i in range(len(available)):
+        day_entry = {
+            "weekday": (first_weekday + i) % 7,
+            "is_holiday": bool(holidays[i]),
+        }
+        if prices is not None:
+            day_entry["price"] = prices[i]
+        day_entry[availability_key] = bool(available[i])
+        if settings.DEBUG and reasons[i] is not None:
+            day_entry[REASON_DEBUG_KEY] = reasons[i]
+
+        calendar[f"{i + 1:02d}-{month_start.month:02d}-{month_start.year}"] = day_entry
 
-    while day < end_day:
-        day_str = day.strftime("%d-%m-%Y")
-        calendar[day_str] = _create_day_entry(day)
+    return calendar
 
-        if day <= now().date():
-            # не показываем цены домиков в уже прошедшие дни поскольку их нельзя забронировать.
-            calendar[day_str].update({
-                "check_in_is_available": False,
-                "reason (debug)": "Passed day"
-            })
-        else:
-            # проверяем, можно ли въехать в рассматриваемый день, поэтому добавляем 1 день
-            available_houses = filter_for_available_houses_by_day(houses, day + timedelta(days=1))
-            # если есть хоть один домик в который можно въехать - день доступен для въезда
-            calendar[day_str]["check_in_is_available"] = bool(available_houses)
 
-        day += timedelta(days=1)
+def iter_check_in_calendars(
+        houses: QuerySet[House],
+        year: int,
+        month: int,
+        months_amount: int = 1,
+        calendar_format: str = CALENDAR_FORMAT_DAYS,
+) -> Iterator[tuple[Date, dict]]:
+    """
+    Календари въезда на months_amount месяцев начиная с year-month: пары (первый день месяца, календарь).
+
+    Занятость загружается один раз на весь промежуток при получении первого календаря,
+    следующие месяцы считаются в памяти.
+    """
+    months_starts = _get_months_starts(year, month, months_amount)
+    end_day = _get_calendar_end_day(months_starts[-1].year, months_starts[-1].month)
+    today = now().date()
+
+    # занятость всех домиков на весь промежуток достается одним запросом,
+    # дальше доступность каждого дня проверяется по битовым маскам
+    occupancy = HousesOccupancy.load(houses, months_starts[0], end_day)
+    free_nights = occupancy.any_house_free_nights()
+
+    for month_start in months_starts:
+        days_amount = (_get_calendar_end_day(month_start.year, month_start.month) - month_start).days
+        available = bytearray(days_amount)
+        reasons = [None] * days_amount
+
+        for i in range(days_amount):
+            day = month_start + timedelta(days=i)
+            if day <= today:
+                # прошедшие дни нельзя забронировать
+                reasons[i] = PASSED_DAY_REASON
+            else:
+                # проверяем, можно ли въехать в рассматриваемый день - то есть свободна ли ночь с day на day + 1
+                # если есть хоть один домик в который можно въехать - день доступен для въезда
+                available[i] = occupancy.is_night_set(free_nights, day)
 
-    return calendar
+        yield month_start, _format_calendar(month_start, "check_in_is_available", available, reasons,
+                                            None, calendar_format)
 
 
-def _get_day_prices(
-        total_persons_amount: int,
-        day: Date,
+def calculate_check_in_calendar(
         houses: QuerySet[House],
+        year: int,
+        month: int,
+        calendar_format: str = CALENDAR_FORMAT_DAYS,
 ) -> dict:
-    day_prices = {}
-    for house in houses:
-        day_prices[house] = calculate_house_price_by_day(house, day) \
-                            + calculate_extra_persons_price(house, total_persons_amount)
-    return day_prices
+    _, calendar = next(iter_check_in_calendars(houses, year, month, calendar_format=calendar_format))
+    return calendar
 
 
-def calculate_check_out_calendar(
+def iter_check_out_calendars(
         houses: QuerySet[House],
         total_persons_amount: int,
         check_in_date: Date,
         year: int,
         month: int,
-) -> dict:
-    first_month_day = Date(year=year, month=month, day=1)
-    end_day = _get_calendar_end_day(year, month)
-    calendar = {}
-    if first_month_day >= check_in_date:
-        houses = filter_for_available_houses_by_period(houses, check_in_date, first_month_day)
-
-    day = first_month_day
-
-    while day < end_day:
-        day_str = day.strftime("%d-%m-%Y")
-        calendar[day_str] = _create_day_entry(day)
-
-        if day <= check_in_date:
-            calendar[day_str].update({
-                "price": None,
-                "check_out_is_available": False,
-                "reason (debug)": "Check-out should be after check-in",
-            })
-        else:
-            houses = filter_for_available_houses_by_day(houses, day)
-            day_prices = _get_day_prices(total_persons_amount, day, houses)
-
-            if day_prices:
-                calendar[day_str].update({
-                    "price": min(day_prices.values()),
-                    "check_out_is_available": True,
-                })
+        months_amount: int = 1,
+        calendar_format: str = CALENDAR_FORMAT_DAYS,
+) -> Iterator[tuple[Date, dict]]:
+    """
+    Календари выезда на months_amount месяцев начиная с year-month: пары (первый день месяца, календарь).
+
+    Занятость и цены загружаются один раз на весь промежуток при получении первого календаря,
+    следующие месяцы считаются в памяти.
+    """
+    months_starts = _get_months_starts(year, month, months_amount)
+    first_day = months_starts[0]
+    end_day = _get_calendar_end_day(months_starts[-1].year, months_starts[-1].month)
+
+    # домик доступен для выезда в день day, если свободны все ночи с check_in_date по day - 1.
+    # поэтому для каждого домика достаточно один раз найти первую занятую ночь после въезда:
+    # дальше при проходе по дням домик выбывает из множества доступных, как только день выезда
+    # оказывается позже этой ночи
+    houses = list(houses)
+    houses_by_drop_day = {}
+    prices = {}
+    if check_in_date < end_day:
+        occupancy = HousesOccupancy.load(houses, check_in_date, end_day)
+        for house in houses:
+            first_busy_night = occupancy.first_busy_night(house.id)
+            if first_busy_night is not None:
+                houses_by_drop_day.setdefault(first_busy_night + timedelta(days=1), []).append(house)
+
+        # i-й элемент - цена ночи, заканчивающейся в день first_day + i
+        prices = houses_price_series(houses, first_day - timedelta(days=1), end_day - timedelta(days=1),
+                                     total_persons_amount)
+
+    available_houses = set(houses)
+    for drop_day, dropped_houses in houses_by_drop_day.items():
+        if drop_day <= first_day:
+            available_houses.difference_update(dropped_houses)
+
+    for month_start in months_starts:
+        days_amount = (_get_calendar_end_day(month_start.year, month_start.month) - month_start).days
+        available = bytearray(days_amount)
+        reasons = [None] * days_amount
+        month_prices = [None] * days_amount
+
+        for i in range(days_amount):
+            day = month_start + timedelta(days=i)
+            available_houses.difference_update(houses_by_drop_day.get(day, []))
+
+            if day <= check_in_date:
+                reasons[i] = CHECK_OUT_BEFORE_CHECK_IN_REASON
+            elif available_houses:
+                day_index = (day - first_day).days
+                available[i] = True
+                month_prices[i] = min(prices[house.id][day_index] for house in available_houses)
             else:
-                calendar[day_str].update({
-                    "price": None,
-                    "check_out_is_available": False,
-                    "reason (debug)": "No houses available for this check in and out",
-                })
+                reasons[i] = NO_HOUSES_REASON
 
-        day += timedelta(days=1)
+        yield month_start, _format_calendar(month_start, "check_out_is_available", available, reasons,
+                                            month_prices, calendar_format)
 
+
+def calculate_check_out_calendar(
+        houses: QuerySet[House],
+        total_persons_amount: int,
+        check_in_date: Date,
+        year: int,
+        month: int,
+        calendar_format: str = CALENDAR_FORMAT_DAYS,
+) -> dict:
+    _, calendar = next(iter_check_out_calendars(houses, total_persons_amount, check_in_date, year, month,
+                                                calendar_format=calendar_format))
     return calendar
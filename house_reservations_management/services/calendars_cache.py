@@ -0,0 +1,114 @@
+import hashlib
+import logging
+from datetime import date as Date, datetime as Datetime
+from typing import Callable, Hashable
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.timezone import now
+
+from core.cache import get_generations, bump_generation, increment_counter
+from core.functions import HolidayCalendar
+from events.services import EventMultiplierIndex
+from house_reservations_management.services.calendars import CALENDAR_FORMAT_DAYS
+from houses.models import HOUSES_GENERATION_NAME
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_CACHE_TIMEOUT = 60 * 60 * 24
+CALENDAR_KEY_TEMPLATE = "calendar:{digest}"
+CALENDAR_CACHE_HITS_COUNTER = "calendar_cache:hits"
+CALENDAR_CACHE_MISSES_COUNTER = "calendar_cache:misses"
+
+# цены и доступность в календаре зависят от домиков, событий и праздников целиком,
+# а от бронирований - только от тех, что попадают в месяцы календаря
+GLOBAL_GENERATION_NAMES = (
+    HOUSES_GENERATION_NAME,
+    EventMultiplierIndex.GENERATION_NAME,
+    HolidayCalendar.GENERATION_NAME,
+)
+RESERVATIONS_MONTH_GENERATION_TEMPLATE = "reservations:{year}-{month:02d}"
+
+
+def _months_range(first_day: Date, last_day: Date) -> list[tuple[int, int]]:
+    months = []
+    year, month = first_day.year, first_day.month
+    while (year, month) <= (last_day.year, last_day.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    return months
+
+
+def reservation_months_generation_names(
+        check_in_datetime: Datetime,
+        check_out_datetime: Datetime,
+) -> set[str]:
+    """
+    Поколения месяцев, которые затрагивает бронирование с check_in_datetime по check_out_datetime
+    """
+    return {
+        RESERVATIONS_MONTH_GENERATION_TEMPLATE.format(year=year, month=month)
+        for year, month in _months_range(timezone.localtime(check_in_datetime).date(),
+                                         timezone.localtime(check_out_datetime).date())
+    }
+
+
+def bump_reservation_months_generations(generation_names: set[str]):
+    for generation_name in generation_names:
+        bump_generation(generation_name)
+
+
+def get_cached_calendar(
+        houses_key: Hashable,
+        year: int,
+        month: int,
+        total_persons_amount: int,
+        chosen_check_in_date: Date | None,
+        calculate_calendar: Callable[[], dict],
+        calendar_format: str = CALENDAR_FORMAT_DAYS,
+) -> dict:
+    """
+    Календарь на месяц из redis или calculate_calendar(), если в кэше его нет.
+
+    houses_key однозначно определяет набор домиков при текущем поколении домиков (например, параметры фильтрации).
+    Календарь с выбранной датой заезда зависит от бронирований со дня заезда до конца месяца календаря.
+    Если месяц не целиком в будущем - в ключ попадает сегодняшняя дата, чтобы в полночь прошедшие дни обновились.
+    """
+    first_month_day = Date(year=year, month=month, day=1)
+    reservations_since = first_month_day
+    if chosen_check_in_date is not None:
+        reservations_since = min(chosen_check_in_date, first_month_day)
+
+    generation_names = [
+        *GLOBAL_GENERATION_NAMES,
+        *(RESERVATIONS_MONTH_GENERATION_TEMPLATE.format(year=months_year, month=months_month)
+          for months_year, months_month in _months_range(reservations_since, first_month_day)),
+    ]
+    # поколения читаются до расчета календаря: если бронирование изменится во время расчета,
+    # результат сохранится под уже устаревшими поколениями и больше не будет использован
+    generations = get_generations(generation_names)
+
+    today = now().date()
+    raw_key = repr((
+        houses_key,
+        year,
+        month,
+        total_persons_amount,
+        chosen_check_in_date,
+        calendar_format,
+        today if first_month_day <= today else None,
+        generations,
+    ))
+    key = CALENDAR_KEY_TEMPLATE.format(digest=hashlib.sha1(raw_key.encode()).hexdigest())
+
+    calendar = cache.get(key)
+    if calendar is not None:
+        increment_counter(CALENDAR_CACHE_HITS_COUNTER)
+        return calendar
+
+    increment_counter(CALENDAR_CACHE_MISSES_COUNTER)
+    calendar = calculate_calendar()
+    cache.set(key, calendar, timeout=CALENDAR_CACHE_TIMEOUT)
+
+    return calendar
@@ -0,0 +1,79 @@
+import heapq
+import logging
+from datetime import date as Date, timedelta
+from itertools import accumulate
+from typing import Iterator
+
+from house_reservations_billing.services.price_calculators import houses_price_series
+from house_reservations_management.services.occupancy import HousesOccupancy
+from houses.models import House
+
+logger = logging.getLogger(__name__)
+
+
+def _house_stays(
+        house_prices,
+        occupancy_mask: int,
+        nights_options: list[int],
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Свободные варианты проживания в одном домике: (суммарная цена, индекс ночи заезда, количество ночей).
+
+    Суммы по окнам считаются через префиксные суммы цен, а занятость окна - через префиксные суммы
+    занятых ночей, поэтому каждое окно проверяется за O(1) независимо от его длины.
+    """
+    nights_amount = len(house_prices)
+    price_prefix = list(accumulate(house_prices, initial=0))
+    busy_prefix = list(accumulate(((occupancy_mask >> i) & 1 for i in range(nights_amount)), initial=0))
+
+    for stay_nights in nights_options:
+        for first_night in range(nights_amount - stay_nights + 1):
+            last_night = first_night + stay_nights
+            if busy_prefix[last_night] != busy_prefix[first_night]:
+                continue
+
+            yield price_prefix[last_night] - price_prefix[first_night], first_night, stay_nights
+
+
+def find_cheapest_stays(
+        houses: list[House],
+        range_start: Date,
+        range_end: Date,
+        nights_options: list[int],
+        total_persons_amount: int = 1,
+        limit: int = 10,
+) -> list[dict]:
+    """
+    limit самых дешевых свободных вариантов (домик, дата заезда, количество ночей) с заездом не раньше range_start
+    и выездом не позже range_end.
+
+    Занятость и цены ночей загружаются один раз на весь промежуток (2 + 2 запроса к бд),
+    дальше для каждого домика окна всех длин nights_options проходятся скользящей суммой - O(домики × дни).
+    """
+    houses = [house for house in houses if house.max_persons_amount >= total_persons_amount]
+    if not houses:
+        return []
+
+    occupancy = HousesOccupancy.load(houses, range_start, range_end)
+    prices = houses_price_series(houses, range_start, range_end, total_persons_amount)
+
+    def candidates():
+        for house in houses:
+            for total_price, first_night, stay_nights in _house_stays(
+                    prices[house.id], occupancy.masks[house.id], nights_options,
+            ):
+                yield total_price, first_night, stay_nights, house.id
+
+    # куча размера limit - память не зависит от количества вариантов
+    cheapest = heapq.nsmallest(limit, candidates())
+
+    return [
+        {
+            "house_id": house_id,
+            "check_in_date": (range_start + timedelta(days=first_night)).strftime("%d-%m-%Y"),
+            "check_out_date": (range_start + timedelta(days=first_night + stay_nights)).strftime("%d-%m-%Y"),
+            "nights_amount": stay_nights,
+            "total_price": total_price,
+        }
+        for total_price, first_night, stay_nights, house_id in cheapest
+    ]
@@ -1,7 +1,14 @@
+import logging
+
 from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
-from house_reservations.models import HouseReservation
+from house_reservations.models import HouseReservation, HouseNightsBusyError
 from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_management.services.reservations_overlapping import HOUSE_IS_BUSY_MESSAGE
+
+logger = logging.getLogger(__name__)
 
 
 def calculate_reservation(data) -> HouseReservation:
@@ -14,14 +21,34 @@ def calculate_reservation(data) -> HouseReservation:
     return reservation
 
 
-def create_reservation(data):
+def create_reservation(data) -> HouseReservation:
+    """
+    Оптимистичное создание бронирования: занятость домика заранее не проверяется.
+    Пересечение с другим бронированием отклоняет бд - ограничение exclude_reservations_overlapping
+    (или unique_house_night для занятых ночей), и HouseReservation.save сообщает об этом HouseNightsBusyError.
+    Здесь она превращается в ту же ValidationError, что и при проверке в HouseReservationParametersSerializer.
+    Между проверкой и вставкой нет гонки.
+
+    Параметры должны быть уже проверены (NewHouseReservationParametersSerializer), поэтому модели
+    сохраняются без full_clean, а счет считается один раз - до открытия транзакции.
+    """
     promo_code = data.pop("promo_code")
     reservation = HouseReservation(**data)
-    # there is an explicit call to .recalculate() in .save() method
     bill = HouseReservationBill(reservation=reservation, promo_code=promo_code)
-
-    with transaction.atomic():
-        reservation.save()
-        reservation.bill.save()
+    bill.recalculate()
+    # проверки полей бронирования (например, длина строк) и счета (например, минимальная сумма)
+    # без внешних ключей не обращаются к бд
+    reservation.clean_fields(exclude=["house", "client"])
+    bill.clean_fields(exclude=["reservation", "promo_code"])
+
+    try:
+        with transaction.atomic():
+            reservation.save(validate=False)
+            bill.save(recalculate=False)
+    except HouseNightsBusyError:
+        logger.info(f"Reservation of house {reservation.house_id} "
+                    f"({reservation.check_in_datetime} - {reservation.check_out_datetime}) "
+                    f"rejected by the database: the house is busy")
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [HOUSE_IS_BUSY_MESSAGE]})
 
     return reservation
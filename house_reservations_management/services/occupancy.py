@@ -0,0 +1,94 @@
+import logging
+from datetime import date as Date, timedelta
+
+from django.db.models import QuerySet
+
+from house_reservations.models import HouseNight
+from houses.models import House
+
+logger = logging.getLogger(__name__)
+
+
+class HousesOccupancy:
+    """
+    Занятость домиков по ночам в промежутке [start_date, end_date).
+
+    Ночь day - это ночь с day на day + 1. Для каждого домика хранится битовая маска,
+    в которой i-й бит выставлен, если ночь start_date + i занята хотя бы одним неотмененным бронированием.
+    Занятые ночи берутся из HouseNight. Загрузка занимает 2 запроса к бд независимо от длины промежутка,
+    дальше все считается в памяти.
+    """
+
+    def __init__(self, houses_ids: list[int], start_date: Date, end_date: Date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.nights_amount = max(0, (end_date - start_date).days)
+        self.masks = {house_id: 0 for house_id in houses_ids}
+
+    @classmethod
+    def load(cls, houses: QuerySet[House] | list[House], start_date: Date, end_date: Date) -> "HousesOccupancy":
+        if isinstance(houses, QuerySet):
+            houses_ids = list(houses.values_list("id", flat=True))
+        else:
+            houses_ids = [house.id for house in houses]
+
+        occupancy = cls(houses_ids, start_date, end_date)
+        if not occupancy.masks or not occupancy.nights_amount:
+            return occupancy
+
+        # одним запросом достаем все занятые ночи домиков в рассматриваемом промежутке.
+        # поиск идет по уникальному индексу (house_id, night_date) и обслуживается index-only scan
+        nights = HouseNight.objects.filter(
+            house_id__in=occupancy.masks.keys(),
+            night_date__gte=start_date,
+            night_date__lt=end_date,
+        ).values_list("house_id", "night_date")
+
+        for house_id, night_date in nights:
+            occupancy.add_night(house_id, night_date)
+
+        return occupancy
+
+    def add_night(self, house_id: int, night_date: Date):
+        self.masks[house_id] |= 1 << (night_date - self.start_date).days
+
+    def _period_bits(self, check_in_date: Date, check_out_date: Date) -> int:
+        first_index = (check_in_date - self.start_date).days
+        last_index = (check_out_date - self.start_date).days
+        if first_index < 0 or last_index > self.nights_amount:
+            raise ValueError(f"Period {check_in_date} - {check_out_date} is out of loaded occupancy "
+                             f"{self.start_date} - {self.end_date}")
+
+        return ((1 << max(0, last_index - first_index)) - 1) << first_index
+
+    def is_free_by_period(self, house_id: int, check_in_date: Date, check_out_date: Date) -> bool:
+        return not self.masks[house_id] & self._period_bits(check_in_date, check_out_date)
+
+    def available_houses_ids(self, check_in_date: Date, check_out_date: Date) -> list[int]:
+        bits = self._period_bits(check_in_date, check_out_date)
+        return [house_id for house_id, mask in self.masks.items() if not mask & bits]
+
+    def first_busy_night(self, house_id: int) -> Date | None:
+        mask = self.masks[house_id]
+        if not mask:
+            return None
+
+        # индекс младшего выставленного бита
+        return self.start_date + timedelta(days=(mask & -mask).bit_length() - 1)
+
+    def any_house_free_nights(self) -> int:
+        """
+        Битовая маска ночей, в которые свободен хотя бы один домик
+        """
+        all_nights = (1 << self.nights_amount) - 1
+        if not self.masks:
+            return 0
+
+        busy_for_all_houses = all_nights
+        for mask in self.masks.values():
+            busy_for_all_houses &= mask
+
+        return all_nights & ~busy_for_all_houses
+
+    def is_night_set(self, mask: int, night: Date) -> bool:
+        return bool(mask >> (night - self.start_date).days & 1)
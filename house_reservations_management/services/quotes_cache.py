@@ -0,0 +1,115 @@
+import hashlib
+import logging
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import now
+from rest_framework import serializers
+
+from core.cache import get_generations, increment_counter
+from core.functions import HolidayCalendar
+from events.services import EventMultiplierIndex
+from house_reservations_billing.models.promocode import PROMO_CODES_GENERATION_NAME
+from house_reservations_management.services.calendars_cache import reservation_months_generation_names
+from houses.models import HOUSES_GENERATION_NAME
+
+logger = logging.getLogger(__name__)
+
+# ползунки дат на фронтенде присылают очереди одинаковых запросов - достаточно короткого времени жизни
+QUOTE_CACHE_TIMEOUT = 30
+QUOTE_KEY_TEMPLATE = "quote:{kind}:{digest}"
+QUOTE_LOCK_KEY_TEMPLATE = "quote_lock:{kind}:{digest}"
+# сколько одинаковый запрос ждет результата, который уже считает другой запрос
+QUOTE_LOCK_TIMEOUT = 5
+QUOTE_LOCK_WAIT_TIMEOUT = 2
+QUOTE_LOCK_POLL_INTERVAL = 0.02
+QUOTE_CACHE_HITS_COUNTER = "quote_cache:hits"
+QUOTE_CACHE_MISSES_COUNTER = "quote_cache:misses"
+
+# цена зависит от домика, событий, праздников и промокода (в том числе от количества его использований),
+# а доступность - от бронирований в месяцах проживания
+GLOBAL_GENERATION_NAMES = (
+    HOUSES_GENERATION_NAME,
+    EventMultiplierIndex.GENERATION_NAME,
+    HolidayCalendar.GENERATION_NAME,
+    PROMO_CODES_GENERATION_NAME,
+)
+
+_datetime_field = serializers.DateTimeField(input_formats=settings.DATETIME_INPUT_FORMATS)
+
+
+def normalize_quote_parameters(house_id, data) -> tuple | None:
+    """
+    Параметры запроса цены в каноническом виде (разные записи одних и тех же дат дают один ключ).
+    Разбор не обращается к бд. None - если параметры не разбираются: такие запросы идут мимо кэша,
+    и ошибку возвращает обычная валидация.
+    """
+    try:
+        check_in_datetime = _datetime_field.to_internal_value(data["check_in_datetime"])
+        check_out_datetime = _datetime_field.to_internal_value(data["check_out_datetime"])
+        total_persons_amount = int(data["total_persons_amount"])
+        house_id = int(house_id)
+    except (KeyError, TypeError, ValueError, serializers.ValidationError):
+        return None
+
+    promo_code = data.get("promo_code") or None
+    if promo_code is not None and not isinstance(promo_code, str):
+        return None
+
+    return house_id, check_in_datetime, check_out_datetime, total_persons_amount, promo_code
+
+
+def get_cached_quote(kind: str, parameters: tuple | None, calculate_quote: Callable[[], dict]) -> dict:
+    """
+    Ответ на запрос цены из redis или calculate_quote(), если в кэше его нет.
+
+    kind - вид ответа (например, полный расчет бронирования или облегченный), parameters - результат
+    normalize_quote_parameters. Попадание в кэш не обращается к бд: поколения читаются одним запросом к redis.
+    Одинаковые промахи не считаются параллельно - первый берет блокировку (cache.add), остальные ждут его результат.
+    Ошибки валидации из calculate_quote не кэшируются.
+    """
+    if parameters is None:
+        return calculate_quote()
+
+    _, check_in_datetime, check_out_datetime, _, _ = parameters
+    generation_names = [
+        *GLOBAL_GENERATION_NAMES,
+        *sorted(reservation_months_generation_names(check_in_datetime, check_out_datetime)),
+    ]
+    # поколения читаются до расчета: если данные изменятся во время расчета,
+    # результат сохранится под уже устаревшими поколениями и больше не будет использован
+    generations = get_generations(generation_names)
+
+    # сегодняшняя дата - потому что бронировать можно только с завтрашнего дня
+    raw_key = repr((parameters, now().date(), generations))
+    digest = hashlib.sha1(raw_key.encode()).hexdigest()
+    key = QUOTE_KEY_TEMPLATE.format(kind=kind, digest=digest)
+
+    quote = cache.get(key)
+    if quote is not None:
+        increment_counter(QUOTE_CACHE_HITS_COUNTER)
+        return quote
+
+    increment_counter(QUOTE_CACHE_MISSES_COUNTER)
+    lock_key = QUOTE_LOCK_KEY_TEMPLATE.format(kind=kind, digest=digest)
+    if not cache.add(lock_key, 1, timeout=QUOTE_LOCK_TIMEOUT):
+        # такой же запрос уже считается - ждем его результат, но не дольше QUOTE_LOCK_WAIT_TIMEOUT
+        deadline = time.monotonic() + QUOTE_LOCK_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(QUOTE_LOCK_POLL_INTERVAL)
+            cached = cache.get_many([key, lock_key])
+            if key in cached:
+                return cached[key]
+            if lock_key not in cached:
+                # блокировку отпустили без результата (например, ошибка валидации) - считаем сами
+                break
+
+    try:
+        quote = calculate_quote()
+        cache.set(key, quote, timeout=QUOTE_CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+    return quote
@@ -1,140 +1,80 @@
 import logging
-from datetime import datetime as Datetime, date as Date, timedelta
+from datetime import datetime as Datetime, date as Date
 
-from django.db.models import QuerySet, Q, IntegerField, Value, Sum, Count, F
-from django.db.models.functions import Coalesce
-from django.utils.timezone import get_default_timezone
+from django.contrib.postgres.fields import RangeBoundary
+from django.db import connection
+from django.db.models import QuerySet, Exists, OuterRef
 
-from core.models import Pricing
+from house_reservations.models import HouseReservation, HouseNight
+from house_reservations.sql_functions import TsTzRange
 from houses.models import House
 
 logger = logging.getLogger(__name__)
 
+HOUSE_IS_BUSY_MESSAGE = ("Выбранное время бронирования недоступно. "
+                         "Попробуйте поставить другое время заезда/выезда, "
+                         "если дни заезда и выезда в календаре отмечены, как свободные.")
 
-def filter_for_available_houses_by_day(houses: QuerySet[House], day: Date) -> QuerySet[House]:
+
+def overlapping_reservations(
+        check_in_datetime: Datetime,
+        check_out_datetime: Datetime,
+) -> QuerySet[HouseReservation]:
     """
-    Эта функция получает на вход QuerySet из домиков (houses) и день выезда (day).
+    Неотмененные бронирования, пересекающиеся с промежутком [check_in_datetime, check_out_datetime).
 
-    Возвращает те домики, которые возможно забронировать на одну ночь, с выездом в переданный день (day)
+    Выражение TSTZRANGE(check_in_datetime, check_out_datetime, '[)') и условие cancelled=False совпадают с
+    ограничением exclude_reservations_overlapping, поэтому поиск идет по его GiST индексу,
+    а не по всей истории бронирований домика.
     """
-    # Это фильтр, который возвращает все бронирования для некоторого домика, которые имеют пересечение с промежутком
-    # с Datetime.combine(day - timedelta(days=1), Pricing.ALLOWED_CHECK_IN_TIMES['latest'])
-    # по Datetime.combine(day, Pricing.ALLOWED_CHECK_OUT_TIMES['earliest'])
-    # проверяем отсутствие пересечения с latest check_in и earliest check_out, потому что это тот кейс
-    # который необходим для свободности домика в рассматриваемую ночь
-    q = Q(
-        reservations__check_in_datetime__lte=Datetime.combine(
-            day - timedelta(days=1),
-            Pricing.ALLOWED_CHECK_IN_TIMES['latest'],
-            tzinfo=get_default_timezone(),
-        ),
-        reservations__check_out_datetime__gte=Datetime.combine(
-            day,
-            Pricing.ALLOWED_CHECK_OUT_TIMES['earliest'],
-            tzinfo=get_default_timezone(),
-        ),
-        reservations__cancelled=False,
+    return HouseReservation.objects.annotate(
+        period=TsTzRange("check_in_datetime", "check_out_datetime", RangeBoundary()),
+    ).filter(
+        cancelled=False,
+        period__overlap=(check_in_datetime, check_out_datetime),
     )
 
-    # в коде ниже мы применяем для каждого домика фильтр составленный выше и считаем количество полученных бронирований
-    # если оно равно нулю, то домик в рассматриваемую ночь свободен - поэтому производится фильтрация по этому полю
-    available_houses = houses.annotate(
-        overlapping_reservations=Coalesce(
-            Sum("reservations", filter=q, distinct=True),
-            Value(0),
-            output_field=IntegerField()
-        ),
-    ).filter(overlapping_reservations=0)
-    # TODO дальнейшая оптимизация - .values("id", "base_price", "holidays_multiplier")
-    #  или глянуть какой запрос летит в бд и кидать его самому
-
-    return available_houses
-
 
 def filter_for_available_houses_by_period(
         houses: QuerySet[House],
         check_in_date: Date,
         check_out_date: Date,
 ) -> QuerySet[House]:
-    booked_before_query = Q(
-        reservations__check_out_datetime__lt=Datetime.combine(
-            check_in_date,
-            Pricing.ALLOWED_CHECK_IN_TIMES['latest'],
-            tzinfo=get_default_timezone(),
-        ),
-        reservations__cancelled=False,
-    )
-    booked_after_query = Q(
-        reservations__check_in_datetime__gt=Datetime.combine(
-            check_out_date,
-            Pricing.ALLOWED_CHECK_OUT_TIMES['earliest'],
-            tzinfo=get_default_timezone(),
-        ),
-        reservations__cancelled=False,
+    # домик свободен, если не занята ни одна ночь с check_in_date по check_out_date - 1.
+    # это то же самое, что ни одно бронирование не пересекается с промежутком
+    # с самого позднего въезда в день check_in_date до самого раннего выезда в день check_out_date
+    busy_nights = HouseNight.objects.filter(
+        house=OuterRef("pk"),
+        night_date__gte=check_in_date,
+        night_date__lt=check_out_date,
     )
-    # два условия выше - условия, что очередное бронирование не пересекается с выбранными датами
-    # нам нужно выбрать те домики, для которых суммарное количество таких бронирований
-    # не равно общему количеству бронирований
-    booked_total_query = Q(reservations__cancelled=False)
 
-    # есть еще queryset.extra позволяющий делать запуск raw SQL
-    return houses.annotate(
-        booked_before=Coalesce(
-            Sum("reservations", filter=Q(booked_before_query), distinct=True),
-            Value(0),
-            output_field=IntegerField()
-        ),
-        booked_after=Coalesce(
-            Sum("reservations", filter=Q(booked_after_query), distinct=True),
-            Value(0),
-            output_field=IntegerField()
-        ),
-        booked_total=Coalesce(
-            Sum("reservations", filter=Q(booked_total_query), distinct=True),
-            Value(0),
-            output_field=IntegerField()
-        ),
-        overlapping_reservations=F("booked_total") - F("booked_before") - F("booked_after")
-    ).filter(overlapping_reservations=0)
+    return houses.filter(~Exists(busy_nights))
 
 
 def check_if_house_free_by_period(house: House, check_in_datetime: Datetime, check_out_datetime: Datetime) -> bool:
-    q1 = Q(check_out_datetime__lt=check_in_datetime, cancelled=False)
-    q2 = Q(check_in_datetime__gt=check_out_datetime, cancelled=False)
-    q3 = Q(cancelled=False)
+    return not overlapping_reservations(check_in_datetime, check_out_datetime).filter(house=house).exists()
 
-    return house.reservations.annotate(
-        booked_before=Coalesce(
-            Count("id", filter=Q(q1), distinct=True),
-            Value(0),
-            output_field=IntegerField()
-        ),
-        booked_after=Coalesce(
-            Count("id", filter=Q(q2), distinct=True),
-            Value(0),
-            output_field=IntegerField()
-        ),
-        booked_total=Coalesce(
-            Count("id", filter=Q(q3), distinct=True),
-            Value(0),
-            output_field=IntegerField()
-        ),
-        overlapping_reservations=F("booked_total") - F("booked_before") - F("booked_after")
-    ).exclude(overlapping_reservations=0).exists()
 
-# Пример как можно было бы писать через сырой SQL запрос
-#
-# def check_if_house_free_by_period(house: House, check_in_datetime: Datetime, check_out_datetime: Datetime) -> bool:
-#     sql_query = """
-#     SELECT 1 FROM house_reservations_housereservation
-#     WHERE house_id = %s AND cancelled = FALSE AND
-#           (
-#               check_in_datetime < %s AND check_out_datetime > %s
-#           )
-#     LIMIT 1
-#     """
-#     with connection.cursor() as cursor:
-#         cursor.execute(sql_query, [house.id, check_out_datetime, check_in_datetime])
-#         overlapping_reservations = cursor.fetchone()
-#
-#     return overlapping_reservations is None
+def count_double_bookings(house_ids: list[int] | None = None) -> int:
+    """
+    Количество пар неотмененных пересекающихся бронирований одного домика (среди домиков house_ids или всех).
+    Ограничение exclude_reservations_overlapping не должно такого допускать, так что результат всегда 0 -
+    проверка для нагрузочных тестов записи бронирований.
+    """
+    table = HouseReservation._meta.db_table
+    sql = (
+        f"SELECT COUNT(*) FROM {table} a JOIN {table} b "
+        f"ON a.house_id = b.house_id AND a.id < b.id "
+        f"AND TSTZRANGE(a.check_in_datetime, a.check_out_datetime, '[)') "
+        f"&& TSTZRANGE(b.check_in_datetime, b.check_out_datetime, '[)') "
+        f"WHERE NOT a.cancelled AND NOT b.cancelled"
+    )
+    params = []
+    if house_ids is not None:
+        sql += " AND a.house_id = ANY(%s)"
+        params.append(list(house_ids))
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
@@ -0,0 +1,35 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from house_reservations.models import HouseReservation
+from house_reservations_management.services.calendars_cache import (
+    reservation_months_generation_names,
+    bump_reservation_months_generations,
+)
+
+
+def _reservation_months(reservation: HouseReservation) -> set[str]:
+    # через __dict__, чтобы отложенные (.only/.defer) поля не догружались отдельным запросом на каждый экземпляр
+    check_in_datetime = reservation.__dict__.get("check_in_datetime")
+    check_out_datetime = reservation.__dict__.get("check_out_datetime")
+    if check_in_datetime is None or check_out_datetime is None:
+        return set()
+
+    return reservation_months_generation_names(check_in_datetime, check_out_datetime)
+
+
+@receiver(post_init, sender=HouseReservation)
+def remember_reservation_months(sender, instance: HouseReservation, **kwargs):
+    # при изменении дат бронирования нужно сбросить календари и старых, и новых месяцев
+    instance._initial_calendar_months = _reservation_months(instance)
+
+
+@receiver([post_save, post_delete], sender=HouseReservation)
+def invalidate_reservation_months_calendars(sender, instance: HouseReservation, **kwargs):
+    generation_names = instance._initial_calendar_months | _reservation_months(instance)
+    instance._initial_calendar_months = _reservation_months(instance)
+
+    transaction.on_commit(partial(bump_reservation_months_generations, generation_names))
@@ -1,6 +1,8 @@
 from celery import shared_task
+from django.conf import settings
 
 from house_reservations.models import HouseReservation
+from house_reservations_management.services import archive as archive_service
 from notifications import UserNotificationService, ManagerNotificationsService
 
 
@@ -24,5 +26,7 @@ def remind_manager_about_unapproved_reservations():
 
 @shared_task
 def archive_outdated_reservations():
-    reservations = HouseReservation.objects.filter(id=1)  # TODO
-    ManagerNotificationsService.there_are_some_unapproved_reservations(reservations)
+    return archive_service.archive_outdated_reservations(
+        archive_after_days=settings.RESERVATIONS_ARCHIVE_AFTER_DAYS,
+        batch_size=settings.RESERVATIONS_ARCHIVE_BATCH_SIZE,
+    )
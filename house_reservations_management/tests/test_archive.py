@@ -0,0 +1,95 @@
+from datetime import datetime as Datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.utils.timezone import now, get_default_timezone, localtime
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation, ArchivedHouseReservation, HouseNight
+from house_reservations.partitions import archive_partition_name
+from house_reservations_billing.models.bill import HouseReservationBill, ArchivedHouseReservationBill
+from house_reservations_management.services.archive import archive_outdated_reservations
+from houses.models import House
+
+
+class ArchiveOutdatedReservationsTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание")
+        client = Client.objects.create(email="client@mail.ru")
+        tz = get_default_timezone()
+
+        # 25 бронирований в прошлом (с 60 до 36 дней назад) и одно будущее
+        first_day = now().date() - timedelta(days=60)
+        days = [first_day + timedelta(days=i) for i in range(25)] + [now().date() + timedelta(days=5)]
+        HouseReservation.objects.bulk_create([
+            HouseReservation(
+                house=self.house,
+                client=client,
+                check_in_datetime=Datetime.combine(day, Pricing.ALLOWED_CHECK_IN_TIMES["default"], tzinfo=tz),
+                check_out_datetime=Datetime.combine(day + timedelta(days=1), Pricing.ALLOWED_CHECK_OUT_TIMES["default"],
+                                                    tzinfo=tz),
+                total_persons_amount=1,
+            )
+            for day in days
+        ])
+        HouseReservationBill.objects.bulk_create([
+            HouseReservationBill(reservation=reservation, total=5000)
+            for reservation in HouseReservation.objects.all()
+        ])
+        self.outdated_slugs = set(
+            HouseReservation.objects.filter(check_out_datetime__lt=now()).values_list("slug", flat=True)
+        )
+
+    def test_archive_in_batches(self):
+        archived = archive_outdated_reservations(archive_after_days=30, batch_size=10)
+
+        self.assertEqual(archived, 25)
+        self.assertEqual(HouseReservation.objects.count(), 1)
+        self.assertEqual(HouseReservationBill.objects.count(), 1)
+        self.assertEqual(
+            set(HouseNight.objects.values_list("reservation_id", flat=True)),
+            set(HouseReservation.objects.values_list("id", flat=True)),
+        )
+        self.assertEqual(set(ArchivedHouseReservation.objects.values_list("slug", flat=True)), self.outdated_slugs)
+        self.assertEqual(
+            set(ArchivedHouseReservationBill.objects.values_list("reservation__slug", flat=True)),
+            self.outdated_slugs,
+        )
+
+    def test_recent_reservations_are_kept(self):
+        outdated = HouseReservation.objects.filter(check_out_datetime__lt=now() - timedelta(days=45)).count()
+
+        archive_outdated_reservations(archive_after_days=45, batch_size=10)
+
+        self.assertEqual(ArchivedHouseReservation.objects.count(), outdated)
+        self.assertEqual(HouseReservation.objects.count(), 26 - outdated)
+        self.assertTrue(HouseReservation.objects.filter(check_out_datetime__lt=now()).exists())
+
+    def test_retrieve_archived_reservation_by_slug(self):
+        slug = next(iter(self.outdated_slugs))
+        archive_outdated_reservations(archive_after_days=30)
+
+        response = self.client.get(f"/{settings.URL_PREFIX}/api/v1/houses/reservations/by_slug/", {"slug": slug})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["reservation"]["slug"], slug)
+        self.assertEqual(response.json()["reservation"]["bill"]["total"], 5000)
+
+    def test_archived_reservations_land_in_year_partitions(self):
+        archive_outdated_reservations(archive_after_days=30)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT tableoid::regclass::text FROM {ArchivedHouseReservation._meta.db_table}"
+            )
+            partitions = {row[0] for row in cursor.fetchall()}
+
+        self.assertEqual(
+            partitions,
+            {
+                archive_partition_name(localtime(check_in_datetime).year)
+                for check_in_datetime in ArchivedHouseReservation.objects.values_list("check_in_datetime", flat=True)
+            },
+        )
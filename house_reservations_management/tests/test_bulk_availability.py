@@ -0,0 +1,71 @@
+from datetime import datetime as Datetime, timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation
+from house_reservations_billing.services.price_calculators import price_series
+from house_reservations_management.services.availability import calculate_bulk_availability
+from houses.models import House
+
+
+class BulkAvailabilityTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tz = get_default_timezone()
+        cls.houses = House.objects.bulk_create([
+            House(name=f"Домик {i}", description="Описание", max_persons_amount=2 + i) for i in range(3)
+        ])
+        client = Client.objects.create(email="client@mail.ru")
+
+        cls.first_day = now().date() + timedelta(days=10)
+        cls.busy_house = cls.houses[0]
+        HouseReservation.objects.bulk_create([
+            HouseReservation(
+                house=cls.busy_house,
+                client=client,
+                check_in_datetime=Datetime.combine(cls.first_day + timedelta(days=2),
+                                                   Pricing.ALLOWED_CHECK_IN_TIMES["default"], tzinfo=tz),
+                check_out_datetime=Datetime.combine(cls.first_day + timedelta(days=4),
+                                                    Pricing.ALLOWED_CHECK_OUT_TIMES["default"], tzinfo=tz),
+                total_persons_amount=1,
+            ),
+        ])
+
+    def test_windows_match_single_period_checks(self):
+        windows = [
+            {"check_in_date": self.first_day + timedelta(days=start),
+             "check_out_date": self.first_day + timedelta(days=start + length),
+             "total_persons_amount": persons}
+            for start in range(6)
+            for length in (1, 3)
+            for persons in (1, 3)
+        ]
+
+        result = calculate_bulk_availability(self.houses, windows)
+
+        self.assertEqual(len(result), len(windows))
+        for window, window_result in zip(windows, result):
+            busy_nights = {self.first_day + timedelta(days=2), self.first_day + timedelta(days=3)}
+            window_nights = {window["check_in_date"] + timedelta(days=i)
+                             for i in range((window["check_out_date"] - window["check_in_date"]).days)}
+
+            expected_ids = [
+                house.id for house in self.houses
+                if house.max_persons_amount >= window["total_persons_amount"]
+                and not (house.id == self.busy_house.id and busy_nights & window_nights)
+            ]
+            self.assertEqual([house["id"] for house in window_result["houses"]], expected_ids)
+
+            for house_result in window_result["houses"]:
+                house = next(house for house in self.houses if house.id == house_result["id"])
+                self.assertEqual(
+                    house_result["total_price"],
+                    sum(price_series(house, window["check_in_date"], window["check_out_date"],
+                                     window["total_persons_amount"])),
+                )
+
+    def test_no_windows(self):
+        self.assertEqual(calculate_bulk_availability(self.houses, []), [])
@@ -0,0 +1,85 @@
+from datetime import datetime as Datetime, timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation
+from house_reservations_management.services.calendars import REASON_DEBUG_KEY
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CalendarFormatsTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание", max_persons_amount=4)
+        client = Client.objects.create(email="client@mail.ru")
+
+        first_day = (now().date().replace(day=1) + timedelta(days=62)).replace(day=1)
+        self.check_in_date = first_day + timedelta(days=3)
+        tz = get_default_timezone()
+        HouseReservation.objects.create(
+            house=self.house,
+            client=client,
+            check_in_datetime=Datetime.combine(first_day + timedelta(days=10),
+                                               Pricing.ALLOWED_CHECK_IN_TIMES["default"], tzinfo=tz),
+            check_out_datetime=Datetime.combine(first_day + timedelta(days=12),
+                                                Pricing.ALLOWED_CHECK_OUT_TIMES["default"], tzinfo=tz),
+            total_persons_amount=2,
+        )
+
+        self.url = f"/{settings.URL_PREFIX}/api/v1/houses/{self.house.id}/calendar/"
+        self.params = {"year": first_day.year, "month": first_day.month}
+
+    def _calendar(self, **params) -> dict:
+        response = self.client.get(self.url, {**self.params, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["calendar"]
+
+    def assert_same_calendar(self, days: dict, columnar: dict, availability_key: str):
+        self.assertEqual(columnar["days_amount"], len(days))
+        self.assertEqual(columnar["start_date"], next(iter(days)))
+        for i, day_entry in enumerate(days.values()):
+            self.assertEqual(columnar["is_holiday"][i] == "1", day_entry["is_holiday"])
+            self.assertEqual(columnar[availability_key][i] == "1", day_entry[availability_key])
+            if "price" in columnar:
+                self.assertEqual(columnar["price"][i], day_entry["price"])
+
+    def test_check_in_columnar_matches_days(self):
+        self.assert_same_calendar(self._calendar(), self._calendar(calendar_format="columnar"),
+                                  "check_in_is_available")
+
+    def test_check_out_columnar_matches_days(self):
+        params = {"chosen_check_in_date": self.check_in_date.strftime("%d-%m-%Y")}
+
+        self.assert_same_calendar(self._calendar(**params), self._calendar(calendar_format="columnar", **params),
+                                  "check_out_is_available")
+
+    @override_settings(DEBUG=False)
+    def test_reasons_hidden_without_debug(self):
+        params = {"chosen_check_in_date": self.check_in_date.strftime("%d-%m-%Y")}
+
+        days = self._calendar(**params)
+        columnar = self._calendar(calendar_format="columnar", **params)
+
+        self.assertFalse([day_entry for day_entry in days.values() if REASON_DEBUG_KEY in day_entry])
+        self.assertNotIn(REASON_DEBUG_KEY, columnar)
+
+    @override_settings(DEBUG=True)
+    def test_reasons_with_debug_under_one_key(self):
+        params = {"chosen_check_in_date": self.check_in_date.strftime("%d-%m-%Y")}
+
+        days = self._calendar(**params)
+        columnar = self._calendar(calendar_format="columnar", **params)
+
+        self.assertEqual(
+            [day_entry.get(REASON_DEBUG_KEY) for day_entry in days.values()],
+            columnar[REASON_DEBUG_KEY],
+        )
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url, {**self.params, "calendar_format": "xml"})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,62 @@
+import json
+from datetime import datetime as Datetime, timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CalendarRangeTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание", max_persons_amount=4)
+        client = Client.objects.create(email="client@mail.ru")
+
+        self.first_day = (now().date().replace(day=1) + timedelta(days=62)).replace(day=1)
+        self.check_in_date = self.first_day + timedelta(days=40)
+        tz = get_default_timezone()
+        HouseReservation.objects.create(
+            house=self.house,
+            client=client,
+            check_in_datetime=Datetime.combine(self.check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES["default"],
+                                               tzinfo=tz),
+            check_out_datetime=Datetime.combine(self.check_in_date + timedelta(days=2),
+                                                Pricing.ALLOWED_CHECK_OUT_TIMES["default"], tzinfo=tz),
+            total_persons_amount=2,
+        )
+
+        self.url = f"/{settings.URL_PREFIX}/api/v1/houses/calendar_range/"
+        last_month = (self.first_day + timedelta(days=95)).replace(day=1)
+        self.params = {"from_month": self.first_day.strftime("%m-%Y"), "to_month": last_month.strftime("%m-%Y")}
+
+    def _months(self, params) -> list[dict]:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_months_match_single_month_calendars(self):
+        months = self._months(self.params)
+
+        self.assertEqual(len(months), 4)
+        for month in months:
+            single_month_response = self.client.get(
+                f"/{settings.URL_PREFIX}/api/v1/houses/calendar/",
+                {"year": month["year"], "month": month["month"]},
+            )
+            self.assertEqual(month["calendar"], single_month_response.json()["calendar"])
+
+        busy_day = self.check_in_date.strftime("%d-%m-%Y")
+        self.assertFalse(months[1]["calendar"][busy_day]["check_in_is_available"])
+
+    def test_too_long_range(self):
+        params = {**self.params, "to_month": (self.first_day + timedelta(days=400)).strftime("%m-%Y")}
+
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,66 @@
+from datetime import datetime as Datetime, timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CalendarsCacheTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание", max_persons_amount=4)
+        self.client_instance = Client.objects.create(email="client@mail.ru")
+
+        # месяц целиком в будущем, чтобы в календаре не было прошедших дней
+        first_day = (now().date().replace(day=1) + timedelta(days=62)).replace(day=1)
+        self.check_in_date = first_day + timedelta(days=9)
+        self.url = f"/{settings.URL_PREFIX}/api/v1/houses/{self.house.id}/calendar/"
+        self.params = {"year": first_day.year, "month": first_day.month}
+
+    def _reserve(self, nights: int, check_in_date=None) -> HouseReservation:
+        check_in_date = check_in_date or self.check_in_date
+        tz = get_default_timezone()
+        with self.captureOnCommitCallbacks(execute=True):
+            return HouseReservation.objects.create(
+                house=self.house,
+                client=self.client_instance,
+                check_in_datetime=Datetime.combine(check_in_date,
+                                                   Pricing.ALLOWED_CHECK_IN_TIMES["default"], tzinfo=tz),
+                check_out_datetime=Datetime.combine(check_in_date + timedelta(days=nights),
+                                                    Pricing.ALLOWED_CHECK_OUT_TIMES["default"], tzinfo=tz),
+                total_persons_amount=2,
+            )
+
+    def _check_in_available(self) -> bool:
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["calendar"][self.check_in_date.strftime("%d-%m-%Y")]["check_in_is_available"]
+
+    def test_repeat_request_served_from_cache(self):
+        self._check_in_available()
+        with self.assertNumQueries(0):
+            self._check_in_available()
+
+    def test_reservation_evicts_its_months(self):
+        self.assertTrue(self._check_in_available())
+
+        reservation = self._reserve(nights=2)
+        self.assertFalse(self._check_in_available())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.cancelled = True
+            reservation.save()
+        self.assertTrue(self._check_in_available())
+
+    def test_reservation_in_other_month_keeps_cache(self):
+        self._check_in_available()
+
+        self._reserve(nights=2, check_in_date=self.check_in_date + timedelta(days=62))
+
+        with self.assertNumQueries(0):
+            self._check_in_available()
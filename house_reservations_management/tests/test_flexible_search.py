@@ -0,0 +1,88 @@
+from datetime import datetime as Datetime, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation, HouseNight
+from house_reservations_billing.services.price_calculators import price_series
+from house_reservations_management.services.flexible_search import find_cheapest_stays
+from houses.models import House
+
+
+class FlexibleSearchTest(TestCase):
+    RANGE_DAYS = 40
+
+    @classmethod
+    def setUpTestData(cls):
+        tz = get_default_timezone()
+        cls.houses = House.objects.bulk_create([
+            House(name=f"Домик {i}", description="Описание", base_price=(i + 1) * 1000) for i in range(3)
+        ])
+        client = Client.objects.create(email="client@mail.ru")
+
+        cls.range_start = now().date() + timedelta(days=5)
+        cls.range_end = cls.range_start + timedelta(days=cls.RANGE_DAYS)
+        # самый дешевый домик занят почти весь промежуток
+        cls.cheap_house = cls.houses[0]
+        HouseReservation.objects.bulk_create([
+            HouseReservation(
+                house=cls.cheap_house,
+                client=client,
+                check_in_datetime=Datetime.combine(cls.range_start + timedelta(days=3),
+                                                   Pricing.ALLOWED_CHECK_IN_TIMES["default"], tzinfo=tz),
+                check_out_datetime=Datetime.combine(cls.range_end - timedelta(days=2),
+                                                    Pricing.ALLOWED_CHECK_OUT_TIMES["default"], tzinfo=tz),
+                total_persons_amount=1,
+            ),
+        ])
+
+    def brute_force(self, nights_options, total_persons_amount):
+        busy_nights = set(HouseNight.objects.values_list("house_id", "night_date"))
+
+        stays = []
+        for house in self.houses:
+            for stay_nights in nights_options:
+                for first_night in range(self.RANGE_DAYS - stay_nights + 1):
+                    check_in_date = self.range_start + timedelta(days=first_night)
+                    check_out_date = check_in_date + timedelta(days=stay_nights)
+                    if any((house.id, check_in_date + timedelta(days=i)) in busy_nights for i in range(stay_nights)):
+                        continue
+
+                    total_price = sum(price_series(house, check_in_date, check_out_date, total_persons_amount))
+                    stays.append((total_price, first_night, stay_nights, house.id))
+
+        return sorted(stays)
+
+    def test_matches_brute_force(self):
+        for nights_options in ([2], [3, 5]):
+            expected = self.brute_force(nights_options, 1)[:15]
+
+            stays = find_cheapest_stays(self.houses, self.range_start, self.range_end, nights_options, limit=15)
+
+            self.assertEqual(
+                [(stay["total_price"], stay["check_in_date"], stay["nights_amount"], stay["house_id"])
+                 for stay in stays],
+                [(total_price, (self.range_start + timedelta(days=first_night)).strftime("%d-%m-%Y"),
+                  stay_nights, house_id)
+                 for total_price, first_night, stay_nights, house_id in expected],
+            )
+
+    def test_busy_nights_skipped(self):
+        stays = find_cheapest_stays(self.houses, self.range_start, self.range_end, [4], limit=50)
+
+        self.assertFalse([stay for stay in stays if stay["house_id"] == self.cheap_house.id])
+
+    def test_queries_amount_does_not_depend_on_range(self):
+        queries_amount = []
+        for range_end in (self.range_start + timedelta(days=7), self.range_end):
+            # прогрев кэшей праздников и событий, чтобы сравнивались только запросы поиска
+            find_cheapest_stays(self.houses, self.range_start, range_end, [1])
+            with CaptureQueriesContext(connection) as queries:
+                find_cheapest_stays(self.houses, self.range_start, range_end, [1, 2, 3, 7])
+            queries_amount.append(len(queries))
+
+        self.assertEqual(queries_amount[0], queries_amount[1])
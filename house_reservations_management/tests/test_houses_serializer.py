@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from house_reservations_management.serializers.houses import HouseListWithTotalPriceSerializer
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class HouseListWithTotalPriceSerializerTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание", base_price=8000,
+                                          base_persons_amount=2, max_persons_amount=5, price_per_extra_person=1000)
+        check_in_date = now().date() + timedelta(days=20)
+        self.request = Request(APIRequestFactory().get("/", {
+            "check_in_date": check_in_date.strftime("%d-%m-%Y"),
+            "check_out_date": (check_in_date + timedelta(days=3)).strftime("%d-%m-%Y"),
+            "total_persons_amount": 4,
+        }))
+
+    def test_without_listing_context(self):
+        listing_context = HouseListWithTotalPriceSerializer.get_listing_context([self.house], self.request.query_params)
+        with_listing_context = HouseListWithTotalPriceSerializer(
+            self.house, context={"request": self.request, **listing_context},
+        ).data
+        without_listing_context = HouseListWithTotalPriceSerializer(self.house, context={"request": self.request}).data
+
+        self.assertIsNotNone(without_listing_context["total_price"])
+        self.assertEqual(without_listing_context["total_price"], with_listing_context["total_price"])
+        self.assertEqual(without_listing_context["price_per_day"], with_listing_context["price_per_day"])
+
+    def test_without_request(self):
+        data = HouseListWithTotalPriceSerializer(self.house).data
+
+        self.assertIsNone(data["total_price"])
+        self.assertEqual(data["price_per_day"], self.house.base_price)
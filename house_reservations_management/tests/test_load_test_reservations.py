@@ -0,0 +1,51 @@
+from datetime import datetime as Datetime, time as Time, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.utils.timezone import now
+
+from house_reservations.models import HouseReservation
+from house_reservations_management.services.reservations_overlapping import count_double_bookings
+from houses.models import House
+
+
+class CountDoubleBookingsTest(TestCase):
+    def test_cancelled_reservations_not_counted(self):
+        house = House.objects.create(name="Домик", description="Описание", base_price=5000)
+        check_in_datetime = Datetime.combine(now().date() + timedelta(days=10), Time(hour=16),
+                                             tzinfo=timezone.get_default_timezone())
+        for cancelled in (True, False):
+            HouseReservation.objects.create(house=house, check_in_datetime=check_in_datetime,
+                                            check_out_datetime=check_in_datetime + timedelta(days=1, hours=-4),
+                                            total_persons_amount=1, preferred_contact="a", cancelled=cancelled)
+
+        self.assertEqual(count_double_bookings([house.id]), 0)
+        self.assertEqual(count_double_bookings(), 0)
+
+
+# поток команды работает со своим соединением с бд, поэтому данные должны быть закоммичены - TransactionTestCase
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class LoadTestReservationsCommandTest(TransactionTestCase):
+    @patch("house_reservations_management.views.house_reservations_management."
+           "new_reservation_created_user_notification.delay")
+    @patch("house_reservations_management.views.house_reservations_management."
+           "new_reservation_created_manager_notification.delay")
+    def test_report_and_cleanup(self, manager_notification_mock, user_notification_mock):
+        out = StringIO()
+
+        # один поток - запросы идут по очереди, результат не зависит от планировщика
+        call_command("load_test_reservations", threads=1, requests=6, price_share=0.5, window_days=2, seed=1,
+                     stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("new_reservation:", output)
+        self.assertIn("p99", output)
+        self.assertIn("double bookings: 0", output)
+        manager_notification_mock.assert_not_called()
+        user_notification_mock.assert_not_called()
+        # временный домик удаляется вместе с бронированиями
+        self.assertFalse(House.objects.exists())
+        self.assertFalse(HouseReservation.objects.exists())
@@ -0,0 +1,94 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from house_reservations.models import HouseReservation, HouseNight
+from house_reservations_billing.models.bill import HouseReservationBill
+from house_reservations_billing.services.bill import calculate_bill
+from house_reservations_management.services.reservations_overlapping import HOUSE_IS_BUSY_MESSAGE
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+@patch("house_reservations_management.views.house_reservations_management."
+       "new_reservation_created_user_notification.delay")
+@patch("house_reservations_management.views.house_reservations_management."
+       "new_reservation_created_manager_notification.delay")
+class OptimisticReservationTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание", base_price=8000,
+                                          base_persons_amount=2, max_persons_amount=5, price_per_extra_person=1000)
+        self.check_in_date = now().date() + timedelta(days=20)
+        self.url = f"/{settings.URL_PREFIX}/api/v1/houses/{self.house.id}/reservations/"
+
+    def _data(self, check_in_date, nights_amount: int = 3) -> dict:
+        return {
+            "email": "guest@example.com",
+            "first_name": "Иван",
+            "last_name": "Иванов",
+            "preferred_contact": "telegram",
+            "check_in_datetime": f"{check_in_date.strftime('%d-%m-%Y')} 16:00",
+            "check_out_datetime": f"{(check_in_date + timedelta(days=nights_amount)).strftime('%d-%m-%Y')} 12:00",
+            "total_persons_amount": 3,
+        }
+
+    def _post(self, data: dict):
+        return self.client.post(self.url, data, content_type="application/json")
+
+    def test_reservation_created_with_single_bill_calculation(self, *_):
+        with patch("house_reservations_billing.services.bill.calculate_bill",
+                   wraps=calculate_bill) as calculate_bill_mock:
+            response = self._post(self._data(self.check_in_date))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calculate_bill_mock.call_count, 1)
+
+        reservation = HouseReservation.objects.get(slug=response.json()["slug"])
+        bill = HouseReservationBill.objects.get(reservation=reservation)
+        expected = calculate_bill(self.house, reservation.local_check_in_datetime,
+                                  reservation.local_check_out_datetime, reservation.total_persons_amount)
+        self.assertEqual(bill.total, expected.total)
+        self.assertEqual(HouseNight.objects.filter(reservation=reservation).count(), 3)
+
+    def test_overlapping_reservation_rejected_by_constraint(self, *_):
+        self.assertEqual(self._post(self._data(self.check_in_date)).status_code, 200)
+
+        # занятость не проверяется заранее - пересечение отклоняет бд
+        with patch("house_reservations_management.serializers.house_reservation_parameters."
+                   "check_if_house_free_by_period") as check_mock:
+            response = self._post(self._data(self.check_in_date + timedelta(days=1)))
+
+        check_mock.assert_not_called()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["details"], {"non_field_errors": [HOUSE_IS_BUSY_MESSAGE]})
+        self.assertEqual(HouseReservation.objects.count(), 1)
+        self.assertEqual(HouseReservationBill.objects.count(), 1)
+
+    def test_adjacent_reservation_allowed(self, *_):
+        self.assertEqual(self._post(self._data(self.check_in_date)).status_code, 200)
+        self.assertEqual(self._post(self._data(self.check_in_date + timedelta(days=3))).status_code, 200)
+
+        self.assertEqual(HouseReservation.objects.count(), 2)
+
+    def test_overlong_preferred_contact_rejected(self, *_):
+        data = self._data(self.check_in_date)
+        data["preferred_contact"] = "t" * 256
+
+        response = self._post(data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "VALIDATION_ERROR")
+        self.assertIn("preferred_contact", response.json()["error"]["details"])
+        self.assertFalse(HouseReservation.objects.exists())
+
+    def test_price_still_checks_availability(self, *_):
+        data = self._data(self.check_in_date)
+        self.assertEqual(self._post(data).status_code, 200)
+
+        response = self.client.put(self.url + "price/", data, content_type="application/json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["details"], {"non_field_errors": [HOUSE_IS_BUSY_MESSAGE]})
@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import datetime as Datetime, timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from events.models import Event
+from house_reservations.models import HouseReservation
+from house_reservations_billing.models.constants import FIXED_VALUE_DISCOUNT
+from house_reservations_billing.models.promocode import HouseReservationPromoCode
+from house_reservations_management.services.quotes_cache import get_cached_quote, normalize_quote_parameters
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class QuotesCacheTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание", base_price=8000,
+                                          base_persons_amount=2, max_persons_amount=5, price_per_extra_person=1000)
+        self.check_in_date = now().date() + timedelta(days=20)
+        self.data = {
+            "check_in_datetime": f"{self.check_in_date.strftime('%d-%m-%Y')} 16:00",
+            "check_out_datetime": f"{(self.check_in_date + timedelta(days=3)).strftime('%d-%m-%Y')} 12:00",
+            "total_persons_amount": 2,
+        }
+        self.url = f"/{settings.URL_PREFIX}/api/v1/houses/{self.house.id}/reservations/price/"
+
+    def _price(self, **data):
+        return self.client.put(self.url, {**self.data, **data}, content_type="application/json")
+
+    def _total(self) -> int:
+        response = self._price()
+        self.assertEqual(response.status_code, 200)
+        return response.json()["reservation"]["bill"]["total"]
+
+    def test_hit_skips_db(self):
+        self._total()
+
+        with self.assertNumQueries(0):
+            self._total()
+
+    def test_slug_not_shared_between_responses(self):
+        first_reservation = self._price().json()["reservation"]
+
+        with self.assertNumQueries(0):
+            second_reservation = self._price().json()["reservation"]
+
+        self.assertNotEqual(first_reservation.pop("slug"), second_reservation.pop("slug"))
+        self.assertEqual(first_reservation, second_reservation)
+
+    def test_equivalent_parameters_share_entry(self):
+        self._total()
+
+        with self.assertNumQueries(0):
+            response = self._price(check_in_datetime=f"{self.check_in_date.strftime('%d-%m-%Y')} 16:00:00",
+                                   total_persons_amount="2")
+        self.assertEqual(response.status_code, 200)
+
+    def test_pricing_changes_bust_cache(self):
+        total = self._total()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.house.base_price = 9000
+            self.house.save()
+        self.assertGreater(self._total(), total)
+
+        total = self._total()
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(name="Событие", multiplier=2, start_date=self.check_in_date,
+                                 end_date=self.check_in_date + timedelta(days=5))
+        self.assertGreater(self._total(), total)
+
+    def test_promo_code_changes_bust_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            promo_code = HouseReservationPromoCode.objects.create(code="SALE", discount_type=FIXED_VALUE_DISCOUNT,
+                                                                  discount_value=1000)
+        first_response = self._price(promo_code="SALE")
+        self.assertEqual(first_response.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            promo_code.max_use_times = 0
+            promo_code.save()
+
+        self.assertEqual(self._price(promo_code="SALE").status_code, 400)
+
+    def test_reservation_busts_cache(self):
+        self._total()
+
+        tz = get_default_timezone()
+        with self.captureOnCommitCallbacks(execute=True):
+            HouseReservation.objects.create(
+                house=self.house,
+                client=Client.objects.create(email="client@mail.ru"),
+                check_in_datetime=Datetime.combine(self.check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES["default"],
+                                                   tzinfo=tz),
+                check_out_datetime=Datetime.combine(self.check_in_date + timedelta(days=1),
+                                                    Pricing.ALLOWED_CHECK_OUT_TIMES["default"], tzinfo=tz),
+                total_persons_amount=2,
+            )
+
+        self.assertEqual(self._price().status_code, 400)
+
+    def test_concurrent_misses_calculated_once(self):
+        parameters = normalize_quote_parameters(self.house.id, self.data)
+        calculations = []
+
+        def calculate() -> dict:
+            calculations.append(1)
+            time.sleep(0.2)
+            return {"total": 1}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_cached_quote("test", parameters, calculate)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [{"total": 1}] * 5)
+        self.assertEqual(len(calculations), 1)
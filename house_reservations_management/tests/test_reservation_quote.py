@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ReservationQuoteTest(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(name="Домик", description="Описание", base_price=8000,
+                                          base_persons_amount=2, max_persons_amount=5, price_per_extra_person=1000)
+        check_in_date = now().date() + timedelta(days=20)
+        self.data = {
+            "check_in_datetime": f"{check_in_date.strftime('%d-%m-%Y')} 13:00",
+            "check_out_datetime": f"{(check_in_date + timedelta(days=5)).strftime('%d-%m-%Y')} 15:00",
+            "total_persons_amount": 4,
+        }
+        self.url = f"/{settings.URL_PREFIX}/api/v1/houses/{self.house.id}/reservations/"
+
+    def _put(self, action: str) -> dict:
+        response = self.client.put(self.url + action + "/", self.data, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_quote_matches_reservation_price(self):
+        bill = self._put("price")["reservation"]["bill"]
+        quote = self._put("quote")["quote"]
+
+        self.assertEqual(quote["house"], self.house.id)
+        self.assertEqual(quote["check_in_datetime"], self.data["check_in_datetime"])
+        self.assertEqual(quote["check_out_datetime"], self.data["check_out_datetime"])
+        self.assertEqual(quote["total"], bill["total"])
+        self.assertEqual(quote["chronological_positions"], bill["chronological_positions"])
+        self.assertEqual(quote["non_chronological_positions"], bill["non_chronological_positions"])
+
+    def test_invalid_parameters(self):
+        self.data["total_persons_amount"] = 6
+
+        response = self.client.put(self.url + "quote/", self.data, content_type="application/json")
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,114 @@
+from datetime import datetime as Datetime, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.utils.timezone import now, get_default_timezone
+
+from clients.models import Client
+from core.models import Pricing
+from house_reservations.models import HouseReservation, HouseNight
+from house_reservations_management.services.reservations_overlapping import (
+    filter_for_available_houses_by_period,
+    check_if_house_free_by_period,
+    overlapping_reservations,
+)
+from houses.models import House
+
+
+class ReservationsOverlappingTest(TestCase):
+    HOUSES_AMOUNT = 100
+    HISTORY_NIGHTS = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        tz = get_default_timezone()
+        check_in_time = Pricing.ALLOWED_CHECK_IN_TIMES["default"]
+        check_out_time = Pricing.ALLOWED_CHECK_OUT_TIMES["default"]
+
+        cls.houses = House.objects.bulk_create([
+            House(name=f"Домик {i}", description="Описание") for i in range(cls.HOUSES_AMOUNT)
+        ])
+        client = Client.objects.create(email="client@mail.ru")
+
+        # 100 000 прошедших бронирований: каждый домик был занят каждую ночь последние HISTORY_NIGHTS ночей.
+        # bulk_create не вызывает save, поэтому проверка на прошедшие даты не мешает
+        first_day = now().date() - timedelta(days=cls.HISTORY_NIGHTS + 1)
+        HouseReservation.objects.bulk_create([
+            HouseReservation(
+                house=house,
+                client=client,
+                check_in_datetime=Datetime.combine(first_day + timedelta(days=i), check_in_time, tzinfo=tz),
+                check_out_datetime=Datetime.combine(first_day + timedelta(days=i + 1), check_out_time, tzinfo=tz),
+                total_persons_amount=1,
+            )
+            for house in cls.houses
+            for i in range(cls.HISTORY_NIGHTS)
+        ], batch_size=10000)
+
+        cls.check_in_date = now().date() + timedelta(days=10)
+        cls.check_out_date = cls.check_in_date + timedelta(days=3)
+        cls.busy_house = cls.houses[0]
+        HouseReservation.objects.bulk_create([
+            HouseReservation(
+                house=cls.busy_house,
+                client=client,
+                check_in_datetime=Datetime.combine(cls.check_in_date + timedelta(days=1), check_in_time, tzinfo=tz),
+                check_out_datetime=Datetime.combine(cls.check_in_date + timedelta(days=2), check_out_time, tzinfo=tz),
+                total_persons_amount=1,
+            ),
+            # отмененное бронирование не мешает
+            HouseReservation(
+                house=cls.houses[1],
+                client=client,
+                check_in_datetime=Datetime.combine(cls.check_in_date, check_in_time, tzinfo=tz),
+                check_out_datetime=Datetime.combine(cls.check_out_date, check_out_time, tzinfo=tz),
+                total_persons_amount=1,
+                cancelled=True,
+            ),
+        ])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {HouseReservation._meta.db_table}")
+            cursor.execute(f"ANALYZE {HouseNight._meta.db_table}")
+
+    def test_filter_available_houses(self):
+        available_houses = filter_for_available_houses_by_period(
+            House.objects.all(), self.check_in_date, self.check_out_date,
+        )
+        self.assertEqual(
+            set(available_houses.values_list("id", flat=True)),
+            {house.id for house in self.houses} - {self.busy_house.id},
+        )
+
+        # выезд в день заезда чужого бронирования пересечением не считается
+        self.assertIn(
+            self.busy_house,
+            filter_for_available_houses_by_period(
+                House.objects.all(), self.check_in_date, self.check_in_date + timedelta(days=1),
+            ),
+        )
+
+    def test_check_if_house_free(self):
+        tz = get_default_timezone()
+        check_in_datetime = Datetime.combine(self.check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES["default"], tzinfo=tz)
+        check_out_datetime = Datetime.combine(self.check_out_date, Pricing.ALLOWED_CHECK_OUT_TIMES["default"],
+                                              tzinfo=tz)
+
+        self.assertFalse(check_if_house_free_by_period(self.busy_house, check_in_datetime, check_out_datetime))
+        self.assertTrue(check_if_house_free_by_period(self.houses[1], check_in_datetime, check_out_datetime))
+
+    def test_history_is_not_scanned(self):
+        available_houses = filter_for_available_houses_by_period(
+            House.objects.all(), self.check_in_date, self.check_out_date,
+        )
+        plan = available_houses.explain()
+
+        self.assertNotIn(f"Seq Scan on {HouseNight._meta.db_table}", plan)
+
+        tz = get_default_timezone()
+        busy_house_reservations = overlapping_reservations(
+            Datetime.combine(self.check_in_date, Pricing.ALLOWED_CHECK_IN_TIMES["default"], tzinfo=tz),
+            Datetime.combine(self.check_out_date, Pricing.ALLOWED_CHECK_OUT_TIMES["default"], tzinfo=tz),
+        ).filter(house=self.busy_house)
+
+        self.assertNotIn(f"Seq Scan on {HouseReservation._meta.db_table}", busy_house_reservations.explain())
@@ -1,14 +1,27 @@
 from datetime import date as Date
+from typing import Hashable, Iterator
 
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from core.mixins import ByActionMixin
-from house_reservations_management.serializers.calendars_parameters import CalendarsParametersSerializer
-from house_reservations_management.services.calendars import calculate_check_in_calendar, calculate_check_out_calendar
+from core.renderers import ORJSONRenderer
+from house_reservations_management.serializers.calendars_parameters import (
+    CalendarsParametersSerializer,
+    CalendarsRangeParametersSerializer,
+)
+from house_reservations_management.services.calendars import (
+    CALENDAR_FORMAT_DAYS,
+    calculate_check_in_calendar,
+    calculate_check_out_calendar,
+    iter_check_in_calendars,
+    iter_check_out_calendars,
+)
+from house_reservations_management.services.calendars_cache import get_cached_calendar
 from houses.filters import FilterHousesByMaxPersonsAmount
 from houses.models import House
 
@@ -21,6 +34,7 @@ class CalendarsViewSet(
         "default": None,
         "calendar": CalendarsParametersSerializer,
         "single_house_calendar": CalendarsParametersSerializer,
+        "calendar_range": CalendarsRangeParametersSerializer,
     }
 
     queryset = House.objects.filter(active=True)
@@ -33,25 +47,81 @@ class CalendarsViewSet(
     def get_calendar(
             self,
             houses: QuerySet[House],
+            houses_key: Hashable,
             year: int,
             month: int,
             total_persons_amount: int = 1,
             chosen_check_in_date: Date = None,
+            calendar_format: str = CALENDAR_FORMAT_DAYS,
     ) -> dict:
+        def calculate_calendar() -> dict:
+            if chosen_check_in_date:
+                return calculate_check_out_calendar(
+                    houses=houses,
+                    total_persons_amount=total_persons_amount,
+                    check_in_date=chosen_check_in_date,
+                    year=year,
+                    month=month,
+                    calendar_format=calendar_format,
+                )
+            else:
+                return calculate_check_in_calendar(
+                    houses=houses,
+                    year=year,
+                    month=month,
+                    calendar_format=calendar_format,
+                )
+
+        return get_cached_calendar(
+            houses_key=houses_key,
+            year=year,
+            month=month,
+            total_persons_amount=total_persons_amount,
+            chosen_check_in_date=chosen_check_in_date,
+            calculate_calendar=calculate_calendar,
+            calendar_format=calendar_format,
+        )
+
+    def iter_calendars(
+            self,
+            houses: QuerySet[House],
+            houses_key: Hashable,
+            year: int,
+            month: int,
+            months_amount: int,
+            total_persons_amount: int = 1,
+            chosen_check_in_date: Date = None,
+            calendar_format: str = CALENDAR_FORMAT_DAYS,
+    ) -> Iterator[tuple[Date, dict]]:
+        """
+        Календари на months_amount месяцев подряд. Каждый месяц берется из кэша, а при промахе - из расчета
+        на весь промежуток, который запускается при первом промахе и загружает данные один раз.
+        """
         if chosen_check_in_date:
-            return calculate_check_out_calendar(
-                houses=houses,
-                total_persons_amount=total_persons_amount,
-                check_in_date=chosen_check_in_date,
-                year=year,
-                month=month,
-            )
+            calculated_calendars = iter_check_out_calendars(houses, total_persons_amount, chosen_check_in_date,
+                                                            year, month, months_amount, calendar_format)
         else:
-            return calculate_check_in_calendar(
-                houses=houses,
-                year=year,
-                month=month,
+            calculated_calendars = iter_check_in_calendars(houses, year, month, months_amount, calendar_format)
+
+        def calculate_calendar(month_start: Date) -> dict:
+            # расчет идет по месяцам подряд: месяцы, взятые из кэша, пропускаются
+            for calculated_month_start, calendar in calculated_calendars:
+                if calculated_month_start == month_start:
+                    return calendar
+
+        for months_offset in range(months_amount):
+            month_start = Date(year=year + (month - 1 + months_offset) // 12,
+                               month=(month - 1 + months_offset) % 12 + 1, day=1)
+            calendar = get_cached_calendar(
+                houses_key=houses_key,
+                year=month_start.year,
+                month=month_start.month,
+                total_persons_amount=total_persons_amount,
+                chosen_check_in_date=chosen_check_in_date,
+                calculate_calendar=lambda: calculate_calendar(month_start),
+                calendar_format=calendar_format,
             )
+            yield month_start, calendar
 
     @action(methods=['get'], url_path='calendar', detail=False)
     def calendar(self, request: Request, *args, **kwargs):
@@ -60,7 +130,8 @@ class CalendarsViewSet(
 
         houses = self.filter_queryset(self.get_queryset())
 
-        calendar_data = self.get_calendar(houses, **calendar_parameters_serializer.validated_data)
+        # набор домиков определяется фильтрами, то есть total_persons_amount, который и так есть в ключе кэша
+        calendar_data = self.get_calendar(houses, "all", **calendar_parameters_serializer.validated_data)
         return Response({"calendar": calendar_data})
 
     @action(methods=['get'], url_path='calendar', detail=True)
@@ -70,5 +141,28 @@ class CalendarsViewSet(
 
         house = self.queryset.filter(id=self.kwargs['pk'])
 
-        calendar_data = self.get_calendar(house, **calendar_parameters_serializer.validated_data)
+        calendar_data = self.get_calendar(house, ("house", self.kwargs['pk']),
+                                          **calendar_parameters_serializer.validated_data)
         return Response({"calendar": calendar_data})
+
+    @action(methods=['get'], url_path='calendar_range', detail=False)
+    def calendar_range(self, request: Request, *args, **kwargs):
+        calendar_parameters_serializer = self.get_serializer(data=request.query_params)
+        calendar_parameters_serializer.is_valid(raise_exception=True)
+
+        houses = self.filter_queryset(self.get_queryset())
+        calendars = self.iter_calendars(houses, "all", **calendar_parameters_serializer.validated_data)
+
+        # по одному json-объекту на месяц (NDJSON): клиент может отрисовать первый месяц,
+        # пока считаются следующие, а в памяти одновременно находится только один календарь
+        renderer = ORJSONRenderer()
+
+        def stream():
+            for month_start, calendar in calendars:
+                yield renderer.render({
+                    "year": month_start.year,
+                    "month": month_start.month,
+                    "calendar": calendar,
+                }) + b"\n"
+
+        return StreamingHttpResponse(stream(), content_type="application/x-ndjson")
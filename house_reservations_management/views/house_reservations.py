@@ -4,8 +4,9 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from core.mixins import ByActionMixin
-from house_reservations.models import HouseReservation
-from house_reservations_billing.serializers import HouseReservationWithBillSerializer
+from house_reservations.models import HouseReservation, ArchivedHouseReservation
+from house_reservations_billing.serializers import HouseReservationWithBillSerializer, \
+    ArchivedHouseReservationWithBillSerializer
 from houses.models import House
 
 
@@ -24,9 +25,18 @@ class HouseReservationsViewSet(ByActionMixin,
 
     @action(methods=['get'], url_path='by_slug', detail=False)
     def retrieve_reservation_by_slug(self, request):
-        reservation = HouseReservation.objects.get(slug=request.GET.get('slug'))
+        slug = request.GET.get('slug')
+        # давно прошедшие бронирования переносятся в архив, поэтому если в актуальных не нашли - ищем там
+        for model, serializer_class in (
+                (HouseReservation, HouseReservationWithBillSerializer),
+                (ArchivedHouseReservation, ArchivedHouseReservationWithBillSerializer),
+        ):
+            reservation = (model.objects
+                           .select_related("house", "client", "bill__promo_code")
+                           .prefetch_related("house__pictures", "house__features")
+                           .filter(slug=slug)
+                           .first())
+            if reservation:
+                return Response({"reservation": serializer_class(reservation).data}, status=status.HTTP_200_OK)
 
-        if reservation:
-            return Response({"reservation": HouseReservationWithBillSerializer(reservation).data}, status=status.HTTP_200_OK)
-        else:
-            return Response({}, status=status.HTTP_404_NOT_FOUND)
+        return Response({}, status=status.HTTP_404_NOT_FOUND)
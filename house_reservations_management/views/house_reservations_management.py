@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import mixins, status
 from rest_framework.decorators import action
 from rest_framework.request import Request
@@ -6,12 +7,15 @@ from rest_framework.viewsets import GenericViewSet
 
 from clients.serializers import ClientSerializer
 from clients.services import upsert_client
+from core.generators import slug_generator
 from core.mixins import ByActionMixin
 from core.models import Pricing
 from house_reservations_billing.serializers import HouseReservationWithBillSerializer
+from house_reservations_billing.services.quote import calculate_quote
 from house_reservations_management.serializers.house_reservation_parameters import HouseReservationParametersSerializer, \
-    AdditionalReservationParametersSerializer
+    NewHouseReservationParametersSerializer, AdditionalReservationParametersSerializer
 from house_reservations_management.services.house_reservation import create_reservation, calculate_reservation
+from house_reservations_management.services.quotes_cache import get_cached_quote, normalize_quote_parameters
 from house_reservations_management.tasks import new_reservation_created_manager_notification, \
     new_reservation_created_user_notification
 from houses.models import House
@@ -24,7 +28,8 @@ class HouseReservationsManagementViewSet(ByActionMixin,
     serializer_classes_by_action = {
         "default": None,
         "reservation_price": HouseReservationParametersSerializer,
-        "new_reservation": HouseReservationParametersSerializer,
+        "reservation_quote": HouseReservationParametersSerializer,
+        "new_reservation": NewHouseReservationParametersSerializer,
     }
     queryset = House.objects.filter(active=True)
 
@@ -48,13 +53,48 @@ class HouseReservationsManagementViewSet(ByActionMixin,
                 **request.data,
             },
         )
-        reservation_parameters_serializer.is_valid(raise_exception=True)
 
-        reservation = calculate_reservation(reservation_parameters_serializer.validated_data)
-        reservation.clean()
+        def calculate_price() -> dict:
+            reservation_parameters_serializer.is_valid(raise_exception=True)
+
+            reservation = calculate_reservation(reservation_parameters_serializer.validated_data)
+            reservation.clean()
+
+            reservation_data = HouseReservationWithBillSerializer(reservation).data
+            # slug несохраненного бронирования случаен - в кэш он не попадает, каждый ответ получает свой
+            del reservation_data["slug"]
+            return {"reservation": reservation_data}
+
+        # при попадании в кэш нет ни валидации с запросами к бд, ни расчета
+        price = get_cached_quote(
+            "price",
+            normalize_quote_parameters(self.kwargs['pk'], request.data),
+            calculate_price,
+        )
+        return Response({"reservation": {"slug": slug_generator(), **price["reservation"]}}, status=status.HTTP_200_OK)
 
-        return Response({"reservation": HouseReservationWithBillSerializer(reservation).data},
-                        status=status.HTTP_200_OK)
+    @action(methods=['put'], url_path='reservations/quote', detail=True)
+    def reservation_quote(self, request: Request, *args, **kwargs):
+        # облегченный reservation_price: только позиции счета и итог, домик - по id,
+        # без создания моделей бронирования и счета
+        reservation_parameters_serializer = self.get_serializer(
+            data={
+                "house": self.kwargs['pk'],
+                **request.data,
+            },
+        )
+
+        def calculate_reservation_quote() -> dict:
+            reservation_parameters_serializer.is_valid(raise_exception=True)
+
+            return {"quote": calculate_quote(**reservation_parameters_serializer.validated_data).as_dict()}
+
+        quote = get_cached_quote(
+            "quote",
+            normalize_quote_parameters(self.kwargs['pk'], request.data),
+            calculate_reservation_quote,
+        )
+        return Response(quote, status=status.HTTP_200_OK)
 
     @action(methods=['post'], url_path='reservations', detail=True)
     def new_reservation(self, request: Request, *args, **kwargs):
@@ -79,8 +119,9 @@ class HouseReservationsManagementViewSet(ByActionMixin,
             **{"client": client},
         })
 
-        # TODO celery - cancel if not approved payment
-        new_reservation_created_manager_notification.delay(reservation.pk)
-        new_reservation_created_user_notification.delay(reservation.pk)
+        if settings.RESERVATION_NOTIFICATIONS_ENABLED:
+            # TODO celery - cancel if not approved payment
+            new_reservation_created_manager_notification.delay(reservation.pk)
+            new_reservation_created_user_notification.delay(reservation.pk)
 
         return Response({"slug": reservation.slug}, status=status.HTTP_200_OK)
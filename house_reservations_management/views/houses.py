@@ -1,11 +1,19 @@
 from rest_framework import mixins
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from core.mixins import ByActionMixin
+from core.response_cache import cached_response
 from house_reservations_management.filters.houses import HousesAvailableByDateFilter
+from house_reservations_management.serializers.availability_parameters import BulkAvailabilityParametersSerializer
+from house_reservations_management.serializers.flexible_search_parameters import FlexibleSearchParametersSerializer
 from house_reservations_management.serializers.houses import HouseListWithTotalPriceSerializer
+from house_reservations_management.services.availability import calculate_bulk_availability
+from house_reservations_management.services.flexible_search import find_cheapest_stays
 from houses.filters import FilterHousesByMaxPersonsAmount
-from houses.models import House
+from houses.models import House, HOUSES_GENERATION_NAME
 
 
 class HouseListingViewSet(
@@ -16,11 +24,54 @@ class HouseListingViewSet(
     serializer_classes_by_action = {
         "default": None,
         "list": HouseListWithTotalPriceSerializer,
+        "availability": BulkAvailabilityParametersSerializer,
+        "flexible_search": FlexibleSearchParametersSerializer,
     }
 
-    queryset = House.objects.filter(active=True)
+    queryset = House.objects.filter(active=True).prefetch_related("pictures", "features")
     filter_backends = [
         FilterHousesByMaxPersonsAmount,
         # TODO HousesWithFeaturesFilter,
         HousesAvailableByDateFilter
     ]
+
+    # без параметров total_price не считается, и ответ зависит только от каталога домиков
+    @cached_response(HOUSES_GENERATION_NAME, only_without_query_params=True)
+    def list(self, request, *args, **kwargs):
+        houses = list(self.filter_queryset(self.get_queryset()))
+
+        # цены всех домиков считаются одним пакетом до сериализации
+        context = self.get_serializer_context()
+        context.update(HouseListWithTotalPriceSerializer.get_listing_context(houses, request.query_params))
+
+        serializer = self.get_serializer(houses, many=True, context=context)
+        return Response(serializer.data)
+
+    @action(methods=['post'], url_path='availability', detail=False)
+    def availability(self, request: Request, *args, **kwargs):
+        availability_parameters_serializer = self.get_serializer(data=request.data)
+        availability_parameters_serializer.is_valid(raise_exception=True)
+
+        # изображения и фичи домиков здесь не нужны
+        houses = list(self.get_queryset().prefetch_related(None))
+
+        windows = calculate_bulk_availability(houses, availability_parameters_serializer.validated_data["windows"])
+        return Response({"windows": windows})
+
+    @action(methods=['get'], url_path='flexible_search', detail=False)
+    def flexible_search(self, request: Request, *args, **kwargs):
+        search_parameters_serializer = self.get_serializer(data=request.query_params)
+        search_parameters_serializer.is_valid(raise_exception=True)
+        search_parameters = search_parameters_serializer.validated_data
+
+        houses = list(self.get_queryset().prefetch_related(None))
+
+        stays = find_cheapest_stays(
+            houses=houses,
+            range_start=search_parameters["range_start"],
+            range_end=search_parameters["range_end"],
+            nights_options=search_parameters["nights"],
+            total_persons_amount=search_parameters["total_persons_amount"],
+            limit=search_parameters["limit"],
+        )
+        return Response({"stays": stays})
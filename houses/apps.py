@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HousesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'houses'
+
+    def ready(self):
+        import houses.signals  # pylint: disable=unused-import
@@ -0,0 +1,38 @@
+from django.core.files.images import get_image_dimensions
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.cache import bump_generation
+from houses.models import HousePicture, HouseFeature, HOUSES_GENERATION_NAME
+
+
+class Command(BaseCommand):
+    """ Заполняет сохраненные размеры изображений, загруженных до появления полей picture_width/picture_height"""
+
+    def handle(self, *args, **kwargs):
+        for model in (HousePicture, HouseFeature):
+            self.stdout.write(f'Backfilling {model._meta.verbose_name_plural} dimensions ...')
+            storage = model._meta.get_field("picture").storage
+
+            updated, failed = 0, 0
+            # values_list, а не экземпляры моделей: при инициализации экземпляра с пустыми размерами
+            # ImageField сам полезет читать файл
+            pictures = (model.objects
+                        .filter(Q(picture_width__isnull=True) | Q(picture_height__isnull=True))
+                        .values_list("pk", "picture"))
+            for pk, picture_name in pictures:
+                try:
+                    with storage.open(picture_name) as picture_file:
+                        width, height = get_image_dimensions(picture_file)
+                except OSError as error:
+                    failed += 1
+                    self.stderr.write(f'Could not read {picture_name}: {error}')
+                    continue
+
+                model.objects.filter(pk=pk).update(picture_width=width, picture_height=height)
+                updated += 1
+
+            self.stdout.write(f'Successfully backfilled {updated} pictures, failed {failed}')
+
+        # queryset.update не отправляет сигналы - закэшированные ответы каталога сбрасываем сами
+        bump_generation(HOUSES_GENERATION_NAME)
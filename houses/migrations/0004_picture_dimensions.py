@@ -0,0 +1,44 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:23
+
+import houses.filepath_generators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('houses', '0003_house_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='housefeature',
+            name='picture_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Высота иконки'),
+        ),
+        migrations.AddField(
+            model_name='housefeature',
+            name='picture_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ширина иконки'),
+        ),
+        migrations.AddField(
+            model_name='housepicture',
+            name='picture_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Высота изображения'),
+        ),
+        migrations.AddField(
+            model_name='housepicture',
+            name='picture_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ширина изображения'),
+        ),
+        migrations.AlterField(
+            model_name='housefeature',
+            name='picture',
+            field=models.ImageField(height_field='picture_height', upload_to=houses.filepath_generators.generate_house_feature_picture_filename, verbose_name='Иконка', width_field='picture_width'),
+        ),
+        migrations.AlterField(
+            model_name='housepicture',
+            name='picture',
+            field=models.ImageField(height_field='picture_height', upload_to=houses.filepath_generators.generate_house_picture_filename, verbose_name='Путь до файла с изображением', width_field='picture_width'),
+        ),
+    ]
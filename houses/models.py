@@ -9,6 +9,9 @@ from houses.filepath_generators import generate_house_picture_filename, generate
 
 logger = logging.getLogger(__name__)
 
+# поколение каталога домиков: увеличивается при любом изменении домиков, их изображений и фич (см. houses.signals)
+HOUSES_GENERATION_NAME = "houses"
+
 
 class House(models.Model):
     name = models.CharField("Название домика", max_length=255, unique=True)
@@ -62,7 +65,11 @@ class HousePicture(models.Model):
                               on_delete=models.SET_NULL,
                               null=True, related_name='pictures')
     picture = models.ImageField("Путь до файла с изображением",
-                                upload_to=generate_house_picture_filename)
+                                upload_to=generate_house_picture_filename,
+                                width_field="picture_width", height_field="picture_height")
+    # размеры заполняются при загрузке изображения, для старых файлов - командой backfill_pictures_dimensions
+    picture_width = models.PositiveIntegerField("Ширина изображения", null=True, blank=True, editable=False)
+    picture_height = models.PositiveIntegerField("Высота изображения", null=True, blank=True, editable=False)
 
     class Meta:
         verbose_name = "Изображение домика"
@@ -75,7 +82,10 @@ class HousePicture(models.Model):
 
 class HouseFeature(models.Model):
     name = models.CharField("Название", max_length=127, unique=True)
-    picture = models.ImageField("Иконка", upload_to=generate_house_feature_picture_filename)
+    picture = models.ImageField("Иконка", upload_to=generate_house_feature_picture_filename,
+                                width_field="picture_width", height_field="picture_height")
+    picture_width = models.PositiveIntegerField("Ширина иконки", null=True, blank=True, editable=False)
+    picture_height = models.PositiveIntegerField("Высота иконки", null=True, blank=True, editable=False)
 
     class Meta:
         verbose_name = "Фича домика"
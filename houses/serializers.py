@@ -9,8 +9,8 @@ logger = logging.getLogger(__name__)
 
 class HousePictureListSerializer(serializers.ModelSerializer):
     picture = serializers.CharField(read_only=True, source='picture.url')
-    width = serializers.IntegerField(read_only=True, source='picture.width')
-    height = serializers.IntegerField(read_only=True, source='picture.height')
+    width = serializers.IntegerField(read_only=True, source='picture_width')
+    height = serializers.IntegerField(read_only=True, source='picture_height')
 
     class Meta:
         model = HousePicture
@@ -19,8 +19,8 @@ class HousePictureListSerializer(serializers.ModelSerializer):
 
 class HouseFeatureListSerializer(serializers.ModelSerializer):
     picture = serializers.CharField(read_only=True, source='picture.url')
-    width = serializers.IntegerField(read_only=True, source='picture.width')
-    height = serializers.IntegerField(read_only=True, source='picture.height')
+    width = serializers.IntegerField(read_only=True, source='picture_width')
+    height = serializers.IntegerField(read_only=True, source='picture_height')
 
     class Meta:
         model = HouseFeature
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from houses.models import House, HousePicture, HouseFeature, HOUSES_GENERATION_NAME
+
+
+def _bump_houses_generation():
+    bump_generation(HOUSES_GENERATION_NAME)
+
+
+@receiver([post_save, post_delete], sender=House)
+@receiver([post_save, post_delete], sender=HousePicture)
+@receiver([post_save, post_delete], sender=HouseFeature)
+@receiver(m2m_changed, sender=House.features.through)
+def invalidate_houses_catalogue(sender, **kwargs):
+    transaction.on_commit(_bump_houses_generation)
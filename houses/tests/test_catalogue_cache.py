@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from houses.models import House
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class HouseCatalogueCacheTest(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.house = House.objects.create(name="Домик", description="Описание")
+        self.url = f"/{settings.URL_PREFIX}/api/v1/houses/{self.house.id}/"
+
+    def test_repeat_request_served_from_cache(self):
+        first_response = self.client.get(self.url)
+        self.assertEqual(first_response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            second_response = self.client.get(self.url)
+        self.assertEqual(second_response.json(), first_response.json())
+        self.assertEqual(second_response["ETag"], first_response["ETag"])
+
+    def test_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_house_change_invalidates_cache(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.house.description = "Новое описание"
+            self.house.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["description"], "Новое описание")
@@ -0,0 +1,58 @@
+import io
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from houses.models import House, HousePicture, HouseFeature
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class HousePicturesTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.house = House.objects.create(name="Домик с картинками", description="Описание")
+        for i in range(3):
+            HousePicture.objects.create(
+                house=self.house,
+                picture=SimpleUploadedFile(f"picture{i}.png", _png(40 + i, 30), content_type="image/png"),
+            )
+        feature = HouseFeature.objects.create(
+            name="Баня",
+            picture=SimpleUploadedFile("feature.png", _png(16, 16), content_type="image/png"),
+        )
+        self.house.features.add(feature)
+
+    def test_dimensions_stored_on_upload(self):
+        self.assertEqual(
+            sorted(HousePicture.objects.values_list("picture_width", "picture_height")),
+            [(40, 30), (41, 30), (42, 30)],
+        )
+        self.assertEqual(list(HouseFeature.objects.values_list("picture_width", "picture_height")), [(16, 16)])
+
+    def test_house_detail_without_file_io(self):
+        url = f"/{settings.URL_PREFIX}/api/v1/houses/{self.house.id}/"
+        # домик + изображения + фичи
+        with self.assertNumQueries(3), patch("django.core.files.images.get_image_dimensions") as get_dimensions:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        get_dimensions.assert_not_called()
+        self.assertEqual(sorted(picture["width"] for picture in response.json()["pictures"]), [40, 41, 42])
+        self.assertEqual(response.json()["features"][0]["height"], 16)
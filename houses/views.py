@@ -2,7 +2,8 @@ from rest_framework import mixins
 from rest_framework.viewsets import GenericViewSet
 
 from core.mixins import ByActionMixin
-from houses.models import House, HouseFeature
+from core.response_cache import cached_response
+from houses.models import House, HouseFeature, HOUSES_GENERATION_NAME
 from houses.serializers import HouseFeatureListSerializer, HouseDetailSerializer
 
 
@@ -15,7 +16,14 @@ class HouseViewSet(
         "default": None,
         "retrieve": HouseDetailSerializer,
     }
-    queryset = House.objects.filter(active=True)
+    queryset = House.objects.filter(active=True).prefetch_related("pictures", "features")
+    # домики зарегистрированы в роутере вместе с другими viewset'ами на том же префиксе -
+    # только числовой pk, чтобы {pk}/ не перехватывал их list-маршруты (например, availability/)
+    lookup_value_regex = r"\d+"
+
+    @cached_response(HOUSES_GENERATION_NAME)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 
 class HouseFeatureViewSet(
@@ -28,3 +36,7 @@ class HouseFeatureViewSet(
         "list": HouseFeatureListSerializer,
     }
     queryset = HouseFeature.objects.all()
+
+    @cached_response(HOUSES_GENERATION_NAME)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 import os
 from pathlib import Path
 
+from celery.schedules import crontab
+
 URL_PREFIX = "backend"
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -175,11 +177,24 @@ REST_FRAMEWORK = {
         # То же самое с группой url'ов api-auth
         'rest_framework.authentication.BasicAuthentication',
     ],
+    # json через orjson - тот же json, что и у стандартного JSONRenderer (см. ORJSONRenderer), но быстрее
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'EXCEPTION_HANDLER': 'core.middleware.custom_exceptions_handler'
 }
 
 CACHALOT_ENABLED = (os.getenv('ENABLE_CACHALOT') == "true")
 
+# уведомления менеджеру и клиенту о новых бронированиях (отключаются, например, на время нагрузочного теста)
+RESERVATION_NOTIFICATIONS_ENABLED = (os.getenv('DISABLE_RESERVATION_NOTIFICATIONS') != "true")
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -280,3 +295,14 @@ CELERY_TASK_TIME_LIMIT = 30 * 60
 # CELERY_CACHE_BACKEND = 'django-cache'
 CELERY_BROKER_URL = f"{_REDIS_URL}/1"
 CELERY_RESULT_BACKEND = f"{_REDIS_URL}/1"
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "archive_outdated_reservations": {
+        "task": "house_reservations_management.tasks.archive_outdated_reservations",
+        "schedule": crontab(hour=4, minute=0),
+    },
+}
+
+# бронирования, выезд по которым был больше RESERVATIONS_ARCHIVE_AFTER_DAYS дней назад, переносятся в архив
+RESERVATIONS_ARCHIVE_AFTER_DAYS = 30
+RESERVATIONS_ARCHIVE_BATCH_SIZE = 1000